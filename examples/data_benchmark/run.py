@@ -0,0 +1,76 @@
+"""
+Compare memory usage and construction time of BarData, SlotBarData and
+BarArray, run with: python run.py [count]
+"""
+
+import sys
+import tracemalloc
+from datetime import datetime, timedelta
+from time import perf_counter
+from typing import Callable
+
+from vnpy.trader.constant import Exchange, Interval
+from vnpy.trader.object import BarData, SlotBarData
+from vnpy.trader.columnar import BarArray
+
+
+def create_bars(data_class: type, count: int) -> list:
+    """"""
+    start = datetime(2020, 1, 1)
+
+    return [
+        data_class(
+            gateway_name="DB",
+            symbol="IF888",
+            exchange=Exchange.CFFEX,
+            datetime=start + timedelta(minutes=i),
+            interval=Interval.MINUTE,
+            volume=float(i),
+            open_price=4000.0,
+            high_price=4010.0,
+            low_price=3990.0,
+            close_price=4005.0
+        )
+        for i in range(count)
+    ]
+
+
+def measure(name: str, func: Callable, count: int) -> None:
+    """
+    Print construction time and memory of result kept by func.
+    """
+    tracemalloc.start()
+
+    start = perf_counter()
+    result = func()
+    cost = perf_counter() - start
+
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(
+        f"{name:<12}耗时：{cost:.3f}秒\t"
+        f"内存：{size / 1024 / 1024:.1f}MB\t"
+        f"每条：{size / count:.0f}字节"
+    )
+
+    del result
+
+
+def main() -> None:
+    """"""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    print(f"数据量：{count}")
+
+    bars = create_bars(BarData, count)
+
+    measure("BarData", lambda: create_bars(BarData, count), count)
+    measure("SlotBarData", lambda: create_bars(SlotBarData, count), count)
+    measure("BarArray", lambda: BarArray.from_bars(bars), count)
+
+    array = BarArray.from_bars(bars)
+    measure("to_bars", array.to_bars, count)
+
+
+if __name__ == "__main__":
+    main()
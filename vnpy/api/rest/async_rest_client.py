@@ -0,0 +1,324 @@
+import asyncio
+import sys
+from concurrent.futures import Future, wait
+from threading import Thread, current_thread
+from time import monotonic, perf_counter
+from typing import Any, Dict, Set, Union
+
+import aiohttp
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+from yarl import URL
+
+from .rest_client import (
+    CALLBACK_TYPE,
+    ON_ERROR_TYPE,
+    ON_FAILED_TYPE,
+    Request,
+    RequestStatus,
+    RestClient
+)
+
+
+class TokenBucket:
+    """
+    Token bucket for limiting request rate.
+
+    Tokens are refilled at rate per second up to capacity, and each
+    request consumes one token. Capacity is at least 1, otherwise no token
+    could ever be acquired with rate below 1.
+    """
+
+    def __init__(self, rate: float, capacity: float = 0):
+        """"""
+        self.rate: float = rate
+        self.capacity: float = max(capacity or rate, 1)
+        self.tokens: float = self.capacity
+        self.last: float = monotonic()
+
+    async def acquire(self) -> None:
+        """
+        Wait till a token is available.
+        """
+        while True:
+            now = monotonic()
+            self.tokens = min(
+                self.capacity,
+                self.tokens + (now - self.last) * self.rate
+            )
+            self.last = now
+
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class AsyncRestClient(RestClient):
+    """
+    HTTP Client for REST API based on asyncio and aiohttp.
+
+    Same usage as RestClient, but all requests are sent concurrently on
+    one event loop running in a background thread, sharing a pool of
+    keep-alive connections. Callbacks are called in the event loop thread,
+    so they should not block.
+
+    * Call set_rate_limit to limit request rate of an endpoint.
+    * Pass timeout to add_request to set timeout of a request.
+    """
+
+    def __init__(self):
+        """"""
+        super().__init__()
+
+        self.timeout: float = 10
+
+        self._loop: asyncio.AbstractEventLoop = asyncio.new_event_loop()
+        self._thread: Thread = None
+        self._session: aiohttp.ClientSession = None
+        self._limit: int = 100
+
+        self._rate_limits: Dict[str, TokenBucket] = {}
+        self._futures: Set[Future] = set()
+
+    def set_rate_limit(self, path: str, rate: float, capacity: float = 0) -> None:
+        """
+        Limit request rate of an endpoint, rate is count per second.
+        Use empty path to limit rate of all requests.
+        """
+        self._rate_limits[path] = TokenBucket(rate, capacity)
+
+    def start(self, n: int = 100) -> None:
+        """
+        Start rest client with max connection count n.
+        """
+        if self._active:
+            return
+
+        self._active = True
+        self._limit = n
+
+        self._thread = Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Stop rest client immediately, requests not finished are cancelled.
+
+        When called from callback function in event loop thread, the client
+        is stopped after the callback returns.
+        """
+        if not self._active:
+            return
+
+        self._active = False
+
+        if current_thread() is self._thread:
+            self._loop.create_task(self._shutdown())
+        else:
+            future = asyncio.run_coroutine_threadsafe(self._shutdown(), self._loop)
+            future.result()
+
+    def join(self) -> None:
+        """
+        Wait till all requests are processed.
+        """
+        while self._futures:
+            # Requests added while stopping are never started
+            if not self._active and not self._loop.is_running():
+                for future in list(self._futures):
+                    future.cancel()
+                return
+
+            wait(list(self._futures), timeout=1)
+
+    def add_request(
+        self,
+        method: str,
+        path: str,
+        callback: CALLBACK_TYPE,
+        params: dict = None,
+        data: Union[dict, str, bytes] = None,
+        headers: dict = None,
+        on_failed: ON_FAILED_TYPE = None,
+        on_error: ON_ERROR_TYPE = None,
+        extra: Any = None,
+        priority: bool = None,
+        timeout: float = None,
+    ) -> Request:
+        """
+        Add a new request.
+        :param method: GET, POST, PUT, DELETE, QUERY
+        :param path: url path for query
+        :param callback: callback function if 2xx status, type: (dict, Request)
+        :param params: dict for query string
+        :param data: Http body. If it is a dict, it will be converted to form-data. Otherwise, it will be converted to bytes.
+        :param headers: dict for headers
+        :param on_failed: callback function if Non-2xx status, type, type: (code, dict, Request)
+        :param on_error: callback function when catching Python exception, type: (etype, evalue, tb, Request)
+        :param extra: Any extra data which can be used when handling callback
+        :param priority: not used since requests are not queued, kept for compatibility
+        :param timeout: total timeout in seconds, default self.timeout
+        :return: Request, with error status if client is not active
+        """
+        request = Request(
+            method,
+            path,
+            params,
+            data,
+            headers,
+            callback,
+            on_failed,
+            on_error,
+            extra,
+            bool(priority),
+        )
+
+        # Event loop is not running after stopped
+        if not self._active:
+            request.status = RequestStatus.error
+            return request
+
+        if timeout is None:
+            timeout = self.timeout
+
+        future = asyncio.run_coroutine_threadsafe(
+            self._process_request(request, timeout),
+            self._loop
+        )
+        self._futures.add(future)
+        future.add_done_callback(self._futures.discard)
+
+        return request
+
+    def _run(self) -> None:
+        """"""
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_forever()
+
+        for future in list(self._futures):
+            future.cancel()
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """
+        Create session in event loop when it is first used.
+        """
+        if not self._session:
+            connector = aiohttp.TCPConnector(limit=self._limit)
+            self._session = aiohttp.ClientSession(connector=connector)
+        return self._session
+
+    async def _shutdown(self) -> None:
+        """
+        Cancel all requests, close session and then stop event loop.
+        """
+        this = asyncio.current_task()
+        tasks = [t for t in asyncio.all_tasks() if t is not this]
+
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+        if self._session:
+            await self._session.close()
+            self._session = None
+
+        self._loop.call_soon(self._loop.stop)
+
+    async def _acquire(self, path: str) -> None:
+        """
+        Wait for rate limits of all requests and the endpoint.
+        """
+        for key in ("", path):
+            bucket = self._rate_limits.get(key, None)
+            if bucket:
+                await bucket.acquire()
+
+    async def _process_request(self, request: Request, timeout: float) -> None:
+        """
+        Sending request to server and get result.
+        """
+        try:
+            # Wait before signing so that timestamp in signature is not expired
+            await self._acquire(request.path)
+
+            request = self.sign(request)
+
+            url = self.make_full_url(request.path)
+
+            # Encode request the same way as requests library
+            prepared = requests.Request(
+                request.method,
+                url,
+                headers=request.headers,
+                params=request.params,
+                data=request.data,
+            ).prepare()
+
+            proxy = None
+            if self.proxies:
+                scheme = "https" if url.startswith("https") else "http"
+                proxy = self.proxies.get(scheme, None)
+
+            session = await self._get_session()
+
+            self.inflight_count += 1
+            start = perf_counter()
+
+            try:
+                async with session.request(
+                    prepared.method,
+                    URL(prepared.url, encoded=True),
+                    headers=prepared.headers,
+                    data=prepared.body,
+                    proxy=proxy,
+                    timeout=aiohttp.ClientTimeout(total=timeout),
+                ) as resp:
+                    content = await resp.read()
+            finally:
+                request.latency = perf_counter() - start
+
+                self.inflight_count -= 1
+                self.finished_count += 1
+                self.total_latency += request.latency
+                self.max_latency = max(self.max_latency, request.latency)
+
+            response = requests.Response()
+            response.status_code = resp.status
+            response.reason = resp.reason
+            response.headers = CaseInsensitiveDict(resp.headers)
+            response.encoding = get_encoding_from_headers(response.headers)
+            response.url = prepared.url
+            response.request = prepared
+            response._content = content
+
+            request.response = response
+            status_code = response.status_code
+            if status_code // 100 == 2:  # 2xx codes are all successful
+                if status_code == 204:
+                    json_body = None
+                else:
+                    json_body = response.json()
+
+                request.callback(json_body, request)
+                request.status = RequestStatus.success
+            else:
+                request.status = RequestStatus.failed
+
+                if request.on_failed:
+                    request.on_failed(status_code, request)
+                else:
+                    self.on_failed(status_code, request)
+        # CancelledError is subclass of Exception before Python 3.8
+        except asyncio.CancelledError:
+            request.status = RequestStatus.error
+            raise
+        except Exception:
+            request.status = RequestStatus.error
+            t, v, tb = sys.exc_info()
+            if request.on_error:
+                request.on_error(t, v, tb, request)
+            else:
+                self.on_error(t, v, tb, request)
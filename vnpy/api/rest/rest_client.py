@@ -1,10 +1,14 @@
 import sys
 import traceback
+from copy import copy
 from datetime import datetime
 from enum import Enum
+from itertools import count
 from multiprocessing.dummy import Pool
-from queue import Empty, Queue
-from typing import Any, Callable, Optional, Union, Type
+from queue import Empty, PriorityQueue
+from threading import Lock
+from time import perf_counter, sleep, time
+from typing import Any, Callable, Dict, List, Optional, Union, Type
 from types import TracebackType
 
 import requests
@@ -13,6 +17,11 @@ import requests
 CALLBACK_TYPE = Callable[[dict, "Request"], Any]
 ON_FAILED_TYPE = Callable[[int, "Request"], Any]
 ON_ERROR_TYPE = Callable[[Type, Exception, TracebackType, "Request"], Any]
+PARSE_TYPE = Callable[[Any, dict], list]
+
+# Requests in priority lane are always processed before normal lane
+PRIORITY_LANE = 0
+NORMAL_LANE = 1
 
 
 class RequestStatus(Enum):
@@ -40,6 +49,7 @@ class Request(object):
         on_failed: ON_FAILED_TYPE = None,
         on_error: ON_ERROR_TYPE = None,
         extra: Any = None,
+        priority: bool = False,
     ):
         """"""
         self.method: str = method
@@ -52,9 +62,11 @@ class Request(object):
         self.on_failed: ON_FAILED_TYPE = on_failed
         self.on_error: ON_ERROR_TYPE = on_error
         self.extra: Any = extra
+        self.priority: bool = priority
 
         self.response: requests.Response = None
         self.status: RequestStatus = RequestStatus.ready
+        self.latency: float = 0     # Seconds from sending to response
 
     def __str__(self):
         """"""
@@ -89,6 +101,19 @@ class RestClient(object):
     * Reimplement on_failed function to handle Non-2xx responses.
     * Use on_failed parameter in add_request function for individual Non-2xx response handling.
     * Reimplement on_error function to handle exception msg.
+
+    Requests other than GET (e.g. send and cancel order) are put into
+    priority lane by default. Each lane is served by its own worker and
+    keep-alive session, so that orders are not blocked behind queries
+    already in flight, while requests of the same lane are still sent one
+    by one in order. Set separate_lanes to False before start() to send
+    all requests with a single worker, priority lane first, if the
+    exchange API requires strictly increasing nonce across all requests.
+
+    Set concurrent to True before start() to serve each lane with n
+    workers concurrently. Then requests may reach server out of order
+    (e.g. cancel before its order) and callbacks are called from more
+    threads, so only enable it if the exchange API allows.
     """
 
     def __init__(self):
@@ -96,10 +121,21 @@ class RestClient(object):
         self.url_base: str = ""
         self._active: bool = False
 
-        self._queue: Queue = Queue()
+        self._queue: PriorityQueue = PriorityQueue()
+        self._priority_queue: PriorityQueue = PriorityQueue()
+        self._count = count()
         self._pool: Pool = None
 
         self.proxies: dict = None
+        self.concurrent: bool = False
+        self.separate_lanes: bool = True
+
+        # Statistics of requests
+        self._lock: Lock = Lock()
+        self.inflight_count: int = 0
+        self.finished_count: int = 0
+        self.total_latency: float = 0
+        self.max_latency: float = 0
 
     def init(
         self,
@@ -119,14 +155,28 @@ class RestClient(object):
 
     def start(self, n: int = 3) -> None:
         """
-        Start rest client with session count n.
+        Start rest client with session count n of each lane, which is
+        only used when concurrent is True.
         """
         if self._active:
             return
 
         self._active = True
-        self._pool = Pool(n)
-        self._pool.apply_async(self._run)
+
+        if self.concurrent:
+            worker_count = n
+        else:
+            worker_count = 1
+
+        queues = [self._queue]
+        if self.separate_lanes:
+            queues.append(self._priority_queue)
+
+        self._pool = Pool(worker_count * len(queues))
+
+        for queue in queues:
+            for _ in range(worker_count):
+                self._pool.apply_async(self._run, (queue,))
 
     def stop(self) -> None:
         """
@@ -138,6 +188,7 @@ class RestClient(object):
         """
         Wait till all requests are processed.
         """
+        self._priority_queue.join()
         self._queue.join()
 
     def add_request(
@@ -151,6 +202,7 @@ class RestClient(object):
         on_failed: ON_FAILED_TYPE = None,
         on_error: ON_ERROR_TYPE = None,
         extra: Any = None,
+        priority: bool = None,
     ) -> Request:
         """
         Add a new request.
@@ -163,8 +215,12 @@ class RestClient(object):
         :param on_failed: callback function if Non-2xx status, type, type: (code, dict, Request)
         :param on_error: callback function when catching Python exception, type: (etype, evalue, tb, Request)
         :param extra: Any extra data which can be used when handling callback
+        :param priority: put into priority lane, default True for methods other than GET
         :return: Request
         """
+        if priority is None:
+            priority = method.upper() != "GET"
+
         request = Request(
             method,
             path,
@@ -175,21 +231,49 @@ class RestClient(object):
             on_failed,
             on_error,
             extra,
+            priority,
         )
-        self._queue.put(request)
+
+        if priority and self.separate_lanes:
+            queue = self._priority_queue
+        else:
+            queue = self._queue
+
+        lane = PRIORITY_LANE if priority else NORMAL_LANE
+        queue.put((lane, next(self._count), request))
         return request
 
-    def _run(self) -> None:
+    def get_statistics(self) -> Dict[str, float]:
+        """
+        Get in-flight count and latency statistics of requests.
+        """
+        with self._lock:
+            if self.finished_count:
+                average_latency = self.total_latency / self.finished_count
+            else:
+                average_latency = 0
+
+            return {
+                "inflight": self.inflight_count,
+                "queued": self._queue.qsize() + self._priority_queue.qsize(),
+                "finished": self.finished_count,
+                "average_latency": average_latency,
+                "max_latency": self.max_latency
+            }
+
+    def _run(self, queue: PriorityQueue) -> None:
         """"""
         try:
+            # Each worker keeps its own session with keep-alive connections
             session = requests.session()
+
             while self._active:
                 try:
-                    request = self._queue.get(timeout=1)
+                    _, _, request = queue.get(timeout=1)
                     try:
                         self._process_request(request, session)
                     finally:
-                        self._queue.task_done()
+                        queue.task_done()
                 except Empty:
                     pass
         except Exception:
@@ -253,14 +337,28 @@ class RestClient(object):
 
             url = self.make_full_url(request.path)
 
-            response = session.request(
-                request.method,
-                url,
-                headers=request.headers,
-                params=request.params,
-                data=request.data,
-                proxies=self.proxies,
-            )
+            with self._lock:
+                self.inflight_count += 1
+
+            start = perf_counter()
+            try:
+                response = session.request(
+                    request.method,
+                    url,
+                    headers=request.headers,
+                    params=request.params,
+                    data=request.data,
+                    proxies=self.proxies,
+                )
+            finally:
+                request.latency = perf_counter() - start
+
+                with self._lock:
+                    self.inflight_count -= 1
+                    self.finished_count += 1
+                    self.total_latency += request.latency
+                    self.max_latency = max(self.max_latency, request.latency)
+
             request.response = response
             status_code = response.status_code
             if status_code // 100 == 2:  # 2xx codes are all successful
@@ -331,3 +429,98 @@ class RestClient(object):
             proxies=self.proxies,
         )
         return response
+
+    def query_pages(
+        self,
+        method: str,
+        path: str,
+        params_list: List[dict],
+        parse: PARSE_TYPE,
+        callback: Callable[[list], Any],
+        on_failed: Callable[[dict, str], Any] = None,
+        key: Callable[[Any], Any] = None,
+        data: dict = None,
+        n: int = 5,
+        rate: float = 0,
+        retry: int = 3,
+    ) -> int:
+        """
+        Query paged data (e.g. history bars) concurrently.
+        :param params_list: query params of each page, in ascending order
+        :param parse: convert json body of a page into list of items, type: (dict, params)
+        :param callback: called with items of each page in page order, type: (list)
+        :param on_failed: called when a page still failed after retry, type: (params, msg)
+        :param key: items of each page are sorted by key, and items not
+                    greater than last key of previous pages are dropped
+        :param data: passed to each request for sign
+        :param n: count of threads querying pages
+        :param rate: max request count per second, 0 for no limit
+        :param retry: retry count of a failed page
+        :return: count of items passed to callback
+        """
+        lock = Lock()
+        interval = 1 / rate if rate else 0
+        next_time = 0
+
+        def wait() -> None:
+            """Sleep till the next request is allowed by rate."""
+            nonlocal next_time
+
+            with lock:
+                now = time()
+                wait_time = next_time - now
+                next_time = max(next_time, now) + interval
+
+            if wait_time > 0:
+                sleep(wait_time)
+
+        def query_page(params: dict) -> list:
+            """"""
+            for i in range(retry + 1):
+                if i:
+                    sleep(min(2 ** (i - 1), 10))
+
+                wait()
+
+                try:
+                    # Params and data may be modified in sign
+                    response = self.request(
+                        method,
+                        path,
+                        params=copy(params),
+                        data=copy(data)
+                    )
+
+                    if response.status_code // 100 == 2:
+                        return parse(response.json(), params)
+
+                    msg = f"{response.status_code}, {response.text}"
+                except Exception as e:
+                    msg = repr(e)
+
+            if on_failed:
+                on_failed(params, msg)
+            return []
+
+        count = 0
+        last_key = None
+        pool = Pool(n)
+
+        try:
+            # imap yields pages in order while they are queried concurrently
+            for items in pool.imap(query_page, params_list):
+                if key and items:
+                    items.sort(key=key)
+
+                    if last_key is not None:
+                        items = [item for item in items if key(item) > last_key]
+                    if items:
+                        last_key = key(items[-1])
+
+                if items:
+                    count += len(items)
+                    callback(items)
+        finally:
+            pool.terminate()
+
+        return count
@@ -0,0 +1,363 @@
+import asyncio
+import json
+import logging
+import sys
+import traceback
+import zlib
+from datetime import datetime
+from threading import Lock, Thread
+from time import perf_counter
+from typing import Any, Callable, Dict, Optional, Union
+
+import aiohttp
+
+from vnpy.trader.utility import get_file_logger
+
+
+_loop: asyncio.AbstractEventLoop = None
+_loop_lock: Lock = Lock()
+
+
+def get_event_loop() -> asyncio.AbstractEventLoop:
+    """
+    Get the event loop shared by all async websocket clients,
+    which is started in a background thread when first used.
+    """
+    global _loop
+
+    with _loop_lock:
+        if not _loop:
+            _loop = asyncio.new_event_loop()
+
+            thread = Thread(target=_loop.run_forever, daemon=True)
+            thread.start()
+
+    return _loop
+
+
+class AsyncWebsocketClient:
+    """
+    Websocket API based on asyncio and aiohttp.
+
+    Same usage as WebsocketClient, but connections of all clients are
+    running on one shared event loop instead of a worker thread and a
+    ping thread for each client. Callbacks are called in the event loop
+    thread, so they should not block.
+
+    * Set decoder in init to use a faster json decoder (e.g. orjson.loads).
+    * Set wbits in init to decompress binary frames (31 for gzip, -15 for
+      raw deflate), instead of overriding unpack_data.
+    * Call get_statistics to check message rate and parse time.
+
+    Callbacks to overrides:
+    * unpack_data
+    * on_connected
+    * on_disconnected
+    * on_packet
+    * on_error
+    """
+
+    def __init__(self):
+        """Constructor"""
+        self.host = None
+
+        self._ws: aiohttp.ClientWebSocketResponse = None
+        self._session: aiohttp.ClientSession = None
+        self._loop: asyncio.AbstractEventLoop = None
+        self._future = None
+        self._active = False
+
+        self.proxy = None
+        self.ping_interval = 60  # seconds
+        self.header = {}
+
+        self.decoder: Callable[[Union[str, bytes]], Any] = json.loads
+        self.wbits: int = 0
+
+        self.logger: Optional[logging.Logger] = None
+
+        # For statistics
+        self.message_count: int = 0
+        self.parse_time: float = 0
+        self._stat_count: int = 0
+        self._stat_time: float = perf_counter()
+
+        # For debugging
+        self._last_sent_text = None
+        self._last_received_text = None
+
+    def init(self,
+             host: str,
+             proxy_host: str = "",
+             proxy_port: int = 0,
+             ping_interval: int = 60,
+             header: dict = None,
+             log_path: Optional[str] = None,
+             decoder: Callable[[Union[str, bytes]], Any] = None,
+             wbits: int = 0,
+             ):
+        """
+        :param host:
+        :param proxy_host:
+        :param proxy_port:
+        :param header:
+        :param ping_interval: unit: seconds, type: int
+        :param log_path: optional. file to save log.
+        :param decoder: optional. function to decode json text.
+        :param wbits: optional. wbits of zlib to decompress binary data.
+        """
+        self.host = host
+        self.ping_interval = ping_interval  # seconds
+        if log_path is not None:
+            self.logger = get_file_logger(log_path)
+            self.logger.setLevel(logging.DEBUG)
+
+        if header:
+            self.header = header
+
+        if proxy_host and proxy_port:
+            self.proxy = f"http://{proxy_host}:{proxy_port}"
+
+        if decoder:
+            self.decoder = decoder
+
+        self.wbits = wbits
+
+    def start(self):
+        """
+        Start the client and on_connected function is called after webscoket
+        is connected succesfully.
+
+        Please don't send packet untill on_connected fucntion is called.
+        """
+        if self._active:
+            return
+
+        self._active = True
+        self._loop = get_event_loop()
+        self._future = asyncio.run_coroutine_threadsafe(self._run(), self._loop)
+
+    def stop(self):
+        """
+        Stop the client.
+        """
+        self._active = False
+        self._disconnect()
+
+    def join(self):
+        """
+        Wait till connection is closed.
+
+        This function cannot be called from callback function.
+        """
+        if self._future:
+            self._future.result()
+
+    def send_packet(self, packet: dict):
+        """
+        Send a packet (dict data) to server
+
+        override this if you want to send non-json packet
+        """
+        text = json.dumps(packet)
+        self._record_last_sent_text(text)
+        return self._send_text(text)
+
+    def get_statistics(self) -> Dict[str, float]:
+        """
+        Get message rate since last call and average parse time.
+        """
+        now = perf_counter()
+        count = self.message_count - self._stat_count
+        rate = count / (now - self._stat_time)
+
+        self._stat_count = self.message_count
+        self._stat_time = now
+
+        if self.message_count:
+            average_parse_time = self.parse_time / self.message_count
+        else:
+            average_parse_time = 0
+
+        return {
+            "message_count": self.message_count,
+            "message_rate": rate,
+            "average_parse_time": average_parse_time
+        }
+
+    def _log(self, msg, *args):
+        logger = self.logger
+        if logger:
+            logger.debug(msg, *args)
+
+    def _send_text(self, text: str):
+        """
+        Send a text string to server.
+        """
+        ws = self._ws
+        if ws:
+            asyncio.run_coroutine_threadsafe(ws.send_str(text), self._loop)
+            self._log('sent text: %s', text)
+
+    def _send_binary(self, data: bytes):
+        """
+        Send bytes data to server.
+        """
+        ws = self._ws
+        if ws:
+            asyncio.run_coroutine_threadsafe(ws.send_bytes(data), self._loop)
+            self._log('sent binary: %s', data)
+
+    def _disconnect(self):
+        """
+        Close connection, and it will be reconnected if client is active.
+        """
+        ws = self._ws
+        if ws and self._loop:
+            asyncio.run_coroutine_threadsafe(ws.close(), self._loop)
+
+    async def _run(self):
+        """
+        Keep running till stop is called.
+        """
+        self._session = aiohttp.ClientSession()
+
+        try:
+            while self._active:
+                try:
+                    await self._run_connection()
+                except aiohttp.ClientError:
+                    pass
+                except:  # noqa
+                    et, ev, tb = sys.exc_info()
+                    self.on_error(et, ev, tb)
+
+                # Wait a while before reconnect
+                if self._active:
+                    await asyncio.sleep(1)
+        finally:
+            await self._session.close()
+            self._session = None
+
+    async def _run_connection(self):
+        """
+        Connect websocket and process messages till connection is closed.
+        """
+        self._ws = await self._session.ws_connect(
+            self.host,
+            proxy=self.proxy,
+            headers=self.header,
+            heartbeat=self.ping_interval,
+            ssl=False
+        )
+
+        # Stop may be called while connecting, when there was no
+        # connection to close yet
+        if not self._active:
+            ws = self._ws
+            self._ws = None
+
+            await ws.close()
+            return
+
+        try:
+            self.on_connected()
+
+            async for msg in self._ws:
+                if msg.type not in (aiohttp.WSMsgType.TEXT, aiohttp.WSMsgType.BINARY):
+                    break
+
+                self._process_message(msg.data)
+        finally:
+            ws = self._ws
+            self._ws = None
+
+            await ws.close()
+            self.on_disconnected()
+
+    def _process_message(self, text: Union[str, bytes]):
+        """"""
+        self._record_last_received_text(text)
+
+        start = perf_counter()
+        try:
+            data = self.unpack_data(text)
+        except ValueError as e:
+            print("websocket unable to parse data: " + str(text))
+            raise e
+
+        self.parse_time += perf_counter() - start
+        self.message_count += 1
+
+        self._log('recv data: %s', data)
+        self.on_packet(data)
+
+    def unpack_data(self, data: Union[str, bytes]):
+        """
+        Default serialization format is json, and binary data is
+        decompressed with zlib if wbits is set.
+
+        override this method if you want to use other serialization format.
+        """
+        # Each frame is compressed individually, so decompressobj cannot
+        # be reused between frames.
+        if self.wbits and isinstance(data, bytes):
+            data = zlib.decompress(data, self.wbits)
+
+        return self.decoder(data)
+
+    def on_connected(self):
+        """
+        Callback when websocket is connected successfully.
+        """
+        pass
+
+    def on_disconnected(self):
+        """
+        Callback when websocket connection is lost.
+        """
+        pass
+
+    def on_packet(self, packet: dict):
+        """
+        Callback when receiving data from server.
+        """
+        pass
+
+    def on_error(self, exception_type: type, exception_value: Exception, tb):
+        """
+        Callback when exception raised.
+        """
+        sys.stderr.write(
+            self.exception_detail(exception_type, exception_value, tb)
+        )
+        return sys.excepthook(exception_type, exception_value, tb)
+
+    def exception_detail(
+        self, exception_type: type, exception_value: Exception, tb
+    ):
+        """
+        Print detailed exception information.
+        """
+        text = "[{}]: Unhandled WebSocket Error:{}\n".format(
+            datetime.now().isoformat(), exception_type
+        )
+        text += "LastSentText:\n{}\n".format(self._last_sent_text)
+        text += "LastReceivedText:\n{}\n".format(self._last_received_text)
+        text += "Exception trace: \n"
+        text += "".join(
+            traceback.format_exception(exception_type, exception_value, tb)
+        )
+        return text
+
+    def _record_last_sent_text(self, text: str):
+        """
+        Record last sent text for debug purpose.
+        """
+        self._last_sent_text = text[:1000]
+
+    def _record_last_received_text(self, text: Union[str, bytes]):
+        """
+        Record last received text for debug purpose.
+        """
+        self._last_received_text = text[:1000]
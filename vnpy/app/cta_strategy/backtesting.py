@@ -3,6 +3,8 @@ from datetime import date, datetime, timedelta
 from typing import Callable
 from itertools import product
 from functools import lru_cache
+from multiprocessing.pool import Pool
+from multiprocessing.util import Finalize
 from time import time
 import multiprocessing
 import random
@@ -16,6 +18,7 @@ from deap import creator, base, tools, algorithms
 
 from vnpy.trader.constant import (Direction, Offset, Exchange,
                                   Interval, Status)
+from vnpy.trader.columnar import BaseArray, BarArray, TickArray, BAR_FIELDS
 from vnpy.trader.database import database_manager
 from vnpy.trader.object import OrderData, TradeData, BarData, TickData
 from vnpy.trader.utility import round_to
@@ -119,6 +122,7 @@ class BacktestingEngine:
         self.risk_free: float = 0.02
         self.mode = BacktestingMode.BAR
         self.inverse = False
+        self.columnar = False
 
         self.strategy_class = None
         self.strategy = None
@@ -130,6 +134,7 @@ class BacktestingEngine:
         self.days = 0
         self.callback = None
         self.history_data = []
+        self.history_array: BarArray = None
 
         self.stop_order_count = 0
         self.stop_orders = {}
@@ -183,9 +188,13 @@ class BacktestingEngine:
         end: datetime = None,
         mode: BacktestingMode = BacktestingMode.BAR,
         inverse: bool = False,
-        risk_free: float = 0
+        risk_free: float = 0,
+        columnar: bool = False
     ):
-        """"""
+        """
+        Set columnar to True for replaying bar data loaded into
+        NumPy arrays, which is faster for long history.
+        """
         self.mode = mode
         self.vt_symbol = vt_symbol
         self.interval = Interval(interval)
@@ -203,6 +212,27 @@ class BacktestingEngine:
         self.mode = mode
         self.inverse = inverse
         self.risk_free = risk_free
+        self.columnar = columnar
+
+    def get_setting(self) -> dict:
+        """
+        Get parameters of backtesting used by set_parameters.
+        """
+        return {
+            "vt_symbol": self.vt_symbol,
+            "interval": self.interval,
+            "start": self.start,
+            "rate": self.rate,
+            "slippage": self.slippage,
+            "size": self.size,
+            "pricetick": self.pricetick,
+            "capital": self.capital,
+            "end": self.end,
+            "mode": self.mode,
+            "inverse": self.inverse,
+            "risk_free": self.risk_free,
+            "columnar": self.columnar
+        }
 
     def add_strategy(self, strategy_class: type, setting: dict):
         """"""
@@ -223,6 +253,10 @@ class BacktestingEngine:
             return
 
         self.history_data.clear()       # Clear previously loaded history data
+        self.history_array = None
+
+        columnar = self.columnar and self.mode == BacktestingMode.BAR
+        arrays = []
 
         # Load 30 days of data each time and allow for progress update
         total_days = (self.end - self.start).days
@@ -240,7 +274,16 @@ class BacktestingEngine:
 
             end = min(end, self.end)  # Make sure end time stays within set range
 
-            if self.mode == BacktestingMode.BAR:
+            if columnar:
+                array = load_bar_array(
+                    self.symbol,
+                    self.exchange,
+                    self.interval,
+                    start,
+                    end
+                )
+                arrays.append(array)
+            elif self.mode == BacktestingMode.BAR:
                 data = load_bar_data(
                     self.symbol,
                     self.exchange,
@@ -256,7 +299,8 @@ class BacktestingEngine:
                     end
                 )
 
-            self.history_data.extend(data)
+            if not columnar:
+                self.history_data.extend(data)
 
             progress += progress_days / total_days
             progress = min(progress, 1)
@@ -264,10 +308,32 @@ class BacktestingEngine:
             start = end + interval_delta
             end += progress_delta
 
-        self.output(f"历史数据加载完成，数据量：{len(self.history_data)}")
+        if columnar:
+            # No data found in database for the whole range
+            if arrays:
+                data = np.concatenate([array.data for array in arrays])
+                tz = arrays[0].tz
+            else:
+                data = None
+                tz = None
+
+            self.history_array = BarArray(
+                self.symbol,
+                self.exchange,
+                self.interval,
+                data,
+                tz
+            )
+            self.output(f"历史数据加载完成，数据量：{len(self.history_array)}")
+        else:
+            self.output(f"历史数据加载完成，数据量：{len(self.history_data)}")
 
     def run_backtesting(self):
         """"""
+        if self.history_array is not None:
+            self.run_columnar_backtesting()
+            return
+
         if self.mode == BacktestingMode.BAR:
             func = self.new_bar
         else:
@@ -327,6 +393,115 @@ class BacktestingEngine:
         self.strategy.on_stop()
         self.output("历史数据回放结束")
 
+    def run_columnar_backtesting(self):
+        """
+        Replay bar data from history array.
+
+        Bar objects are only created when being replayed, and daily close
+        prices are calculated by date group after replay is finished.
+        """
+        array = self.history_array
+        total_size = len(array)
+
+        datetimes = array.get_datetimes()
+        columns = [array.data[name].tolist() for name in BAR_FIELDS]
+        volumes, open_interests, opens, highs, lows, closes = columns
+
+        # Wall clock date of each bar, also used for day counting
+        dates = array.data["datetime"].astype("datetime64[D]")
+        days = (dates - dates.astype("datetime64[M]")).astype(int).tolist()
+
+        gateway_name = array.gateway_name
+        symbol = self.symbol
+        exchange = self.exchange
+        interval = self.interval
+
+        def create_bar(i: int) -> BarData:
+            """"""
+            return BarData(
+                gateway_name,
+                symbol,
+                exchange,
+                datetimes[i],
+                interval,
+                volumes[i],
+                open_interests[i],
+                opens[i],
+                highs[i],
+                lows[i],
+                closes[i]
+            )
+
+        self.strategy.on_init()
+
+        # Use the first [days] of history data for initializing strategy
+        day_count = 1
+        ix = 0
+        # Days above start from 0, while datetime.day starts from 1
+        last_day = self.datetime.day - 1 if self.datetime else None
+
+        for ix in range(total_size):
+            if self.datetime and days[ix] != last_day:
+                day_count += 1
+                if day_count >= self.days:
+                    break
+
+            self.datetime = datetimes[ix]
+            last_day = days[ix]
+
+            try:
+                self.callback(create_bar(ix))
+            except Exception:
+                self.output("触发异常，回测终止")
+                self.output(traceback.format_exc())
+                return
+
+        self.strategy.inited = True
+        self.output("策略初始化完成")
+
+        self.strategy.on_start()
+        self.strategy.trading = True
+        self.output("开始回放历史数据")
+
+        # Use the rest of history data for running backtesting
+        start_ix = ix
+        backtesting_size = total_size - start_ix
+        if not backtesting_size:
+            self.output("历史数据不足，回测终止")
+            return
+
+        batch_size = max(int(backtesting_size / 10), 1)
+        on_bar = self.strategy.on_bar
+
+        for n, i in enumerate(range(start_ix, total_size, batch_size)):
+            for ix in range(i, min(i + batch_size, total_size)):
+                bar = create_bar(ix)
+                self.bar = bar
+                self.datetime = bar.datetime
+
+                try:
+                    if self.active_limit_orders:
+                        self.cross_limit_order()
+                    if self.active_stop_orders:
+                        self.cross_stop_order()
+                    on_bar(bar)
+                except Exception:
+                    self.update_daily_closes(
+                        dates[start_ix:ix], array.close_price[start_ix:ix]
+                    )
+                    self.output("触发异常，回测终止")
+                    self.output(traceback.format_exc())
+                    return
+
+            progress = min(n / 10, 1)
+            progress_bar = "=" * (n + 1)
+            self.output(f"回放进度：{progress_bar} [{progress:.0%}]")
+
+        self.update_daily_closes(dates[start_ix:], array.close_price[start_ix:])
+
+        self.strategy.on_stop()
+        self.output("历史数据回放结束")
+
     def calculate_result(self):
         """"""
         self.output("开始计算逐日盯市盈亏")
@@ -585,8 +760,16 @@ class BacktestingEngine:
         fig.update_layout(height=1000, width=1000)
         fig.show()
 
-    def run_optimization(self, optimization_setting: OptimizationSetting, output=True):
-        """"""
+    def run_optimization(
+        self,
+        optimization_setting: OptimizationSetting,
+        output=True,
+        max_workers: int = None
+    ):
+        """
+        History data is loaded only once and shared with worker processes
+        through shared memory, each worker runs multiple settings.
+        """
         # Get optimization setting and target
         settings = optimization_setting.generate_setting()
         target_name = optimization_setting.target_name
@@ -599,36 +782,40 @@ class BacktestingEngine:
             self.output("优化目标未设置，请检查")
             return
 
-        # Use multiprocessing pool for running backtesting with different setting
-        # Force to use spawn method to create new process (instead of fork on Linux)
-        ctx = multiprocessing.get_context("spawn")
-        pool = ctx.Pool(multiprocessing.cpu_count())
+        processes = max_workers or multiprocessing.cpu_count()
+        workers = self.start_workers(target_name, processes)
+        if not workers:
+            return
+        pool, shm, load_cost = workers
 
-        results = []
-        for setting in settings:
-            result = (pool.apply_async(optimize, (
-                target_name,
-                self.strategy_class,
-                setting,
-                self.vt_symbol,
-                self.interval,
-                self.start,
-                self.rate,
-                self.slippage,
-                self.size,
-                self.pricetick,
-                self.capital,
-                self.end,
-                self.mode,
-                self.inverse
-            )))
-            results.append(result)
+        start = time()
+        result_values = []
+        compute_cost = 0
 
-        pool.close()
-        pool.join()
+        try:
+            chunksize = max(int(len(settings) / processes / 4), 1)
+
+            for result, worker_load_cost, cost in pool.imap_unordered(
+                run_optimization_task,
+                settings,
+                chunksize
+            ):
+                result_values.append(result)
+                load_cost += worker_load_cost
+                compute_cost += cost
+        except BaseException:
+            self.stop_workers(pool, shm, True)
+            raise
+
+        self.stop_workers(pool, shm)
+
+        total_cost = time() - start
+
+        self.output(f"历史数据加载耗时：{load_cost:.1f}秒")
+        self.output(f"回测计算耗时：{compute_cost:.1f}秒")
+        self.output(f"参数优化完成，总耗时：{total_cost:.1f}秒")
 
         # Sort results and output
-        result_values = [result.get() for result in results]
         result_values.sort(reverse=True, key=lambda result: result[1])
 
         if output:
@@ -638,8 +825,22 @@ class BacktestingEngine:
 
         return result_values
 
-    def run_ga_optimization(self, optimization_setting: OptimizationSetting, population_size=100, ngen_size=30, output=True):
-        """"""
+    def run_ga_optimization(
+        self,
+        optimization_setting: OptimizationSetting,
+        population_size=100,
+        ngen_size=30,
+        output=True,
+        max_workers: int = None,
+        stagnation_size: int = 10
+    ):
+        """
+        Fitness of individuals is evaluated by worker processes and cached,
+        so the same parameters are never run twice in one optimization.
+
+        Optimization stops early if hall of fame is not changed for
+        stagnation_size generations, set it to 0 for disabling.
+        """
         # Get optimization setting and target
         settings = optimization_setting.generate_setting_ga()
         target_name = optimization_setting.target_name
@@ -666,36 +867,41 @@ class BacktestingEngine:
                     individual[i] = paramlist[i]
             return individual,
 
-        # Create ga object function
-        global ga_target_name
-        global ga_strategy_class
-        global ga_setting
-        global ga_vt_symbol
-        global ga_interval
-        global ga_start
-        global ga_rate
-        global ga_slippage
-        global ga_size
-        global ga_pricetick
-        global ga_capital
-        global ga_end
-        global ga_mode
-        global ga_inverse
-
-        ga_target_name = target_name
-        ga_strategy_class = self.strategy_class
-        ga_setting = settings[0]
-        ga_vt_symbol = self.vt_symbol
-        ga_interval = self.interval
-        ga_start = self.start
-        ga_rate = self.rate
-        ga_slippage = self.slippage
-        ga_size = self.size
-        ga_pricetick = self.pricetick
-        ga_capital = self.capital
-        ga_end = self.end
-        ga_mode = self.mode
-        ga_inverse = self.inverse
+        processes = max_workers or multiprocessing.cpu_count()
+        workers = self.start_workers(target_name, processes)
+        if not workers:
+            return
+        pool, shm, load_cost = workers
+
+        # Results of parameter values already run
+        cache = {}
+        costs = {"load": load_cost, "compute": 0}
+
+        def map_evaluate(func: Callable, individuals: list):
+            """
+            Evaluate individuals not in cache with worker processes.
+            """
+            keys = [tuple(individual) for individual in individuals]
+            new_keys = [key for key in dict.fromkeys(keys) if key not in cache]
+
+            if new_keys:
+                chunksize = max(int(len(new_keys) / processes / 4), 1)
+                results = pool.imap(
+                    run_optimization_task,
+                    [dict(key) for key in new_keys],
+                    chunksize
+                )
+
+                for key, (result, worker_load_cost, cost) in zip(new_keys, results):
+                    cache[key] = result
+                    costs["load"] += worker_load_cost
+                    costs["compute"] += cost
+
+            return [func(key) for key in keys]
+
+        def evaluate(key: tuple):
+            """"""
+            return (cache[key][1],)
 
         # Set up genetic algorithm
         toolbox = base.Toolbox()
@@ -703,8 +909,9 @@ class BacktestingEngine:
         toolbox.register("population", tools.initRepeat, list, toolbox.individual)
         toolbox.register("mate", tools.cxTwoPoint)
         toolbox.register("mutate", mutate_individual, indpb=1)
-        toolbox.register("evaluate", ga_optimize)
+        toolbox.register("evaluate", evaluate)
         toolbox.register("select", tools.selNSGA2)
+        toolbox.register("map", map_evaluate)
 
         total_size = len(settings)
         pop_size = population_size                      # number of individuals in each generation
@@ -725,10 +932,6 @@ class BacktestingEngine:
         stats.register("min", np.min, axis=0)
         stats.register("max", np.max, axis=0)
 
-        # Multiprocessing is not supported yet.
-        # pool = multiprocessing.Pool(multiprocessing.cpu_count())
-        # toolbox.register("map", pool.map)
-
         # Run ga optimization
         self.output(f"参数优化空间：{total_size}")
         self.output(f"每代族群总数：{pop_size}")
@@ -739,21 +942,30 @@ class BacktestingEngine:
 
         start = time()
 
-        algorithms.eaMuPlusLambda(
-            pop,
-            toolbox,
-            mu,
-            lambda_,
-            cxpb,
-            mutpb,
-            ngen,
-            stats,
-            halloffame=hof
-        )
+        try:
+            self.run_ga_generations(
+                pop,
+                toolbox,
+                mu,
+                lambda_,
+                cxpb,
+                mutpb,
+                ngen,
+                stats,
+                hof,
+                stagnation_size
+            )
+        except BaseException:
+            self.stop_workers(pool, shm, True)
+            raise
+
+        self.stop_workers(pool, shm)
 
         end = time()
         cost = int((end - start))
 
+        self.output(f"历史数据加载耗时：{costs['load']:.1f}秒")
+        self.output(f"回测计算耗时：{costs['compute']:.1f}秒，回测次数：{len(cache)}")
         self.output(f"遗传算法优化完成，耗时{cost}秒")
 
         # Return result list
@@ -761,11 +973,154 @@ class BacktestingEngine:
 
         for parameter_values in hof:
             setting = dict(parameter_values)
-            target_value = ga_optimize(parameter_values)[0]
-            results.append((setting, target_value, {}))
+            _, target_value, statistics = cache[tuple(parameter_values)]
+            results.append((setting, target_value, statistics))
 
         return results
 
+    def run_ga_generations(
+        self,
+        population: list,
+        toolbox: base.Toolbox,
+        mu: int,
+        lambda_: int,
+        cxpb: float,
+        mutpb: float,
+        ngen: int,
+        stats: tools.Statistics,
+        halloffame: tools.ParetoFront,
+        stagnation_size: int
+    ):
+        """
+        (mu + lambda) evolutionary algorithm same as eaMuPlusLambda of deap,
+        with early stop when hall of fame is stagnant.
+        """
+        logbook = tools.Logbook()
+        logbook.header = ["gen", "nevals"] + stats.fields
+
+        # Evaluate the individuals with an invalid fitness
+        invalid_ind = [ind for ind in population if not ind.fitness.valid]
+        fitnesses = toolbox.map(toolbox.evaluate, invalid_ind)
+        for ind, fit in zip(invalid_ind, fitnesses):
+            ind.fitness.values = fit
+
+        halloffame.update(population)
+
+        record = stats.compile(population)
+        logbook.record(gen=0, nevals=len(invalid_ind), **record)
+        self.output(logbook.stream)
+
+        stagnation_count = 0
+
+        for gen in range(1, ngen + 1):
+            # Vary the population
+            offspring = algorithms.varOr(population, toolbox, lambda_, cxpb, mutpb)
+
+            # Evaluate the individuals with an invalid fitness
+            invalid_ind = [ind for ind in offspring if not ind.fitness.valid]
+            fitnesses = toolbox.map(toolbox.evaluate, invalid_ind)
+            for ind, fit in zip(invalid_ind, fitnesses):
+                ind.fitness.values = fit
+
+            # Update the hall of fame with the generated individuals
+            hof_keys = {tuple(ind) for ind in halloffame}
+            halloffame.update(offspring)
+
+            # Select the next generation population
+            population[:] = toolbox.select(population + offspring, mu)
+
+            record = stats.compile(population)
+            logbook.record(gen=gen, nevals=len(invalid_ind), **record)
+            self.output(logbook.stream)
+
+            # Stop if hall of fame is not changed for a while
+            if hof_keys == {tuple(ind) for ind in halloffame}:
+                stagnation_count += 1
+            else:
+                stagnation_count = 0
+
+            if stagnation_size and stagnation_count >= stagnation_size:
+                self.output(f"最优结果连续{stagnation_count}代未变化，提前结束优化")
+                break
+
+        return population, logbook
+
+    def start_workers(self, target_name: str, processes: int):
+        """
+        Load history data and put it into shared memory, then start
+        worker processes for running optimization.
+        """
+        start = time()
+
+        self.load_data()
+        history = self.get_history_array()
+
+        if not len(history):
+            self.output("历史数据为空，无法优化")
+            return None
+
+        # shared_memory is only available since Python 3.8
+        from multiprocessing.shared_memory import SharedMemory
+
+        shm = SharedMemory(create=True, size=history.data.nbytes)
+        shared_data = np.ndarray(
+            history.data.shape,
+            dtype=history.dtype,
+            buffer=shm.buf
+        )
+        shared_data[:] = history.data
+        del shared_data
+
+        load_cost = time() - start
+
+        # Force to use spawn method to create new process (instead of fork on Linux)
+        ctx = multiprocessing.get_context("spawn")
+        pool = ctx.Pool(
+            processes,
+            initializer=init_optimization_worker,
+            initargs=(
+                target_name,
+                self.strategy_class,
+                self.get_setting(),
+                history.new_array(history.data[:0]),
+                shm.name,
+                len(history)
+            )
+        )
+
+        return pool, shm, load_cost
+
+    def stop_workers(self, pool: Pool, shm, terminate: bool = False):
+        """
+        Stop worker processes and release shared memory.
+        """
+        # Workers exit normally to detach from shared memory, unless
+        # optimization is interrupted
+        if terminate:
+            pool.terminate()
+        else:
+            pool.close()
+        pool.join()
+
+        shm.close()
+        shm.unlink()
+
+    def get_history_array(self) -> BaseArray:
+        """
+        Get loaded history data as columnar array.
+        """
+        if self.history_array is not None:
+            return self.history_array
+
+        if self.mode == BacktestingMode.BAR:
+            return BarArray.from_bars(
+                self.history_data, self.symbol, self.exchange, self.interval
+            )
+        else:
+            return TickArray.from_ticks(
+                self.history_data, self.symbol, self.exchange
+            )
+
     def update_daily_close(self, price: float):
         """"""
         d = self.datetime.date()
@@ -776,6 +1131,25 @@ class BacktestingEngine:
         else:
             self.daily_results[d] = DailyResult(d, price)
 
+    def update_daily_closes(self, dates: np.ndarray, prices: np.ndarray):
+        """
+        Update daily close with last price of each date group.
+        """
+        if not len(dates):
+            return
+
+        last_mask = np.append(dates[1:] != dates[:-1], True)
+
+        for d, price in zip(
+            dates[last_mask].tolist(),
+            prices[last_mask].tolist()
+        ):
+            daily_result = self.daily_results.get(d, None)
+            if daily_result:
+                daily_result.close_price = price
+            else:
+                self.daily_results[d] = DailyResult(d, price)
+
     def new_bar(self, bar: BarData):
         """"""
         self.bar = bar
@@ -1235,82 +1609,105 @@ class DailyResult:
         self.net_pnl = self.total_pnl - self.commission - self.slippage
 
 
-def optimize(
+def init_optimization_worker(
     target_name: str,
     strategy_class: CtaTemplate,
     setting: dict,
-    vt_symbol: str,
-    interval: Interval,
-    start: datetime,
-    rate: float,
-    slippage: float,
-    size: float,
-    pricetick: float,
-    capital: int,
-    end: datetime,
-    mode: BacktestingMode,
-    inverse: bool
+    template: BaseArray,
+    shm_name: str,
+    size: int
 ):
     """
-    Function for running in multiprocessing.pool
+    Initializer of optimization worker process, which attaches to
+    history data in shared memory.
+    """
+    from multiprocessing.shared_memory import SharedMemory
+
+    start = time()
+
+    shm = SharedMemory(name=shm_name)
+    data = np.ndarray(size, dtype=template.dtype, buffer=shm.buf)
+    history = template.new_array(data)
+
+    if setting["columnar"] and setting["mode"] == BacktestingMode.BAR:
+        history_array = history
+        history_data = []
+    elif isinstance(history, BarArray):
+        history_array = None
+        history_data = history.to_bars()
+    else:
+        history_array = None
+        history_data = history.to_ticks()
+
+    worker_context.update({
+        "target_name": target_name,
+        "strategy_class": strategy_class,
+        "setting": setting,
+        "shm": shm,
+        "history_array": history_array,
+        "history_data": history_data,
+        "load_cost": time() - start
+    })
+
+    # Called when worker process exits
+    Finalize(None, close_optimization_worker, exitpriority=0)
+
+
+def close_optimization_worker():
     """
+    Release history data and detach from shared memory.
+    """
+    shm = worker_context.pop("shm", None)
+
+    # Arrays using buffer of shared memory should be released before close
+    worker_context.clear()
+
+    if shm:
+        shm.close()
+
+
+def run_optimization_task(strategy_setting: dict):
+    """
+    Function for running in optimization worker process.
+    """
+    start = time()
+
     engine = BacktestingEngine()
+    engine.set_parameters(**worker_context["setting"])
+    engine.add_strategy(worker_context["strategy_class"], strategy_setting)
 
-    engine.set_parameters(
-        vt_symbol=vt_symbol,
-        interval=interval,
-        start=start,
-        rate=rate,
-        slippage=slippage,
-        size=size,
-        pricetick=pricetick,
-        capital=capital,
-        end=end,
-        mode=mode,
-        inverse=inverse
-    )
+    engine.history_data = worker_context["history_data"]
+    engine.history_array = worker_context["history_array"]
 
-    engine.add_strategy(strategy_class, setting)
-    engine.load_data()
     engine.run_backtesting()
     engine.calculate_result()
     statistics = engine.calculate_statistics(output=False)
 
-    target_value = statistics[target_name]
-    return (str(setting), target_value, statistics)
+    target_value = statistics[worker_context["target_name"]]
+    result = (str(strategy_setting), target_value, statistics)
 
+    # Load cost of worker is only counted once
+    load_cost = worker_context.pop("load_cost", 0)
 
-@lru_cache(maxsize=1000000)
-def _ga_optimize(parameter_values: tuple):
-    """"""
-    setting = dict(parameter_values)
-
-    result = optimize(
-        ga_target_name,
-        ga_strategy_class,
-        setting,
-        ga_vt_symbol,
-        ga_interval,
-        ga_start,
-        ga_rate,
-        ga_slippage,
-        ga_size,
-        ga_pricetick,
-        ga_capital,
-        ga_end,
-        ga_mode,
-        ga_inverse
-    )
-    return (result[1],)
+    return result, load_cost, time() - start
 
 
-def ga_optimize(parameter_values: list):
+@lru_cache(maxsize=999)
+def load_bar_data(
+    symbol: str,
+    exchange: Exchange,
+    interval: Interval,
+    start: datetime,
+    end: datetime
+):
     """"""
-    return _ga_optimize(tuple(parameter_values))
+    return database_manager.load_bar_data(
+        symbol, exchange, interval, start, end
+    )
 
 
 @lru_cache(maxsize=999)
-def load_bar_data(
+def load_bar_array(
     symbol: str,
     exchange: Exchange,
     interval: Interval,
@@ -1318,7 +1715,7 @@ def load_bar_data(
     end: datetime
 ):
     """"""
-    return database_manager.load_bar_data(
+    return database_manager.load_bar_array(
         symbol, exchange, interval, start, end
     )
 
@@ -1336,17 +1733,5 @@ def load_tick_data(
     )
 
 
-# GA related global value
-ga_end = None
-ga_mode = None
-ga_target_name = None
-ga_strategy_class = None
-ga_setting = None
-ga_vt_symbol = None
-ga_interval = None
-ga_start = None
-ga_rate = None
-ga_slippage = None
-ga_size = None
-ga_pricetick = None
-ga_capital = None
+# Context of optimization worker process
+worker_context = {}
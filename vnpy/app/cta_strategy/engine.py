@@ -5,7 +5,7 @@ import os
 import traceback
 from collections import defaultdict
 from pathlib import Path
-from typing import Any, Callable
+from typing import Any, Callable, List
 from datetime import datetime, timedelta
 from concurrent.futures import ThreadPoolExecutor
 from copy import copy
@@ -40,6 +40,7 @@ from vnpy.trader.utility import load_json, save_json, extract_vt_symbol, round_t
 from vnpy.trader.database import database_manager
 from vnpy.trader.rqdata import rqdata_client
 from vnpy.trader.converter import OffsetConverter
+from vnpy.trader.host import StrategyHostManager, StrategyProxy, HostEngine
 
 from .base import (
     APP_NAME,
@@ -101,6 +102,9 @@ class CtaEngine(BaseEngine):
 
         self.offset_converter = OffsetConverter(self.main_engine)
 
+        # For strategies running in child processes
+        self.host_manager = StrategyHostManager(self, CtaHostEngine)
+
     def init_engine(self):
         """
         """
@@ -114,6 +118,7 @@ class CtaEngine(BaseEngine):
     def close(self):
         """"""
         self.stop_all_strategies()
+        self.host_manager.close()
 
     def register_event(self):
         """"""
@@ -150,6 +155,8 @@ class CtaEngine(BaseEngine):
         """"""
         tick = event.data
 
+        self.host_manager.put_tick(tick)
+
         strategies = self.symbol_strategy_map[tick.vt_symbol]
         if not strategies:
             return
@@ -531,6 +538,21 @@ class CtaEngine(BaseEngine):
         use_database: bool
     ):
         """"""
+        bars = self.query_bar(vt_symbol, days, interval, use_database)
+
+        for bar in bars:
+            callback(bar)
+
+    def query_bar(
+        self,
+        vt_symbol: str,
+        days: int,
+        interval: Interval,
+        use_database: bool
+    ):
+        """
+        Query history bar data from gateway/RQData/database.
+        """
         symbol, exchange = extract_vt_symbol(vt_symbol)
         end = datetime.now(get_localzone())
         start = end - timedelta(days)
@@ -564,8 +586,7 @@ class CtaEngine(BaseEngine):
                 end=end,
             )
 
-        for bar in bars:
-            callback(bar)
+        return bars
 
     def load_tick(
         self,
@@ -574,6 +595,15 @@ class CtaEngine(BaseEngine):
         callback: Callable[[TickData], None]
     ):
         """"""
+        ticks = self.query_tick(vt_symbol, days)
+
+        for tick in ticks:
+            callback(tick)
+
+    def query_tick(self, vt_symbol: str, days: int):
+        """
+        Query history tick data from database.
+        """
         symbol, exchange = extract_vt_symbol(vt_symbol)
         end = datetime.now()
         start = end - timedelta(days)
@@ -585,8 +615,7 @@ class CtaEngine(BaseEngine):
             end=end,
         )
 
-        for tick in ticks:
-            callback(tick)
+        return ticks
 
     def call_strategy_func(
         self, strategy: CtaTemplate, func: Callable, params: Any = None
@@ -607,10 +636,17 @@ class CtaEngine(BaseEngine):
             self.write_log(msg, strategy)
 
     def add_strategy(
-        self, class_name: str, strategy_name: str, vt_symbol: str, setting: dict
+        self,
+        class_name: str,
+        strategy_name: str,
+        vt_symbol: str,
+        setting: dict,
+        process_group: str = ""
     ):
         """
         Add a new strategy.
+
+        Strategy is run in child process of process_group if specified.
         """
         if strategy_name in self.strategies:
             self.write_log(f"创建策略失败，存在重名{strategy_name}")
@@ -630,7 +666,22 @@ class CtaEngine(BaseEngine):
             self.write_log("创建策略失败，本地代码的交易所后缀不正确")
             return
 
-        strategy = strategy_class(self, strategy_name, vt_symbol, setting)
+        if process_group:
+            try:
+                strategy = self.host_manager.add_strategy(
+                    process_group,
+                    strategy_class,
+                    strategy_name,
+                    [vt_symbol],
+                    vt_symbol,
+                    setting
+                )
+            except Exception:
+                msg = f"创建策略失败，策略进程{process_group}触发异常：\n{traceback.format_exc()}"
+                self.write_log(msg)
+                return
+        else:
+            strategy = strategy_class(self, strategy_name, vt_symbol, setting)
         self.strategies[strategy_name] = strategy
 
         # Add vt_symbol to strategy map.
@@ -764,6 +815,10 @@ class CtaEngine(BaseEngine):
         # Remove from strategies
         self.strategies.pop(strategy_name)
 
+        # Remove from child process
+        if isinstance(strategy, StrategyProxy):
+            self.host_manager.remove_strategy(strategy)
+
         return True
 
     def load_strategy_class(self):
@@ -873,7 +928,8 @@ class CtaEngine(BaseEngine):
                 strategy_config["class_name"],
                 strategy_name,
                 strategy_config["vt_symbol"],
-                strategy_config["setting"]
+                strategy_config["setting"],
+                strategy_config.get("process_group", "")
             )
 
     def update_strategy_setting(self, strategy_name: str, setting: dict):
@@ -887,6 +943,10 @@ class CtaEngine(BaseEngine):
             "vt_symbol": strategy.vt_symbol,
             "setting": setting,
         }
+
+        if isinstance(strategy, StrategyProxy):
+            self.strategy_setting[strategy_name]["process_group"] = strategy.process_group
+
         save_json(self.setting_filename, self.strategy_setting)
 
     def remove_strategy_setting(self, strategy_name: str):
@@ -935,3 +995,68 @@ class CtaEngine(BaseEngine):
             subject = "CTA策略引擎"
 
         self.main_engine.send_email(subject, msg)
+
+
+class CtaHostEngine(HostEngine):
+    """
+    Strategy engine used by CTA strategies running in child process.
+    """
+
+    engine_type = EngineType.LIVE
+
+    # Pos is updated by trade events in parent
+    parent_variables: List[str] = ["pos"]
+
+    def send_order(
+        self,
+        strategy,
+        direction: Direction,
+        offset: Offset,
+        price: float,
+        volume: float,
+        stop: bool,
+        lock: bool
+    ):
+        """"""
+        return self.request(
+            "send_order", strategy, direction, offset, price, volume, stop, lock
+        )
+
+    def cancel_order(self, strategy, vt_orderid: str):
+        """"""
+        self.send_request("cancel_order", strategy, vt_orderid)
+
+    def cancel_all(self, strategy):
+        """"""
+        self.send_request("cancel_all", strategy)
+
+    def get_engine_type(self):
+        """"""
+        return self.engine_type
+
+    def get_pricetick(self, strategy):
+        """"""
+        return self.request("get_pricetick", strategy)
+
+    def load_bar(
+        self,
+        vt_symbol: str,
+        days: int,
+        interval: Interval,
+        callback: Callable,
+        use_database: bool
+    ):
+        """"""
+        bars = self.request(
+            "query_bar", vt_symbol, days, interval, use_database, codec="bar"
+        )
+
+        for bar in bars:
+            callback(bar)
+
+    def load_tick(self, vt_symbol: str, days: int, callback: Callable):
+        """"""
+        ticks = self.request("query_tick", vt_symbol, days, codec="tick")
+
+        for tick in ticks:
+            callback(tick)
@@ -8,6 +8,7 @@ from vnpy.app.cta_strategy import (
     BarGenerator,
     ArrayManager,
 )
+from vnpy.trader.indicator import AtrIndicator, RsiIndicator, SmaIndicator
 
 
 class AtrRsiStrategy(CtaTemplate):
@@ -21,6 +22,7 @@ class AtrRsiStrategy(CtaTemplate):
     rsi_entry = 16
     trailing_percent = 0.8
     fixed_size = 1
+    stream_indicator = False
 
     atr_value = 0
     atr_ma = 0
@@ -36,7 +38,8 @@ class AtrRsiStrategy(CtaTemplate):
         "rsi_length",
         "rsi_entry",
         "trailing_percent",
-        "fixed_size"
+        "fixed_size",
+        "stream_indicator"
     ]
     variables = [
         "atr_value",
@@ -54,6 +57,11 @@ class AtrRsiStrategy(CtaTemplate):
         self.bg = BarGenerator(self.on_bar)
         self.am = ArrayManager()
 
+        # Streaming indicators updated in O(1) for each bar
+        self.atr_stream = AtrIndicator(self.atr_length)
+        self.atr_ma_stream = SmaIndicator(self.atr_ma_length)
+        self.rsi_stream = RsiIndicator(self.rsi_length)
+
     def on_init(self):
         """
         Callback when strategy is inited.
@@ -91,13 +99,23 @@ class AtrRsiStrategy(CtaTemplate):
 
         am = self.am
         am.update_bar(bar)
+
+        if self.stream_indicator:
+            self.atr_value = self.atr_stream.update(
+                bar.high_price, bar.low_price, bar.close_price
+            )
+            if self.atr_stream.inited:
+                self.atr_ma = self.atr_ma_stream.update(self.atr_value)
+            self.rsi_value = self.rsi_stream.update(bar.close_price)
+
         if not am.inited:
             return
 
-        atr_array = am.atr(self.atr_length, array=True)
-        self.atr_value = atr_array[-1]
-        self.atr_ma = atr_array[-self.atr_ma_length:].mean()
-        self.rsi_value = am.rsi(self.rsi_length)
+        if not self.stream_indicator:
+            atr_array = am.atr(self.atr_length, array=True)
+            self.atr_value = atr_array[-1]
+            self.atr_ma = atr_array[-self.atr_ma_length:].mean()
+            self.rsi_value = am.rsi(self.rsi_length)
 
         if self.pos == 0:
             self.intra_trade_high = bar.high_price
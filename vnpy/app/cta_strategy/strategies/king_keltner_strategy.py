@@ -8,6 +8,7 @@ from vnpy.app.cta_strategy import (
     BarGenerator,
     ArrayManager,
 )
+from vnpy.trader.indicator import KeltnerIndicator
 
 
 class KingKeltnerStrategy(CtaTemplate):
@@ -19,6 +20,7 @@ class KingKeltnerStrategy(CtaTemplate):
     kk_dev = 1.6
     trailing_percent = 0.8
     fixed_size = 1
+    stream_indicator = False
 
     kk_up = 0
     kk_down = 0
@@ -29,7 +31,13 @@ class KingKeltnerStrategy(CtaTemplate):
     short_vt_orderids = []
     vt_orderids = []
 
-    parameters = ["kk_length", "kk_dev", "trailing_percent", "fixed_size"]
+    parameters = [
+        "kk_length",
+        "kk_dev",
+        "trailing_percent",
+        "fixed_size",
+        "stream_indicator"
+    ]
     variables = ["kk_up", "kk_down"]
 
     def __init__(self, cta_engine, strategy_name, vt_symbol, setting):
@@ -39,6 +47,9 @@ class KingKeltnerStrategy(CtaTemplate):
         self.bg = BarGenerator(self.on_bar, 5, self.on_5min_bar)
         self.am = ArrayManager()
 
+        # Streaming indicator updated in O(1) for each bar
+        self.kk_stream = KeltnerIndicator(self.kk_length, self.kk_dev)
+
     def on_init(self):
         """
         Callback when strategy is inited.
@@ -78,10 +89,17 @@ class KingKeltnerStrategy(CtaTemplate):
 
         am = self.am
         am.update_bar(bar)
+
+        if self.stream_indicator:
+            self.kk_up, self.kk_down = self.kk_stream.update(
+                bar.high_price, bar.low_price, bar.close_price
+            )
+
         if not am.inited:
             return
 
-        self.kk_up, self.kk_down = am.keltner(self.kk_length, self.kk_dev)
+        if not self.stream_indicator:
+            self.kk_up, self.kk_down = am.keltner(self.kk_length, self.kk_dev)
 
         if self.pos == 0:
             self.intra_trade_high = bar.high_price
@@ -135,6 +135,10 @@ class ManagerEngine(BaseEngine):
         data = database_manager.get_bar_data_statistics()
 
         for d in data:
+            # Overview of some database already contains start and end
+            if "start" in d and "end" in d:
+                continue
+
             oldest_bar = database_manager.get_oldest_bar_data(
                 d["symbol"], Exchange(d["exchange"]), Interval(d["interval"])
             )
@@ -147,6 +151,10 @@ class ManagerEngine(BaseEngine):
 
         return data
 
+    def rebuild_bar_overview(self) -> None:
+        """"""
+        database_manager.rebuild_bar_overview()
+
     def load_bar_data(
         self,
         symbol: str,
@@ -202,17 +210,17 @@ class ManagerEngine(BaseEngine):
         vt_symbol = f"{symbol}.{exchange.value}"
         contract = self.main_engine.get_contract(vt_symbol)
 
-        # If history data provided in gateway, then query
+        # If history data provided in gateway, then save data part by part
         if contract and contract.history_data:
-            data = self.main_engine.query_history(
-                req, contract.gateway_name
+            return self.main_engine.download_history(
+                req, contract.gateway_name, database_manager.save_bar_data
             )
+
         # Otherwise use RQData to query data
-        else:
-            if not rqdata_client.inited:
-                rqdata_client.init()
+        if not rqdata_client.inited:
+            rqdata_client.init()
 
-            data = rqdata_client.query_history(req)
+        data = rqdata_client.query_history(req)
 
         if data:
             database_manager.save_bar_data(data)
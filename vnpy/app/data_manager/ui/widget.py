@@ -43,12 +43,16 @@ class ManagerWidget(QtWidgets.QWidget):
         download_button = QtWidgets.QPushButton("下载数据")
         download_button.clicked.connect(self.download_data)
 
+        rebuild_button = QtWidgets.QPushButton("重建概览")
+        rebuild_button.clicked.connect(self.rebuild_overview)
+
         hbox1 = QtWidgets.QHBoxLayout()
         hbox1.addWidget(refresh_button)
         hbox1.addStretch()
         hbox1.addWidget(import_button)
         hbox1.addWidget(update_button)
         hbox1.addWidget(download_button)
+        hbox1.addWidget(rebuild_button)
 
         hbox2 = QtWidgets.QHBoxLayout()
         hbox2.addWidget(self.tree)
@@ -387,6 +391,11 @@ class ManagerWidget(QtWidgets.QWidget):
         dialog = DownloadDialog(self.engine)
         dialog.exec_()
 
+    def rebuild_overview(self) -> None:
+        """"""
+        self.engine.rebuild_bar_overview()
+        self.refresh_tree()
+
     def show(self) -> None:
         """"""
         self.showMaximized()
@@ -2,8 +2,10 @@
 
 import sys
 from threading import Thread
-from queue import Queue, Empty
+from queue import Queue, Empty, Full
 from copy import copy
+from time import time
+from typing import List, Tuple
 
 from vnpy.event import Event, EventEngine
 from vnpy.trader.engine import BaseEngine, MainEngine
@@ -25,6 +27,7 @@ APP_NAME = "DataRecorder"
 EVENT_RECORDER_LOG = "eRecorderLog"
 EVENT_RECORDER_UPDATE = "eRecorderUpdate"
 EVENT_RECORDER_EXCEPTION = "eRecorderException"
+EVENT_RECORDER_STATUS = "eRecorderStatus"
 
 
 class RecorderEngine(BaseEngine):
@@ -35,7 +38,6 @@ class RecorderEngine(BaseEngine):
         """"""
         super().__init__(main_engine, event_engine, APP_NAME)
 
-        self.queue = Queue()
         self.thread = Thread(target=self.run)
         self.active = False
 
@@ -43,7 +45,23 @@ class RecorderEngine(BaseEngine):
         self.bar_recordings = {}
         self.bar_generators = {}
 
+        # Data in queue is written into database in batches, and a batch
+        # is written when batch_size reached or batch_interval passed.
+        self.batch_size = 1000
+        self.batch_interval = 0.1       # seconds
+
+        # When queue size reaches the watermark, new data is dropped if
+        # drop_data is True, otherwise it waits for a short time until
+        # queue has space. Event thread is never blocked for long.
+        self.queue_watermark = 1000000
+        self.drop_data = False
+        self.drop_count = 0
+        self.put_timeout = 0.1          # seconds
+
         self.load_setting()
+
+        self.queue = Queue(maxsize=self.queue_watermark)
+
         self.register_event()
         self.start()
         self.put_event()
@@ -54,11 +72,20 @@ class RecorderEngine(BaseEngine):
         self.tick_recordings = setting.get("tick", {})
         self.bar_recordings = setting.get("bar", {})
 
+        self.batch_size = setting.get("batch_size", self.batch_size)
+        self.batch_interval = setting.get("batch_interval", self.batch_interval)
+        self.queue_watermark = setting.get("queue_watermark", self.queue_watermark)
+        self.drop_data = setting.get("drop_data", self.drop_data)
+
     def save_setting(self):
         """"""
         setting = {
             "tick": self.tick_recordings,
-            "bar": self.bar_recordings
+            "bar": self.bar_recordings,
+            "batch_size": self.batch_size,
+            "batch_interval": self.batch_interval,
+            "queue_watermark": self.queue_watermark,
+            "drop_data": self.drop_data
         }
         save_json(self.setting_filename, setting)
 
@@ -67,28 +94,86 @@ class RecorderEngine(BaseEngine):
         while self.active:
             try:
                 task = self.queue.get(timeout=1)
-                task_type, data = task
-
-                if task_type == "tick":
-                    database_manager.save_tick_data([data])
-                elif task_type == "bar":
-                    database_manager.save_bar_data([data])
-
             except Empty:
                 continue
 
+            tasks = self.get_batch(task)
+
+            try:
+                self.save_batch(tasks)
             except Exception:
                 self.active = False
 
                 info = sys.exc_info()
                 event = Event(EVENT_RECORDER_EXCEPTION, info)
                 self.event_engine.put(event)
+                return
+
+        # Save data left in queue after stopped
+        tasks = []
+        while True:
+            try:
+                tasks.append(self.queue.get_nowait())
+            except Empty:
+                break
+
+        if tasks:
+            self.save_batch(tasks)
+
+    def get_batch(self, task: Tuple[str, object]) -> List[Tuple[str, object]]:
+        """
+        Get a batch of tasks from queue, until batch_size reached or
+        batch_interval passed.
+        """
+        tasks = [task]
+        end = time() + self.batch_interval
+
+        while len(tasks) < self.batch_size:
+            timeout = end - time()
+            if timeout <= 0:
+                break
+
+            try:
+                tasks.append(self.queue.get(timeout=timeout))
+            except Empty:
+                break
+
+        return tasks
+
+    def save_batch(self, tasks: List[Tuple[str, object]]):
+        """
+        Write a batch of tasks into database with one insert of each type.
+        """
+        start = time()
+
+        ticks = [data for task_type, data in tasks if task_type == "tick"]
+        bars = [data for task_type, data in tasks if task_type == "bar"]
+
+        if ticks:
+            database_manager.save_tick_data(ticks)
+        if bars:
+            database_manager.save_bar_data(bars)
+
+        latency = time() - start
+        self.put_status_event(len(tasks), latency)
+
+    def put_status_event(self, batch_size: int, latency: float):
+        """"""
+        data = {
+            "queue_size": self.queue.qsize(),
+            "batch_size": batch_size,
+            "latency": latency,
+            "drop_count": self.drop_count
+        }
+
+        event = Event(EVENT_RECORDER_STATUS, data)
+        self.event_engine.put(event)
 
     def close(self):
         """"""
         self.active = False
 
-        if self.thread.isAlive():
+        if self.thread.is_alive():
             self.thread.join()
 
     def start(self):
@@ -243,12 +328,33 @@ class RecorderEngine(BaseEngine):
     def record_tick(self, tick: TickData):
         """"""
         task = ("tick", copy(tick))
-        self.queue.put(task)
+        self.put_task(task)
 
     def record_bar(self, bar: BarData):
         """"""
         task = ("bar", copy(bar))
-        self.queue.put(task)
+        self.put_task(task)
+
+    def put_task(self, task: Tuple[str, object]):
+        """
+        Put task into queue, drop it if queue is still full after waiting
+        or writer thread is stopped.
+        """
+        if self.active:
+            try:
+                if self.drop_data:
+                    self.queue.put_nowait(task)
+                else:
+                    self.queue.put(task, timeout=self.put_timeout)
+                return
+            except Full:
+                pass
+
+        self.drop_count += 1
+
+        # Avoid flooding log when dropping lots of data
+        if self.drop_count % 10000 == 1:
+            self.write_log(f"队列已满或记录已停止，丢弃数据累计：{self.drop_count}")
 
     def get_bar_generator(self, vt_symbol: str):
         """"""
@@ -1,5 +1,5 @@
 from copy import copy
-from typing import Any, Dict, Tuple, Optional, List
+from typing import Any, Callable, Dict, Tuple, Optional, List
 from datetime import datetime
 from tzlocal import get_localzone
 
@@ -57,9 +57,11 @@ class PaperEngine(BaseEngine):
         # Patch main engine functions
         self._subscribe = main_engine.subscribe
         self._query_history = main_engine.query_history
+        self._download_history = main_engine.download_history
 
         main_engine.subscribe = self.subscribe
         main_engine.query_history = self.query_history
+        main_engine.download_history = self.download_history
         main_engine.send_order = self.send_order
         main_engine.cancel_order = self.cancel_order
 
@@ -149,6 +151,19 @@ class PaperEngine(BaseEngine):
         else:
             return None
 
+    def download_history(
+        self,
+        req: HistoryRequest,
+        gateway_name: str,
+        callback: Callable[[List[BarData]], Any]
+    ) -> int:
+        """"""
+        original_gateway_name = self.gateway_map.get(req.vt_symbol, "")
+        if original_gateway_name:
+            return self._download_history(req, original_gateway_name, callback)
+        else:
+            return 0
+
     def send_order(self, req: OrderRequest, gateway_name: str) -> str:
         """"""
         contract: ContractData = self.main_engine.get_contract(req.vt_symbol)
@@ -41,6 +41,7 @@ from vnpy.trader.utility import load_json, save_json, extract_vt_symbol, round_t
 from vnpy.trader.database import database_manager
 from vnpy.trader.rqdata import rqdata_client
 from vnpy.trader.converter import OffsetConverter
+from vnpy.trader.host import StrategyHostManager, StrategyProxy, HostEngine
 
 from .base import (
     APP_NAME,
@@ -74,6 +75,9 @@ class StrategyEngine(BaseEngine):
 
         self.offset_converter: OffsetConverter = OffsetConverter(self.main_engine)
 
+        # For strategies running in child processes
+        self.host_manager: StrategyHostManager = StrategyHostManager(self, PortfolioHostEngine)
+
     def init_engine(self):
         """
         """
@@ -87,6 +91,7 @@ class StrategyEngine(BaseEngine):
     def close(self):
         """"""
         self.stop_all_strategies()
+        self.host_manager.close()
 
     def register_event(self):
         """"""
@@ -123,6 +128,8 @@ class StrategyEngine(BaseEngine):
         """"""
         tick: TickData = event.data
 
+        self.host_manager.put_tick(tick)
+
         strategies = self.symbol_strategy_map[tick.vt_symbol]
         if not strategies:
             return
@@ -333,10 +340,17 @@ class StrategyEngine(BaseEngine):
             self.write_log(msg, strategy)
 
     def add_strategy(
-        self, class_name: str, strategy_name: str, vt_symbols: list, setting: dict
+        self,
+        class_name: str,
+        strategy_name: str,
+        vt_symbols: list,
+        setting: dict,
+        process_group: str = ""
     ):
         """
         Add a new strategy.
+
+        Strategy is run in child process of process_group if specified.
         """
         if strategy_name in self.strategies:
             self.write_log(f"创建策略失败，存在重名{strategy_name}")
@@ -347,7 +361,22 @@ class StrategyEngine(BaseEngine):
             self.write_log(f"创建策略失败，找不到策略类{class_name}")
             return
 
-        strategy = strategy_class(self, strategy_name, vt_symbols, setting)
+        if process_group:
+            try:
+                strategy = self.host_manager.add_strategy(
+                    process_group,
+                    strategy_class,
+                    strategy_name,
+                    vt_symbols,
+                    vt_symbols,
+                    setting
+                )
+            except Exception:
+                msg = f"创建策略失败，策略进程{process_group}触发异常：\n{traceback.format_exc()}"
+                self.write_log(msg)
+                return
+        else:
+            strategy = strategy_class(self, strategy_name, vt_symbols, setting)
         self.strategies[strategy_name] = strategy
 
         # Add vt_symbol to strategy map.
@@ -387,6 +416,7 @@ class StrategyEngine(BaseEngine):
                 if name == "pos":
                     pos = getattr(strategy, name)
                     pos.update(value)
+                    setattr(strategy, name, pos)    # Sync to strategy in child process
                 elif value:
                     setattr(strategy, name, value)
 
@@ -479,6 +509,10 @@ class StrategyEngine(BaseEngine):
         self.strategies.pop(strategy_name)
         self.save_strategy_setting()
 
+        # Remove from child process
+        if isinstance(strategy, StrategyProxy):
+            self.host_manager.remove_strategy(strategy)
+
         return True
 
     def load_strategy_class(self):
@@ -594,7 +628,8 @@ class StrategyEngine(BaseEngine):
                 strategy_config["class_name"],
                 strategy_name,
                 strategy_config["vt_symbols"],
-                strategy_config["setting"]
+                strategy_config["setting"],
+                strategy_config.get("process_group", "")
             )
 
     def save_strategy_setting(self):
@@ -610,6 +645,9 @@ class StrategyEngine(BaseEngine):
                 "setting": strategy.get_parameters()
             }
 
+            if isinstance(strategy, StrategyProxy):
+                strategy_setting[name]["process_group"] = strategy.process_group
+
         save_json(self.setting_filename, strategy_setting)
 
     def put_strategy_event(self, strategy: StrategyTemplate):
@@ -641,3 +679,37 @@ class StrategyEngine(BaseEngine):
             subject = "组合策略引擎"
 
         self.main_engine.send_email(subject, msg)
+
+
+class PortfolioHostEngine(HostEngine):
+    """
+    Strategy engine used by portfolio strategies running in child process.
+    """
+
+    extra_attrs: List[str] = ["active_orderids"]
+
+    def send_order(
+        self,
+        strategy: StrategyTemplate,
+        vt_symbol: str,
+        direction: Direction,
+        offset: Offset,
+        price: float,
+        volume: float,
+        lock: bool
+    ):
+        """"""
+        return self.request(
+            "send_order", strategy, vt_symbol, direction, offset, price, volume, lock
+        )
+
+    def cancel_order(self, strategy: StrategyTemplate, vt_orderid: str):
+        """"""
+        self.send_request("cancel_order", strategy, vt_orderid)
+
+    def load_bar(self, vt_symbol: str, days: int, interval: Interval) -> List[BarData]:
+        """"""
+        return self.request("load_bar", vt_symbol, days, interval, codec="bar")
+
+    # Merge bars of vt_symbols in the same way as StrategyEngine
+    load_bars = StrategyEngine.load_bars
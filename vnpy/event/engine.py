@@ -2,11 +2,11 @@
 Event-driven framework of vn.py framework.
 """
 
-from collections import defaultdict
+from collections import defaultdict, deque
 from queue import Empty, Queue
-from threading import Thread
-from time import sleep
-from typing import Any, Callable, List
+from threading import Thread, Condition
+from time import sleep, perf_counter
+from typing import Any, Callable, List, Deque, Dict
 
 EVENT_TIMER = "eTimer"
 
@@ -106,10 +106,17 @@ class EventEngine:
         """
         self._queue.put(event)
 
-    def register(self, type: str, handler: HandlerType) -> None:
+    def register(
+        self,
+        type: str,
+        handler: HandlerType,
+        shard_safe: bool = False
+    ) -> None:
         """
         Register a new handler function for a specific event type. Every
         function can only be registered once for each event type.
+
+        shard_safe is only used by ShardedEventEngine and ignored here.
         """
         handler_list = self._handlers[type]
         if handler not in handler_list:
@@ -127,6 +134,13 @@ class EventEngine:
         if not handler_list:
             self._handlers.pop(type)
 
+    def has_handler(self, type: str) -> bool:
+        """
+        Check if any handler function will receive event of the type,
+        which can be used to skip creating events nobody listens to.
+        """
+        return type in self._handlers or bool(self._general_handlers)
+
     def register_general(self, handler: HandlerType) -> None:
         """
         Register a new handler function for all event types. Every
@@ -141,3 +155,306 @@ class EventEngine:
         """
         if handler in self._general_handlers:
             self._general_handlers.remove(handler)
+
+
+class BatchEventEngine(EventEngine):
+    """
+    Event engine optimized for high event throughput.
+
+    Events are stored in a deque and drained by the worker thread in
+    batches, so that the queue lock is only touched when the worker
+    is idle. Events are still processed in the exact order they are
+    put, which keeps the ordering of each event type.
+
+    Queue depth and dispatch latency counters are provided for
+    monitoring whether the engine is lagging behind.
+    """
+
+    def __init__(self, interval: int = 1, batch_size: int = 1000):
+        """
+        Worker thread processes at most batch_size events each time
+        it drains the queue.
+        """
+        super().__init__(interval)
+
+        self._batch_size: int = batch_size
+        self._deque: Deque = deque()
+        self._condition: Condition = Condition()
+        self._waiting: bool = False
+
+        self._put_count: int = 0
+        self._process_count: int = 0
+        self._batch_count: int = 0
+        self._max_queue_size: int = 0
+        self._total_latency: float = 0
+        self._max_latency: float = 0
+
+    def _run(self) -> None:
+        """
+        Drain events from deque in batches and then process them.
+        """
+        while self._active:
+            if not self._deque:
+                self._wait()
+                continue
+
+            batch = []
+            for _ in range(self._batch_size):
+                try:
+                    batch.append(self._deque.popleft())
+                except IndexError:
+                    break
+
+            self._update_stats(batch)
+
+            for put_time, event in batch:
+                self._process(event)
+
+    def _wait(self) -> None:
+        """
+        Block worker thread until new event is put.
+        """
+        with self._condition:
+            self._waiting = True
+
+            # Check again after flag set to avoid missing notification
+            if not self._deque and self._active:
+                self._condition.wait(timeout=1)
+
+            self._waiting = False
+
+    def _update_stats(self, batch: list) -> None:
+        """
+        Update dispatch counters with a new batch.
+        """
+        queue_size = len(batch) + len(self._deque)
+        self._max_queue_size = max(self._max_queue_size, queue_size)
+
+        now = perf_counter()
+        for put_time, event in batch:
+            latency = now - put_time
+            self._total_latency += latency
+            self._max_latency = max(self._max_latency, latency)
+
+        self._process_count += len(batch)
+        self._batch_count += 1
+
+    def stop(self) -> None:
+        """
+        Stop event engine.
+        """
+        self._active = False
+
+        with self._condition:
+            self._condition.notify()
+
+        self._timer.join()
+        self._thread.join()
+
+    def put(self, event: Event) -> None:
+        """
+        Put an event object into event deque.
+        """
+        self._deque.append((perf_counter(), event))
+        self._put_count += 1
+
+        if self._waiting:
+            with self._condition:
+                self._condition.notify()
+
+    def get_queue_size(self) -> int:
+        """
+        Get number of events waiting to be processed.
+        """
+        return len(self._deque)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get queue depth and dispatch latency counters.
+
+        Latency is measured in seconds from event put into engine
+        to the batch containing it is taken by worker thread.
+        """
+        if self._process_count:
+            average_latency = self._total_latency / self._process_count
+            average_batch_size = self._process_count / self._batch_count
+        else:
+            average_latency = 0
+            average_batch_size = 0
+
+        return {
+            "queue_size": len(self._deque),
+            "max_queue_size": self._max_queue_size,
+            "put_count": self._put_count,
+            "process_count": self._process_count,
+            "batch_count": self._batch_count,
+            "average_batch_size": average_batch_size,
+            "average_latency": average_latency,
+            "max_latency": self._max_latency,
+        }
+
+    def reset_stats(self) -> None:
+        """
+        Clear peak and accumulated counters.
+        """
+        self._put_count = len(self._deque)
+        self._process_count = 0
+        self._batch_count = 0
+        self._max_queue_size = 0
+        self._total_latency = 0
+        self._max_latency = 0
+
+
+class ShardedEventEngine(EventEngine):
+    """
+    Event engine which distributes events to multiple worker threads.
+
+    Handlers registered as shard safe are called by worker threads,
+    with each event routed by hash of its vt_symbol, so that events
+    of the same vt_symbol are always processed in order by the same
+    worker.
+
+    Other handlers, general handlers and events without vt_symbol
+    (timer, log, account...) are processed by the main thread the
+    same way as EventEngine.
+    """
+
+    def __init__(self, interval: int = 1, shard_count: int = 4):
+        """
+        Create shard_count worker threads besides the main thread.
+        """
+        super().__init__(interval)
+
+        self._shard_count: int = shard_count
+        self._shard_handlers: defaultdict = defaultdict(list)
+        self._shard_queues: List[Queue] = []
+        self._shard_threads: List[Thread] = []
+
+        for i in range(shard_count):
+            queue = Queue()
+            self._shard_queues.append(queue)
+
+            thread = Thread(target=self._run_shard, args=(queue,))
+            self._shard_threads.append(thread)
+
+    def _get_shard_key(self, event: Event) -> str:
+        """
+        Get key used for routing event to worker thread.
+        """
+        return getattr(event.data, "vt_symbol", None)
+
+    def _run_shard(self, queue: Queue) -> None:
+        """
+        Get event from shard queue and then process it.
+        """
+        while self._active:
+            try:
+                event = queue.get(block=True, timeout=1)
+                self._process_shard(event)
+            except Empty:
+                pass
+
+    def _process_shard(self, event: Event) -> None:
+        """
+        Distribute event to shard safe handlers.
+        """
+        if event.type in self._shard_handlers:
+            [handler(event) for handler in self._shard_handlers[event.type]]
+
+    def _process(self, event: Event) -> None:
+        """
+        Distribute event to handlers running in main thread, including
+        shard safe handlers if the event cannot be routed to worker.
+        """
+        super()._process(event)
+
+        if (
+            event.type in self._shard_handlers
+            and self._get_shard_key(event) is None
+        ):
+            self._process_shard(event)
+
+    def start(self) -> None:
+        """
+        Start event engine with worker threads.
+        """
+        super().start()
+
+        for thread in self._shard_threads:
+            thread.start()
+
+    def stop(self) -> None:
+        """
+        Stop event engine with worker threads.
+        """
+        super().stop()
+
+        for thread in self._shard_threads:
+            thread.join()
+
+    def put(self, event: Event) -> None:
+        """
+        Put an event object into main queue and/or shard queue.
+        """
+        if event.type not in self._shard_handlers:
+            self._queue.put(event)
+            return
+
+        key = self._get_shard_key(event)
+        if key is None:
+            self._queue.put(event)
+            return
+
+        ix = hash(key) % self._shard_count
+        self._shard_queues[ix].put(event)
+
+        if event.type in self._handlers or self._general_handlers:
+            self._queue.put(event)
+
+    def register(
+        self,
+        type: str,
+        handler: HandlerType,
+        shard_safe: bool = False
+    ) -> None:
+        """
+        Register a new handler function for a specific event type.
+
+        Shard safe handler may be called by different worker threads
+        concurrently for different vt_symbols.
+        """
+        if not shard_safe:
+            super().register(type, handler)
+            return
+
+        handler_list = self._shard_handlers[type]
+        if handler not in handler_list:
+            handler_list.append(handler)
+
+    def unregister(self, type: str, handler: HandlerType) -> None:
+        """
+        Unregister an existing handler function from event engine.
+        """
+        if type in self._handlers:
+            super().unregister(type, handler)
+
+        if type in self._shard_handlers:
+            handler_list = self._shard_handlers[type]
+
+            if handler in handler_list:
+                handler_list.remove(handler)
+
+            if not handler_list:
+                self._shard_handlers.pop(type)
+
+    def has_handler(self, type: str) -> bool:
+        """
+        Check if any handler function will receive event of the type.
+        """
+        return type in self._shard_handlers or super().has_handler(type)
+
+    def get_queue_size(self) -> List[int]:
+        """
+        Get number of events waiting in main queue and each shard queue.
+        """
+        return [self._queue.qsize()] + [q.qsize() for q in self._shard_queues]
@@ -6,7 +6,6 @@ import urllib
 import hashlib
 import hmac
 import time
-from copy import copy
 from datetime import datetime, timedelta
 from enum import Enum
 from threading import Lock
@@ -36,6 +35,7 @@ from vnpy.trader.object import (
     HistoryRequest
 )
 from vnpy.trader.event import EVENT_TIMER
+from vnpy.trader.orderbook import OrderBook
 from vnpy.event import Event
 
 
@@ -312,6 +312,28 @@ class BinanceRestApi(RestClient):
             data=data
         )
 
+    def query_depth(self, symbol: str, book: OrderBook):
+        """"""
+        data = {
+            "security": Security.NONE
+        }
+
+        params = {
+            "symbol": symbol.upper(),
+            "limit": 1000
+        }
+
+        self.add_request(
+            method="GET",
+            path="/api/v3/depth",
+            callback=self.on_query_depth,
+            params=params,
+            data=data,
+            extra=book,
+            on_failed=self.on_query_depth_failed,
+            on_error=self.on_query_depth_error
+        )
+
     def _new_order_id(self):
         """"""
         with self.order_count_lock:
@@ -452,6 +474,28 @@ class BinanceRestApi(RestClient):
 
         self.gateway.write_log("委托信息查询成功")
 
+    def on_query_depth(self, data, request):
+        """"""
+        book: OrderBook = request.extra
+        book.update_snapshot(data["bids"], data["asks"], data["lastUpdateId"])
+
+    def on_query_depth_failed(self, status_code: int, request: Request):
+        """"""
+        book: OrderBook = request.extra
+        book.reset()
+
+        msg = f"深度快照查询失败，状态码：{status_code}，信息：{request.response.text}"
+        self.gateway.write_log(msg)
+
+    def on_query_depth_error(
+        self, exception_type: type, exception_value: Exception, tb, request: Request
+    ):
+        """"""
+        book: OrderBook = request.extra
+        book.reset()
+
+        self.on_error(exception_type, exception_value, tb, request)
+
     def on_query_contract(self, data, request):
         """"""
         for d in data["symbols"]:
@@ -697,6 +741,7 @@ class BinanceDataWebsocketApi(WebsocketClient):
         self.gateway_name = gateway.gateway_name
 
         self.ticks = {}
+        self.books = {}
 
     def connect(self, proxy_host: str, proxy_port: int):
         """"""
@@ -707,6 +752,10 @@ class BinanceDataWebsocketApi(WebsocketClient):
         """"""
         self.gateway.write_log("行情Websocket API连接刷新")
 
+        # Diffs may be lost during reconnection
+        for book in self.books.values():
+            book.reset()
+
     def subscribe(self, req: SubscribeRequest):
         """"""
         if req.symbol not in symbol_name_map:
@@ -723,6 +772,17 @@ class BinanceDataWebsocketApi(WebsocketClient):
         )
         self.ticks[req.symbol] = tick
 
+        # Order book is maintained with depth diffs, and resynced from
+        # snapshot queried by rest api
+        symbol = req.symbol
+        rest_api = self.gateway.rest_api
+        book = OrderBook(
+            tick,
+            self.on_book_tick,
+            lambda: rest_api.query_depth(symbol, book)
+        )
+        self.books[req.symbol] = book
+
         # Close previous connection
         if self._active:
             self.stop()
@@ -732,7 +792,7 @@ class BinanceDataWebsocketApi(WebsocketClient):
         channels = []
         for ws_symbol in self.ticks.keys():
             channels.append(ws_symbol + "@ticker")
-            channels.append(ws_symbol + "@depth5")
+            channels.append(ws_symbol + "@depth@100ms")
 
         url = WEBSOCKET_DATA_HOST + "/".join(channels)
         self.init(url, self.proxy_host, self.proxy_port)
@@ -743,31 +803,36 @@ class BinanceDataWebsocketApi(WebsocketClient):
         stream = packet["stream"]
         data = packet["data"]
 
-        symbol, channel = stream.split("@")
-        tick = self.ticks[symbol]
+        symbol, channel = stream.split("@", 1)
+        book = self.books[symbol]
 
         if channel == "ticker":
-            tick.volume = float(data['v'])
-            tick.open_price = float(data['o'])
-            tick.high_price = float(data['h'])
-            tick.low_price = float(data['l'])
-            tick.last_price = float(data['c'])
-            tick.datetime = generate_datetime(float(data['E']))
+            # Tick is shared with order book updated in rest thread
+            tick = book.update_tick(
+                volume=float(data['v']),
+                open_price=float(data['o']),
+                high_price=float(data['h']),
+                low_price=float(data['l']),
+                last_price=float(data['c']),
+                datetime=generate_datetime(float(data['E']))
+            )
+
+            if tick.last_price:
+                self.gateway.on_tick(tick)
         else:
-            bids = data["bids"]
-            for n in range(5):
-                price, volume = bids[n]
-                tick.__setattr__("bid_price_" + str(n + 1), float(price))
-                tick.__setattr__("bid_volume_" + str(n + 1), float(volume))
-
-            asks = data["asks"]
-            for n in range(5):
-                price, volume = asks[n]
-                tick.__setattr__("ask_price_" + str(n + 1), float(price))
-                tick.__setattr__("ask_volume_" + str(n + 1), float(volume))
+            # Tick is pushed by order book only when top levels changed
+            book.update_diff(
+                data["b"],
+                data["a"],
+                data["u"],
+                data["U"] - 1,
+                generate_datetime(float(data["E"]))
+            )
 
+    def on_book_tick(self, tick: TickData):
+        """"""
         if tick.last_price:
-            self.gateway.on_tick(copy(tick))
+            self.gateway.on_tick(tick)
 
 
 def generate_datetime(timestamp: float) -> datetime:
@@ -10,7 +10,7 @@ from copy import copy
 from datetime import datetime, timedelta
 from enum import Enum
 from threading import Lock
-from typing import Dict, List, Tuple
+from typing import Any, Callable, Dict, List, Tuple
 import pytz
 
 from vnpy.api.rest import RestClient, Request
@@ -173,6 +173,14 @@ class BinancesGateway(BaseGateway):
         """"""
         return self.rest_api.query_history(req)
 
+    def download_history(
+        self,
+        req: HistoryRequest,
+        callback: Callable[[List[BarData]], Any]
+    ) -> int:
+        """"""
+        return self.rest_api.download_history(req, callback)
+
     def close(self) -> None:
         """"""
         self.rest_api.stop()
@@ -664,81 +672,90 @@ class BinancesRestApi(RestClient):
     def query_history(self, req: HistoryRequest) -> List[BarData]:
         """"""
         history = []
+        self.download_history(req, history.extend)
+        return history
+
+    def download_history(
+        self,
+        req: HistoryRequest,
+        callback: Callable[[List[BarData]], Any]
+    ) -> int:
+        """
+        Query history pages concurrently and pass bars to callback page by page.
+        """
         limit = 1000
+
         start_time = int(datetime.timestamp(req.start))
+        if req.end:
+            end_time = int(datetime.timestamp(req.end))
+        else:
+            end_time = int(time.time())
+
+        # Split time range into pages of limit bars
+        step = int(TIMEDELTA_MAP[req.interval].total_seconds()) * limit
+        params_list = []
 
-        while True:
-            # Create query params
-            params = {
+        for page_start in range(start_time, end_time + 1, step):
+            page_end = min(page_start + step - 1, end_time)
+
+            params_list.append({
                 "symbol": req.symbol,
                 "interval": INTERVAL_VT2BINANCES[req.interval],
                 "limit": limit,
-                "startTime": start_time * 1000,         # convert to millisecond
-            }
-
-            # Add end time if specified
-            if req.end:
-                end_time = int(datetime.timestamp(req.end))
-                params["endTime"] = end_time * 1000     # convert to millisecond
-
-            # Get response from server
-            if self.usdt_base:
-                path = "/fapi/v1/klines"
-            else:
-                path = "/dapi/v1/klines"
-
-            resp = self.request(
-                "GET",
-                path=path,
-                data={"security": Security.NONE},
-                params=params
-            )
-
-            # Break if request failed with other status code
-            if resp.status_code // 100 != 2:
-                msg = f"获取历史数据失败，状态码：{resp.status_code}，信息：{resp.text}"
-                self.gateway.write_log(msg)
-                break
-            else:
-                data = resp.json()
-                if not data:
-                    msg = f"获取历史数据为空，开始时间：{start_time}"
-                    self.gateway.write_log(msg)
-                    break
-
-                buf = []
-
-                for l in data:
-                    bar = BarData(
-                        symbol=req.symbol,
-                        exchange=req.exchange,
-                        datetime=generate_datetime(l[0]),
-                        interval=req.interval,
-                        volume=float(l[5]),
-                        open_price=float(l[1]),
-                        high_price=float(l[2]),
-                        low_price=float(l[3]),
-                        close_price=float(l[4]),
-                        gateway_name=self.gateway_name
-                    )
-                    buf.append(bar)
-
-                history.extend(buf)
+                "startTime": page_start * 1000,     # convert to millisecond
+                "endTime": page_end * 1000          # convert to millisecond
+            })
 
+        if self.usdt_base:
+            path = "/fapi/v1/klines"
+        else:
+            path = "/dapi/v1/klines"
+
+        def parse(data: list, params: dict) -> List[BarData]:
+            """"""
+            buf = []
+
+            for l in data:
+                bar = BarData(
+                    symbol=req.symbol,
+                    exchange=req.exchange,
+                    datetime=generate_datetime(l[0]),
+                    interval=req.interval,
+                    volume=float(l[5]),
+                    open_price=float(l[1]),
+                    high_price=float(l[2]),
+                    low_price=float(l[3]),
+                    close_price=float(l[4]),
+                    gateway_name=self.gateway_name
+                )
+                buf.append(bar)
+
+            if buf:
                 begin = buf[0].datetime
                 end = buf[-1].datetime
                 msg = f"获取历史数据成功，{req.symbol} - {req.interval.value}，{begin} - {end}"
                 self.gateway.write_log(msg)
 
-                # Break if total data count less than limit (latest date collected)
-                if len(data) < limit:
-                    break
+            return buf
 
-                # Update start time
-                start_dt = bar.datetime + TIMEDELTA_MAP[req.interval]
-                start_time = int(datetime.timestamp(start_dt))
+        def on_failed(params: dict, msg: str) -> None:
+            """"""
+            msg = f"获取历史数据失败，开始时间：{params['startTime']}，信息：{msg}"
+            self.gateway.write_log(msg)
 
-        return history
+        # Weight of each query with limit 1000 is 5, and weight limit is 2400 per minute
+        return self.query_pages(
+            "GET",
+            path,
+            params_list,
+            parse,
+            callback,
+            on_failed,
+            key=lambda bar: bar.datetime,
+            data={"security": Security.NONE},
+            n=5,
+            rate=5
+        )
 
 
 class BinancesTradeWebsocketApi(WebsocketClient):
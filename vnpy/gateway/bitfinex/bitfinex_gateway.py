@@ -178,6 +178,9 @@ class BitfinexRestApi(RestClient):
         """"""
         super(BitfinexRestApi, self).__init__()
 
+        # Nonce in signature should be increasing across all requests
+        self.separate_lanes = False
+
         self.gateway = gateway
         self.gateway_name = gateway.gateway_name
 
@@ -166,6 +166,14 @@ class BybitGateway(BaseGateway):
         """"""
         return self.rest_api.query_history(req)
 
+    def download_history(
+        self,
+        req: HistoryRequest,
+        callback: Callable[[List[BarData]], Any]
+    ) -> int:
+        """"""
+        return self.rest_api.download_history(req, callback)
+
     def close(self) -> None:
         """"""
         self.rest_api.stop()
@@ -608,84 +616,92 @@ class BybitRestApi(RestClient):
     def query_history(self, req: HistoryRequest) -> List[BarData]:
         """"""
         history = []
+        self.download_history(req, history.extend)
+        return history
+
+    def download_history(
+        self,
+        req: HistoryRequest,
+        callback: Callable[[List[BarData]], Any]
+    ) -> int:
+        """
+        Query history pages concurrently and pass bars to callback page by page.
+        """
         count = 200
-        start_time = int(req.start.timestamp())
 
-        if self.usdt_base:
-            path = "/public/linear/kline"
+        start_time = int(req.start.timestamp())
+        if req.end:
+            end_time = int(req.end.timestamp())
         else:
-            path = "/v2/public/kline/list"
+            end_time = int(time.time())
 
-        while True:
-            # Create query params
-            params = {
+        # Split time range into pages of count bars
+        step = int(TIMEDELTA_MAP[req.interval].total_seconds()) * count
+        params_list = []
+
+        for page_start in range(start_time, end_time + 1, step):
+            params_list.append({
                 "symbol": req.symbol,
                 "interval": INTERVAL_VT2BYBIT[req.interval],
-                "from": start_time,
+                "from": page_start,
                 "limit": count
-            }
+            })
 
-            # Get response from server
-            resp = self.request(
-                "GET",
-                path,
-                params=params
-            )
+        if self.usdt_base:
+            path = "/public/linear/kline"
+        else:
+            path = "/v2/public/kline/list"
 
-            # Break if request failed with other status code
-            if resp.status_code // 100 != 2:
-                msg = f"获取历史数据失败，状态码：{resp.status_code}，信息：{resp.text}"
-                self.gateway.write_log(msg)
-                break
-            else:
-                data = resp.json()
-
-                ret_code = data["ret_code"]
-                if ret_code:
-                    ret_msg = data["ret_msg"]
-                    msg = f"获取历史数据出错，错误信息：{ret_msg}"
-                    self.gateway.write_log(msg)
-                    break
-
-                if not data["result"]:
-                    msg = f"获取历史数据为空，开始时间：{start_time}，数量：{count}"
-                    self.gateway.write_log(msg)
-                    break
-
-                buf = []
-                for d in data["result"]:
-                    dt = datetime.fromtimestamp(d["open_time"])
-                    dt = CHINA_TZ.localize(dt)
-
-                    bar = BarData(
-                        symbol=req.symbol,
-                        exchange=req.exchange,
-                        datetime=dt,
-                        interval=req.interval,
-                        volume=float(d["volume"]),
-                        open_price=float(d["open"]),
-                        high_price=float(d["high"]),
-                        low_price=float(d["low"]),
-                        close_price=float(d["close"]),
-                        gateway_name=self.gateway_name
-                    )
-                    buf.append(bar)
-
-                history.extend(buf)
+        def parse(data: dict, params: dict) -> List[BarData]:
+            """"""
+            # Raise error so that the page is queried again
+            ret_code = data["ret_code"]
+            if ret_code:
+                raise ValueError(data["ret_msg"])
+
+            buf = []
+            for d in data["result"] or []:
+                dt = datetime.fromtimestamp(d["open_time"])
+                dt = CHINA_TZ.localize(dt)
+
+                bar = BarData(
+                    symbol=req.symbol,
+                    exchange=req.exchange,
+                    datetime=dt,
+                    interval=req.interval,
+                    volume=float(d["volume"]),
+                    open_price=float(d["open"]),
+                    high_price=float(d["high"]),
+                    low_price=float(d["low"]),
+                    close_price=float(d["close"]),
+                    gateway_name=self.gateway_name
+                )
+                buf.append(bar)
 
+            if buf:
                 begin = buf[0].datetime
                 end = buf[-1].datetime
                 msg = f"获取历史数据成功，{req.symbol} - {req.interval.value}，{begin} - {end}"
                 self.gateway.write_log(msg)
 
-                # Break if last data collected
-                if len(buf) < count:
-                    break
+            return buf
 
-                # Update start time
-                start_time = int((bar.datetime + TIMEDELTA_MAP[req.interval]).timestamp())
+        def on_failed(params: dict, msg: str) -> None:
+            """"""
+            msg = f"获取历史数据失败，开始时间：{params['from']}，信息：{msg}"
+            self.gateway.write_log(msg)
 
-        return history
+        return self.query_pages(
+            "GET",
+            path,
+            params_list,
+            parse,
+            callback,
+            on_failed,
+            key=lambda bar: bar.datetime,
+            n=5,
+            rate=10
+        )
 
 
 class BybitPublicWebsocketApi(WebsocketClient):
@@ -62,7 +62,7 @@ from vnpy.trader.object import (
     CancelRequest,
     SubscribeRequest,
 )
-from vnpy.trader.utility import get_folder_path
+from vnpy.trader.utility import get_folder_path, TimestampConverter
 from vnpy.trader.event import EVENT_TIMER
 
 
@@ -245,6 +245,7 @@ class CtpMdApi(MdApi):
 
         self.gateway = gateway
         self.gateway_name = gateway.gateway_name
+        self.timestamp_converter = TimestampConverter(CHINA_TZ)
 
         self.reqid = 0
 
@@ -311,9 +312,9 @@ class CtpMdApi(MdApi):
         if not exchange:
             return
 
-        timestamp = f"{self.current_date} {data['UpdateTime']}.{int(data['UpdateMillisec']/100)}"
-        dt = datetime.strptime(timestamp, "%Y%m%d %H:%M:%S.%f")
-        dt = CHINA_TZ.localize(dt)
+        dt = self.timestamp_converter.convert(
+            self.current_date, data["UpdateTime"], data["UpdateMillisec"]
+        )
 
         tick = TickData(
             symbol=symbol,
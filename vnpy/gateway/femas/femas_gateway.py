@@ -54,7 +54,7 @@ from vnpy.trader.object import (
     TickData,
     TradeData,
 )
-from vnpy.trader.utility import get_folder_path
+from vnpy.trader.utility import get_folder_path, TimestampConverter
 
 
 STATUS_FEMAS2VT = {
@@ -213,6 +213,7 @@ class FemasMdApi(MdApi):
 
         self.gateway = gateway
         self.gateway_name = gateway.gateway_name
+        self.timestamp_converter = TimestampConverter(CHINA_TZ)
 
         self.reqid = 0
 
@@ -276,9 +277,9 @@ class FemasMdApi(MdApi):
         if not exchange:
             return
 
-        timestamp = f"{data['TradingDay']} {data['UpdateTime']}.{int(data['UpdateMillisec'] / 100)}"
-        dt = datetime.strptime(timestamp, "%Y%m%d %H:%M:%S.%f")
-        dt = CHINA_TZ.localize(dt)
+        dt = self.timestamp_converter.convert(
+            data["TradingDay"], data["UpdateTime"], data["UpdateMillisec"]
+        )
 
         tick = TickData(
             symbol=symbol,
@@ -13,7 +13,7 @@ import sys
 from copy import copy
 from datetime import datetime
 import pytz
-from typing import Dict, List, Any
+from typing import Any, Callable, Dict, List
 
 from vnpy.api.rest import RestClient, Request
 from vnpy.api.websocket import WebsocketClient
@@ -150,6 +150,14 @@ class HuobiGateway(BaseGateway):
         """"""
         return self.rest_api.query_history(req)
 
+    def download_history(
+        self,
+        req: HistoryRequest,
+        callback: Callable[[List[BarData]], Any]
+    ) -> int:
+        """"""
+        return self.rest_api.download_history(req, callback)
+
     def close(self) -> None:
         """"""
         self.rest_api.stop()
@@ -262,56 +270,75 @@ class HuobiRestApi(RestClient):
 
     def query_history(self, req: HistoryRequest) -> List[BarData]:
         """"""
-        # Create query params
+        history = []
+        self.download_history(req, history.extend)
+        return history
+
+    def download_history(
+        self,
+        req: HistoryRequest,
+        callback: Callable[[List[BarData]], Any]
+    ) -> int:
+        """
+        Query history and pass bars to callback.
+        """
+        # Only the latest 2000 bars can be queried without time range,
+        # so there is only one page
         params = {
             "symbol": req.symbol,
             "period": INTERVAL_VT2HUOBI[req.interval],
             "size": 2000
         }
 
-        # Get response from server
-        resp = self.request(
-            "GET",
-            "/market/history/kline",
-            params=params
-        )
+        def parse(data: dict, params: dict) -> List[BarData]:
+            """"""
+            history = []
 
-        # Break if request failed with other status code
-        history = []
-
-        if resp.status_code // 100 != 2:
-            msg = f"获取历史数据失败，状态码：{resp.status_code}，信息：{resp.text}"
-            self.gateway.write_log(msg)
-        else:
-            data = resp.json()
             if not data:
                 msg = f"获取历史数据为空"
                 self.gateway.write_log(msg)
-            else:
-                for d in data["data"]:
-                    dt = generate_datetime(d["id"])
-
-                    bar = BarData(
-                        symbol=req.symbol,
-                        exchange=req.exchange,
-                        datetime=dt,
-                        interval=req.interval,
-                        volume=d["vol"],
-                        open_price=d["open"],
-                        high_price=d["high"],
-                        low_price=d["low"],
-                        close_price=d["close"],
-                        gateway_name=self.gateway_name
-                    )
-                    history.append(bar)
-
+                return history
+
+            for d in data["data"]:
+                dt = generate_datetime(d["id"])
+
+                bar = BarData(
+                    symbol=req.symbol,
+                    exchange=req.exchange,
+                    datetime=dt,
+                    interval=req.interval,
+                    volume=d["vol"],
+                    open_price=d["open"],
+                    high_price=d["high"],
+                    low_price=d["low"],
+                    close_price=d["close"],
+                    gateway_name=self.gateway_name
+                )
+                history.append(bar)
+
+            if history:
                 history.reverse()
                 begin = history[0].datetime
                 end = history[-1].datetime
                 msg = f"获取历史数据成功，{req.symbol} - {req.interval.value}，{begin} - {end}"
                 self.gateway.write_log(msg)
 
-        return history
+            return history
+
+        def on_failed(params: dict, msg: str) -> None:
+            """"""
+            msg = f"获取历史数据失败，信息：{msg}"
+            self.gateway.write_log(msg)
+
+        return self.query_pages(
+            "GET",
+            "/market/history/kline",
+            [params],
+            parse,
+            callback,
+            on_failed,
+            n=1
+        )
 
     def send_order(self, req: OrderRequest) -> str:
         """"""
@@ -58,7 +58,7 @@ from vnpy.trader.object import (
     CancelRequest,
     SubscribeRequest,
 )
-from vnpy.trader.utility import get_folder_path
+from vnpy.trader.utility import get_folder_path, TimestampConverter
 from vnpy.trader.event import EVENT_TIMER
 
 
@@ -225,6 +225,7 @@ class MiniMdApi(MdApi):
 
         self.gateway = gateway
         self.gateway_name = gateway.gateway_name
+        self.timestamp_converter = TimestampConverter(CHINA_TZ)
 
         self.reqid = 0
 
@@ -285,9 +286,9 @@ class MiniMdApi(MdApi):
         if not exchange:
             return
 
-        timestamp = f"{data['ActionDay']} {data['UpdateTime']}.{int(data['UpdateMillisec']/100)}"
-        dt = datetime.strptime(timestamp, "%Y%m%d %H:%M:%S.%f")
-        dt = CHINA_TZ.localize(dt)
+        dt = self.timestamp_converter.convert(
+            data["ActionDay"], data["UpdateTime"], data["UpdateMillisec"]
+        )
 
         tick = TickData(
             symbol=symbol,
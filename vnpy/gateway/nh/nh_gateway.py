@@ -28,7 +28,7 @@ from vnpy.trader.object import (
     CancelRequest,
     SubscribeRequest,
 )
-from vnpy.trader.utility import get_folder_path
+from vnpy.trader.utility import get_folder_path, TimestampConverter
 from vnpy.trader.event import EVENT_TIMER
 from vnpy.event import Event
 
@@ -337,6 +337,7 @@ class NhMdApi(MdApi):
 
         self.gateway = gateway
         self.gateway_name = gateway.gateway_name
+        self.timestamp_converter = TimestampConverter(CHINA_TZ)
 
         self.reqid = 0
 
@@ -442,9 +443,9 @@ class NhMdApi(MdApi):
             return
         exchange = symbol_exchange_map.get(symbol)
 
-        timestamp = f"{self.current_date} {data['update_time']}.{int(data['update_millisec']/100)}"
-        dt = datetime.strptime(timestamp, "%Y%m%d %H:%M:%S.%f")
-        dt = CHINA_TZ.localize(dt)
+        dt = self.timestamp_converter.convert(
+            self.current_date, data["update_time"], data["update_millisec"]
+        )
 
         tick = TickData(
             symbol=symbol,
@@ -12,7 +12,7 @@ from copy import copy
 from datetime import datetime, timedelta
 from threading import Lock
 from urllib.parse import urlencode
-from typing import Dict
+from typing import Any, Callable, Dict, List
 
 from requests import ConnectionError
 from pytz import utc as UTC_TZ
@@ -147,6 +147,14 @@ class OkexGateway(BaseGateway):
         """"""
         return self.rest_api.query_history(req)
 
+    def download_history(
+        self,
+        req: HistoryRequest,
+        callback: Callable[[List[BarData]], Any]
+    ) -> int:
+        """"""
+        return self.rest_api.download_history(req, callback)
+
     def close(self):
         """"""
         self.rest_api.stop()
@@ -472,74 +480,90 @@ class OkexRestApi(RestClient):
             self.exception_detail(exception_type, exception_value, tb, request)
         )
 
-    def query_history(self, req: HistoryRequest):
+    def query_history(self, req: HistoryRequest) -> List[BarData]:
         """"""
-        buf = {}
-        end_time = None
-
-        for i in range(10):
-            path = f"/api/spot/v3/instruments/{req.symbol}/candles"
-
-            # Create query params
-            params = {
-                "granularity": INTERVAL_VT2OKEX[req.interval]
-            }
-
-            if end_time:
-                end = datetime.strptime(end_time, "%Y-%m-%dT%H:%M:%S.%fZ")
-                start = end - TIMEDELTA_MAP[req.interval] * 200
-
-                params["start"] = start.strftime("%Y-%m-%dT%H:%M:%S.%fZ")
-                params["end"] = end.strftime("%Y-%m-%dT%H:%M:%S.%fZ")
-
-            # Get response from server
-            resp = self.request(
-                "GET",
-                path,
-                params=params
-            )
+        history = []
+        self.download_history(req, history.extend)
+        return history
 
-            # Break if request failed with other status code
-            if resp.status_code // 100 != 2:
-                msg = f"获取历史数据失败，状态码：{resp.status_code}，信息：{resp.text}"
-                self.gateway.write_log(msg)
-                break
-            else:
-                data = resp.json()
-                if not data:
-                    msg = f"获取历史数据为空"
-                    break
-
-                for l in data:
-                    ts, o, h, l, c, v = l
-                    dt = generate_datetime(ts)
-                    bar = BarData(
-                        symbol=req.symbol,
-                        exchange=req.exchange,
-                        datetime=dt,
-                        interval=req.interval,
-                        volume=float(v),
-                        open_price=float(o),
-                        high_price=float(h),
-                        low_price=float(l),
-                        close_price=float(c),
-                        gateway_name=self.gateway_name
-                    )
-                    buf[bar.datetime] = bar
+    def download_history(
+        self,
+        req: HistoryRequest,
+        callback: Callable[[List[BarData]], Any]
+    ) -> int:
+        """
+        Query history pages concurrently and pass bars to callback page by page.
+        """
+        limit = 200
+        delta = TIMEDELTA_MAP[req.interval]
 
+        if req.end:
+            end_time = int(req.end.timestamp())
+        else:
+            end_time = int(time.time())
+
+        # Only the latest 2000 bars are provided by server
+        step = int(delta.total_seconds()) * limit
+        start_time = max(int(req.start.timestamp()), end_time - step * 10)
+
+        path = f"/api/spot/v3/instruments/{req.symbol}/candles"
+        params_list = []
+
+        for page_start in range(start_time, end_time + 1, step):
+            page_end = min(page_start + step, end_time)
+
+            params_list.append({
+                "granularity": INTERVAL_VT2OKEX[req.interval],
+                "start": generate_timestamp(page_start),
+                "end": generate_timestamp(page_end)
+            })
+
+        def parse(data: list, params: dict) -> List[BarData]:
+            """"""
+            buf = []
+
+            for l in data:
+                ts, o, h, l, c, v = l
+                dt = generate_datetime(ts)
+                bar = BarData(
+                    symbol=req.symbol,
+                    exchange=req.exchange,
+                    datetime=dt,
+                    interval=req.interval,
+                    volume=float(v),
+                    open_price=float(o),
+                    high_price=float(h),
+                    low_price=float(l),
+                    close_price=float(c),
+                    gateway_name=self.gateway_name
+                )
+                buf.append(bar)
+
+            if data:
                 begin = data[-1][0]
                 end = data[0][0]
                 msg = f"获取历史数据成功，{req.symbol} - {req.interval.value}，{begin} - {end}"
                 self.gateway.write_log(msg)
 
-                # Update start time
-                end_time = begin
+            return buf
 
-        index = list(buf.keys())
-        index.sort()
+        def on_failed(params: dict, msg: str) -> None:
+            """"""
+            msg = f"获取历史数据失败，开始时间：{params['start']}，信息：{msg}"
+            self.gateway.write_log(msg)
 
-        history = [buf[i] for i in index]
-        return history
+        # Rate limit of candles is 20 requests per 2 seconds
+        return self.query_pages(
+            "GET",
+            path,
+            params_list,
+            parse,
+            callback,
+            on_failed,
+            key=lambda bar: bar.datetime,
+            n=5,
+            rate=10
+        )
 
 
 class OkexWebsocketApi(WebsocketClient):
@@ -827,3 +851,9 @@ def generate_datetime(timestamp: str) -> datetime:
     dt = datetime.strptime(timestamp, "%Y-%m-%dT%H:%M:%S.%fZ")
     dt = UTC_TZ.localize(dt)
     return dt
+
+
+def generate_timestamp(timestamp: int) -> str:
+    """convert unix timestamp into ISO format used by server."""
+    dt = datetime.fromtimestamp(timestamp, UTC_TZ)
+    return dt.strftime("%Y-%m-%dT%H:%M:%S.%fZ")
@@ -176,6 +176,9 @@ class OnetokenRestApi(RestClient):
         """"""
         super(OnetokenRestApi, self).__init__()
 
+        # Nonce in signature should be increasing across all requests
+        self.separate_lanes = False
+
         self.gateway = gateway
         self.gateway_name = gateway.gateway_name
 
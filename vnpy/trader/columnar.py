@@ -0,0 +1,400 @@
+"""
+Columnar containers of market data backed by NumPy structured arrays.
+"""
+
+from abc import ABC, abstractmethod
+from datetime import datetime, tzinfo
+from typing import Iterator, List, Sequence, Union
+
+import numpy as np
+from pandas import DataFrame, DatetimeIndex
+from pytz import timezone
+
+from .constant import Exchange, Interval
+from .object import BarData, TickData, SlotBarData, SlotTickData, get_vt_symbol
+
+
+BAR_FIELDS: List[str] = [
+    "volume", "open_interest",
+    "open_price", "high_price", "low_price", "close_price",
+]
+
+TICK_FIELDS: List[str] = [
+    "volume", "open_interest", "last_price", "last_volume",
+    "limit_up", "limit_down",
+    "open_price", "high_price", "low_price", "pre_close",
+    "bid_price_1", "bid_price_2", "bid_price_3", "bid_price_4", "bid_price_5",
+    "ask_price_1", "ask_price_2", "ask_price_3", "ask_price_4", "ask_price_5",
+    "bid_volume_1", "bid_volume_2", "bid_volume_3", "bid_volume_4", "bid_volume_5",
+    "ask_volume_1", "ask_volume_2", "ask_volume_3", "ask_volume_4", "ask_volume_5",
+]
+
+# Datetime is stored as wall clock time in timezone of the container
+BAR_DTYPE: np.dtype = np.dtype(
+    [("datetime", "datetime64[us]")] + [(name, "f8") for name in BAR_FIELDS]
+)
+TICK_DTYPE: np.dtype = np.dtype(
+    [("datetime", "datetime64[us]")] + [(name, "f8") for name in TICK_FIELDS]
+)
+
+
+def get_timezone(dt: datetime) -> tzinfo:
+    """
+    Get timezone used for localizing datetime of the same zone.
+    """
+    if not dt.tzinfo:
+        return None
+
+    zone = getattr(dt.tzinfo, "zone", None)
+    if zone:
+        return timezone(zone)
+    return dt.tzinfo
+
+
+def to_datetime64(datetimes: Sequence[datetime]) -> np.ndarray:
+    """
+    Convert datetimes into wall clock datetime64 array.
+    """
+    return np.array(
+        [dt.replace(tzinfo=None) for dt in datetimes],
+        dtype="datetime64[us]"
+    )
+
+
+class BaseArray(ABC):
+    """
+    Columnar container of market data with the same symbol/exchange.
+
+    Each column can be accessed as attribute with the same name as
+    field of data object, which returns NumPy array view without copy.
+    """
+
+    dtype: np.dtype = None
+    fields: List[str] = []
+
+    def __init__(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        data: np.ndarray = None,
+        tz: tzinfo = None,
+        gateway_name: str = "DB"
+    ):
+        """"""
+        self.symbol: str = symbol
+        self.exchange: Exchange = exchange
+        self.vt_symbol: str = get_vt_symbol(symbol, exchange)
+        self.tz: tzinfo = tz
+        self.gateway_name: str = gateway_name
+
+        if data is None:
+            data = np.empty(0, dtype=self.dtype)
+        self.data: np.ndarray = data
+
+    def __len__(self) -> int:
+        """"""
+        return len(self.data)
+
+    def __getattr__(self, name: str) -> np.ndarray:
+        """
+        Get column by field name.
+        """
+        if name != "data" and name in self.dtype.names:
+            return self.data[name]
+        raise AttributeError(name)
+
+    def __getitem__(self, index: Union[int, slice]):
+        """
+        Get data object by integer index, or sub-array by slice.
+        """
+        if isinstance(index, slice):
+            return self.new_array(self.data[index])
+
+        return self.create_object(self.data[index])
+
+    def __iter__(self) -> Iterator:
+        """
+        Iterate data objects, which are created lazily.
+        """
+        for row in self.data:
+            yield self.create_object(row)
+
+    @abstractmethod
+    def new_array(self, data: np.ndarray) -> "BaseArray":
+        """
+        Create a new array of the same contract with data.
+        """
+        pass
+
+    @abstractmethod
+    def create_object(self, row: np.void):
+        """
+        Create data object from a row of structured array.
+        """
+        pass
+
+    def get_datetimes(self) -> List[datetime]:
+        """
+        Get datetime column as list of datetime objects.
+        """
+        values = self.data["datetime"]
+        datetimes = values.astype(datetime).tolist()
+
+        if not self.tz:
+            return datetimes
+
+        localize = getattr(self.tz, "localize", None)
+        if not localize:
+            return [dt.replace(tzinfo=self.tz) for dt in datetimes]
+
+        # Localizing is slow, so only the first and last datetime of each
+        # hour are localized, and the rest of the hour share the same tzinfo
+        # unless there is an utc offset transition within the hour.
+        hours = values.astype("datetime64[h]")
+        starts = np.flatnonzero(np.append(True, hours[1:] != hours[:-1]))
+        ends = np.append(starts[1:], len(values)).tolist()
+
+        for start, end in zip(starts.tolist(), ends):
+            first = localize(datetimes[start])
+            last = localize(datetimes[end - 1])
+
+            if first.tzinfo is last.tzinfo:
+                tzinfo = first.tzinfo
+                for ix in range(start, end):
+                    datetimes[ix] = datetimes[ix].replace(tzinfo=tzinfo)
+            else:
+                for ix in range(start, end):
+                    datetimes[ix] = localize(datetimes[ix])
+
+        return datetimes
+
+    def to_dataframe(self) -> DataFrame:
+        """
+        Convert into DataFrame with datetime index.
+        """
+        index = DatetimeIndex(self.data["datetime"], name="datetime")
+
+        # Same as localize of pytz, which uses standard time if ambiguous
+        if self.tz:
+            index = index.tz_localize(
+                self.tz,
+                ambiguous=np.zeros(len(index), dtype=bool),
+                nonexistent="shift_forward"
+            )
+
+        return DataFrame(
+            {name: self.data[name] for name in self.fields},
+            index=index
+        )
+
+    def convert_datetime(self, value: np.datetime64) -> datetime:
+        """"""
+        dt = value.astype(datetime)
+
+        if not self.tz:
+            return dt
+
+        localize = getattr(self.tz, "localize", None)
+        if localize:
+            return localize(dt)
+        return dt.replace(tzinfo=self.tz)
+
+
+class BarArray(BaseArray):
+    """
+    Columnar container of bar data with the same symbol/exchange/interval.
+    """
+
+    dtype: np.dtype = BAR_DTYPE
+    fields: List[str] = BAR_FIELDS
+
+    def __init__(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        data: np.ndarray = None,
+        tz: tzinfo = None,
+        gateway_name: str = "DB"
+    ):
+        """"""
+        super().__init__(symbol, exchange, data, tz, gateway_name)
+
+        self.interval: Interval = interval
+
+    @classmethod
+    def from_bars(
+        cls,
+        bars: Sequence[BarData],
+        symbol: str = "",
+        exchange: Exchange = None,
+        interval: Interval = None
+    ) -> "BarArray":
+        """
+        Create bar array from list of bar data of the same contract.
+
+        Symbol, exchange and interval can be omitted if bars is not empty.
+        """
+        if not bars:
+            return cls(symbol, exchange, interval)
+
+        first = bars[0]
+        data = np.empty(len(bars), dtype=BAR_DTYPE)
+
+        data["datetime"] = to_datetime64([bar.datetime for bar in bars])
+        for name in BAR_FIELDS:
+            data[name] = [getattr(bar, name) for bar in bars]
+
+        return cls(
+            first.symbol,
+            first.exchange,
+            first.interval,
+            data,
+            get_timezone(first.datetime),
+            first.gateway_name
+        )
+
+    def new_array(self, data: np.ndarray) -> "BarArray":
+        """"""
+        return BarArray(
+            self.symbol,
+            self.exchange,
+            self.interval,
+            data,
+            self.tz,
+            self.gateway_name
+        )
+
+    def create_object(self, row: np.void) -> BarData:
+        """"""
+        return SlotBarData(
+            symbol=self.symbol,
+            exchange=self.exchange,
+            datetime=self.convert_datetime(row["datetime"]),
+            interval=self.interval,
+            volume=float(row["volume"]),
+            open_interest=float(row["open_interest"]),
+            open_price=float(row["open_price"]),
+            high_price=float(row["high_price"]),
+            low_price=float(row["low_price"]),
+            close_price=float(row["close_price"]),
+            gateway_name=self.gateway_name
+        )
+
+    def to_bars(self) -> List[BarData]:
+        """
+        Convert into list of bar data, which are slotted to save memory.
+        """
+        datetimes = self.get_datetimes()
+        columns = [self.data[name].tolist() for name in BAR_FIELDS]
+
+        return [
+            SlotBarData(
+                self.gateway_name,
+                self.symbol,
+                self.exchange,
+                dt,
+                self.interval,
+                *values
+            )
+            for dt, *values in zip(datetimes, *columns)
+        ]
+
+
+class TickArray(BaseArray):
+    """
+    Columnar container of tick data with the same symbol/exchange.
+    """
+
+    dtype: np.dtype = TICK_DTYPE
+    fields: List[str] = TICK_FIELDS
+
+    def __init__(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        data: np.ndarray = None,
+        tz: tzinfo = None,
+        gateway_name: str = "DB",
+        name: str = ""
+    ):
+        """"""
+        super().__init__(symbol, exchange, data, tz, gateway_name)
+
+        self.name: str = name
+
+    @classmethod
+    def from_ticks(
+        cls,
+        ticks: Sequence[TickData],
+        symbol: str = "",
+        exchange: Exchange = None
+    ) -> "TickArray":
+        """
+        Create tick array from list of tick data of the same contract.
+
+        Symbol and exchange can be omitted if ticks is not empty.
+        """
+        if not ticks:
+            return cls(symbol, exchange)
+
+        first = ticks[0]
+        data = np.empty(len(ticks), dtype=TICK_DTYPE)
+
+        data["datetime"] = to_datetime64([tick.datetime for tick in ticks])
+        for name in TICK_FIELDS:
+            data[name] = [getattr(tick, name) for tick in ticks]
+
+        return cls(
+            first.symbol,
+            first.exchange,
+            data,
+            get_timezone(first.datetime),
+            first.gateway_name,
+            first.name
+        )
+
+    def new_array(self, data: np.ndarray) -> "TickArray":
+        """"""
+        return TickArray(
+            self.symbol,
+            self.exchange,
+            data,
+            self.tz,
+            self.gateway_name,
+            self.name
+        )
+
+    def create_object(self, row: np.void) -> TickData:
+        """"""
+        tick = SlotTickData(
+            symbol=self.symbol,
+            exchange=self.exchange,
+            datetime=self.convert_datetime(row["datetime"]),
+            name=self.name,
+            gateway_name=self.gateway_name
+        )
+
+        for name in TICK_FIELDS:
+            setattr(tick, name, float(row[name]))
+
+        return tick
+
+    def to_ticks(self) -> List[TickData]:
+        """
+        Convert into list of tick data, which are slotted to save memory.
+        """
+        datetimes = self.get_datetimes()
+        columns = [self.data[name].tolist() for name in TICK_FIELDS]
+
+        return [
+            SlotTickData(
+                self.gateway_name,
+                self.symbol,
+                self.exchange,
+                dt,
+                self.name,
+                *values
+            )
+            for dt, *values in zip(datetimes, *columns)
+        ]
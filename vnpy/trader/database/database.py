@@ -1,7 +1,7 @@
 from abc import ABC, abstractmethod
 from datetime import datetime
 from enum import Enum
-from typing import Optional, Sequence, List, Dict, TYPE_CHECKING
+from typing import Optional, Sequence, List, Dict, Iterator, TYPE_CHECKING
 from pytz import timezone
 
 from vnpy.trader.setting import SETTINGS
@@ -9,6 +9,8 @@ from vnpy.trader.setting import SETTINGS
 if TYPE_CHECKING:
     from vnpy.trader.constant import Interval, Exchange  # noqa
     from vnpy.trader.object import BarData, TickData  # noqa
+    from vnpy.trader.columnar import BarArray, TickArray  # noqa
+    from pandas import DataFrame  # noqa
 
 
 DB_TZ = timezone(SETTINGS["database.timezone"])
@@ -20,6 +22,7 @@ class Driver(Enum):
     POSTGRESQL = "postgresql"
     MONGODB = "mongodb"
     INFLUX = "influxdb"
+    FILE = "file"
 
 
 class BaseDatabaseManager(ABC):
@@ -45,6 +48,97 @@ class BaseDatabaseManager(ABC):
     ) -> Sequence["TickData"]:
         pass
 
+    def iter_bar_data(
+        self,
+        symbol: str,
+        exchange: "Exchange",
+        interval: "Interval",
+        start: datetime,
+        end: datetime,
+        chunk_size: int = 100000
+    ) -> Iterator[List["BarData"]]:
+        """
+        Load bar data in chunks, each chunk has at most chunk_size bars.
+        """
+        bars = self.load_bar_data(symbol, exchange, interval, start, end)
+
+        for i in range(0, len(bars), chunk_size):
+            yield list(bars[i: i + chunk_size])
+
+    def iter_tick_data(
+        self,
+        symbol: str,
+        exchange: "Exchange",
+        start: datetime,
+        end: datetime,
+        chunk_size: int = 100000
+    ) -> Iterator[List["TickData"]]:
+        """
+        Load tick data in chunks, each chunk has at most chunk_size ticks.
+        """
+        ticks = self.load_tick_data(symbol, exchange, start, end)
+
+        for i in range(0, len(ticks), chunk_size):
+            yield list(ticks[i: i + chunk_size])
+
+    def load_bar_array(
+        self,
+        symbol: str,
+        exchange: "Exchange",
+        interval: "Interval",
+        start: datetime,
+        end: datetime
+    ) -> "BarArray":
+        """
+        Load bar data as columnar BarArray.
+        """
+        from vnpy.trader.columnar import BarArray
+
+        bars = self.load_bar_data(symbol, exchange, interval, start, end)
+        return BarArray.from_bars(bars, symbol, exchange, interval)
+
+    def load_tick_array(
+        self,
+        symbol: str,
+        exchange: "Exchange",
+        start: datetime,
+        end: datetime
+    ) -> "TickArray":
+        """
+        Load tick data as columnar TickArray.
+        """
+        from vnpy.trader.columnar import TickArray
+
+        ticks = self.load_tick_data(symbol, exchange, start, end)
+        return TickArray.from_ticks(ticks, symbol, exchange)
+
+    def load_bar_dataframe(
+        self,
+        symbol: str,
+        exchange: "Exchange",
+        interval: "Interval",
+        start: datetime,
+        end: datetime
+    ) -> "DataFrame":
+        """
+        Load bar data as DataFrame indexed by datetime.
+        """
+        array = self.load_bar_array(symbol, exchange, interval, start, end)
+        return array.to_dataframe()
+
+    def load_tick_dataframe(
+        self,
+        symbol: str,
+        exchange: "Exchange",
+        start: datetime,
+        end: datetime
+    ) -> "DataFrame":
+        """
+        Load tick data as DataFrame indexed by datetime.
+        """
+        array = self.load_tick_array(symbol, exchange, start, end)
+        return array.to_dataframe()
+
     @abstractmethod
     def save_bar_data(
         self,
@@ -104,7 +198,8 @@ class BaseDatabaseManager(ABC):
         exchange: "Exchange",
     ) -> List[Dict]:
         """
-        Return data avaible in database with a list of symbol/exchange/interval/count.
+        Return data avaible in database with a list of symbol/exchange/interval/count,
+        start/end datetime can also be included if available.
         """
         pass
 
@@ -120,6 +215,13 @@ class BaseDatabaseManager(ABC):
         """
         pass
 
+    def rebuild_bar_overview(self) -> None:
+        """
+        Rebuild overview of bar data, for backends which maintain
+        statistics of bar data when saving.
+        """
+        pass
+
     @abstractmethod
     def clean(self, symbol: str):
         """
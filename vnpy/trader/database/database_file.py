@@ -0,0 +1,397 @@
+"""
+Local file database storing data in daily partitions of fixed-width
+binary records, which are memory-mapped when loading.
+
+Folder layout:
+    bar/<exchange>/<symbol>/<interval>/<YYYYMMDD>.bin
+    tick/<exchange>/<symbol>/<YYYYMMDD>.bin
+
+Records in each partition file are sorted by datetime, stored as wall
+clock time of database timezone.
+"""
+
+import json
+import os
+import shutil
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+from urllib.parse import quote, unquote
+
+import numpy as np
+
+from vnpy.trader.constant import Exchange, Interval
+from vnpy.trader.object import BarData, TickData
+from vnpy.trader.utility import get_folder_path
+from vnpy.trader.columnar import (
+    BarArray,
+    TickArray,
+    BAR_DTYPE,
+    BAR_FIELDS,
+    TICK_DTYPE,
+    TICK_FIELDS,
+    to_datetime64
+)
+
+from .database import BaseDatabaseManager, Driver, DB_TZ
+
+
+FILE_SUFFIX = ".bin"
+META_FILENAME = "meta.json"
+
+
+def init(_: Driver, settings: dict):
+    database = settings["database"]
+    path = get_folder_path(database)
+    return FileManager(path)
+
+
+def convert_datetime(dt: datetime) -> np.datetime64:
+    """
+    Convert datetime into wall clock time of database timezone.
+    """
+    if dt.tzinfo:
+        dt = dt.astimezone(DB_TZ).replace(tzinfo=None)
+    return np.datetime64(dt, "us")
+
+
+def get_partition_keys(data: np.ndarray) -> Tuple[List[str], List[int]]:
+    """
+    Get partition keys of sorted data, and start index of each partition.
+    """
+    days = data["datetime"].astype("datetime64[D]")
+    starts = np.flatnonzero(np.append(True, days[1:] != days[:-1]))
+    keys = [str(day).replace("-", "") for day in days[starts]]
+    return keys, starts.tolist()
+
+
+def sort_unique(data: np.ndarray) -> np.ndarray:
+    """
+    Sort data by datetime, and keep the last one of duplicated datetime.
+    """
+    ix = np.argsort(data["datetime"], kind="stable")
+    data = data[ix]
+
+    dts = data["datetime"]
+    mask = np.append(dts[1:] != dts[:-1], True)
+    return data[mask]
+
+
+def read_last(file_path: Path, dtype: np.dtype) -> np.ndarray:
+    """
+    Read only the last record of partition file.
+    """
+    size = file_path.stat().st_size
+    if size < dtype.itemsize:
+        return np.empty(0, dtype=dtype)
+
+    with open(file_path, "rb") as f:
+        f.seek(size - dtype.itemsize)
+        return np.fromfile(f, dtype=dtype, count=1)
+
+
+class FileManager(BaseDatabaseManager):
+    """"""
+
+    def __init__(self, path: Path):
+        """"""
+        self.path: Path = Path(path)
+
+        # Folder mtime and sorted partition keys of each data folder
+        self.partitions: Dict[Path, Tuple[int, List[str]]] = {}
+
+    def get_bar_folder(
+        self, symbol: str, exchange: Exchange, interval: Interval
+    ) -> Path:
+        """"""
+        return self.path.joinpath(
+            "bar", exchange.value, quote(symbol, safe=""), interval.value
+        )
+
+    def get_tick_folder(self, symbol: str, exchange: Exchange) -> Path:
+        """"""
+        return self.path.joinpath("tick", exchange.value, quote(symbol, safe=""))
+
+    def get_partitions(self, folder: Path) -> List[str]:
+        """
+        Get sorted partition keys of folder, which are cached and listed
+        again only when folder mtime changed, so that partitions created
+        by other processes can also be found.
+        """
+        try:
+            mtime = folder.stat().st_mtime_ns
+        except FileNotFoundError:
+            self.partitions.pop(folder, None)
+            return []
+
+        cached = self.partitions.get(folder, None)
+        if cached and cached[0] == mtime:
+            return cached[1]
+
+        keys = sorted(f.stem for f in folder.glob("*" + FILE_SUFFIX))
+        self.partitions[folder] = (mtime, keys)
+        return keys
+
+    def read_partition(self, folder: Path, key: str, dtype: np.dtype) -> np.ndarray:
+        """
+        Memory-map partition file as read only array.
+        """
+        file_path = folder.joinpath(key + FILE_SUFFIX)
+
+        if not file_path.stat().st_size:
+            return np.empty(0, dtype=dtype)
+
+        return np.memmap(file_path, dtype=dtype, mode="r")
+
+    def read_range(
+        self,
+        folder: Path,
+        dtype: np.dtype,
+        start: datetime,
+        end: datetime
+    ) -> np.ndarray:
+        """
+        Read data between start and end from partitions of folder.
+        """
+        keys = self.get_partitions(folder)
+
+        start_dt = convert_datetime(start)
+        end_dt = convert_datetime(end)
+
+        lo = bisect_left(keys, start_dt.astype(datetime).strftime("%Y%m%d"))
+        hi = bisect_right(keys, end_dt.astype(datetime).strftime("%Y%m%d"))
+
+        arrays = [self.read_partition(folder, key, dtype) for key in keys[lo:hi]]
+        if not arrays:
+            return np.empty(0, dtype=dtype)
+
+        # Only the first and last partition need to be filtered
+        first = arrays[0]
+        arrays[0] = first[first["datetime"].searchsorted(start_dt):]
+
+        last = arrays[-1]
+        arrays[-1] = last[:last["datetime"].searchsorted(end_dt, side="right")]
+
+        return np.concatenate(arrays)
+
+    def write_data(self, folder: Path, data: np.ndarray) -> None:
+        """
+        Write data into partitions of folder, update if exists.
+        """
+        folder.mkdir(parents=True, exist_ok=True)
+        keys = self.get_partitions(folder)
+
+        data = sort_unique(data)
+        partition_keys, starts = get_partition_keys(data)
+        ends = starts[1:] + [len(data)]
+
+        for key, start, end in zip(partition_keys, starts, ends):
+            part = data[start:end]
+            file_path = folder.joinpath(key + FILE_SUFFIX)
+
+            ix = bisect_left(keys, key)
+            if ix == len(keys) or keys[ix] != key:
+                part.tofile(file_path)
+                insort(keys, key)
+                continue
+
+            last = read_last(file_path, data.dtype)
+
+            # Append directly if data is newer than all existing
+            if not len(last) or part["datetime"][0] > last["datetime"][-1]:
+                with open(file_path, "ab") as f:
+                    part.tofile(f)
+            # Otherwise merge with existing data and rewrite the partition
+            else:
+                existing = np.fromfile(file_path, dtype=data.dtype)
+                merged = sort_unique(np.concatenate([existing, part]))
+
+                temp_path = file_path.with_suffix(".tmp")
+                merged.tofile(temp_path)
+                os.replace(temp_path, file_path)
+
+    def remove_folder(self, folder: Path) -> None:
+        """"""
+        if folder.exists():
+            shutil.rmtree(folder)
+
+        for key in list(self.partitions.keys()):
+            if key == folder or folder in key.parents:
+                self.partitions.pop(key)
+
+    def load_bar_data(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        start: datetime,
+        end: datetime,
+    ) -> Sequence[BarData]:
+        array = self.load_bar_array(symbol, exchange, interval, start, end)
+        return array.to_bars()
+
+    def load_tick_data(
+        self, symbol: str, exchange: Exchange, start: datetime, end: datetime
+    ) -> Sequence[TickData]:
+        array = self.load_tick_array(symbol, exchange, start, end)
+        return array.to_ticks()
+
+    def load_bar_array(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        start: datetime,
+        end: datetime,
+    ) -> BarArray:
+        """"""
+        folder = self.get_bar_folder(symbol, exchange, interval)
+        data = self.read_range(folder, BAR_DTYPE, start, end)
+        return BarArray(symbol, exchange, interval, data, DB_TZ)
+
+    def load_tick_array(
+        self, symbol: str, exchange: Exchange, start: datetime, end: datetime
+    ) -> TickArray:
+        """"""
+        folder = self.get_tick_folder(symbol, exchange)
+        data = self.read_range(folder, TICK_DTYPE, start, end)
+        name = self.load_tick_name(folder)
+        return TickArray(symbol, exchange, data, DB_TZ, name=name)
+
+    def load_tick_name(self, folder: Path) -> str:
+        """"""
+        file_path = folder.joinpath(META_FILENAME)
+        if not file_path.exists():
+            return ""
+
+        with open(file_path, encoding="UTF-8") as f:
+            return json.load(f).get("name", "")
+
+    def save_bar_data(self, datas: Sequence[BarData]):
+        groups: Dict[Tuple[str, Exchange, Interval], List[BarData]] = {}
+        for bar in datas:
+            key = (bar.symbol, bar.exchange, bar.interval)
+            groups.setdefault(key, []).append(bar)
+
+        for (symbol, exchange, interval), bars in groups.items():
+            data = np.empty(len(bars), dtype=BAR_DTYPE)
+
+            data["datetime"] = to_datetime64(
+                [bar.datetime.astimezone(DB_TZ) for bar in bars]
+            )
+            for name in BAR_FIELDS:
+                data[name] = [getattr(bar, name) for bar in bars]
+
+            folder = self.get_bar_folder(symbol, exchange, interval)
+            self.write_data(folder, data)
+
+    def save_tick_data(self, datas: Sequence[TickData]):
+        groups: Dict[Tuple[str, Exchange], List[TickData]] = {}
+        for tick in datas:
+            key = (tick.symbol, tick.exchange)
+            groups.setdefault(key, []).append(tick)
+
+        for (symbol, exchange), ticks in groups.items():
+            data = np.empty(len(ticks), dtype=TICK_DTYPE)
+
+            data["datetime"] = to_datetime64(
+                [tick.datetime.astimezone(DB_TZ) for tick in ticks]
+            )
+            for name in TICK_FIELDS:
+                data[name] = [getattr(tick, name) or 0 for tick in ticks]
+
+            folder = self.get_tick_folder(symbol, exchange)
+            self.write_data(folder, data)
+
+            # Contract name is saved once in meta file
+            name = ticks[-1].name
+            if name != self.load_tick_name(folder):
+                with open(folder.joinpath(META_FILENAME), "w", encoding="UTF-8") as f:
+                    json.dump({"name": name}, f, ensure_ascii=False)
+
+    def get_newest_bar_data(
+        self, symbol: str, exchange: "Exchange", interval: "Interval"
+    ) -> Optional["BarData"]:
+        folder = self.get_bar_folder(symbol, exchange, interval)
+        keys = self.get_partitions(folder)
+        if not keys:
+            return None
+
+        data = self.read_partition(folder, keys[-1], BAR_DTYPE)
+        array = BarArray(symbol, exchange, interval, data[-1:].copy(), DB_TZ)
+        return array[0]
+
+    def get_oldest_bar_data(
+        self, symbol: str, exchange: "Exchange", interval: "Interval"
+    ) -> Optional["BarData"]:
+        folder = self.get_bar_folder(symbol, exchange, interval)
+        keys = self.get_partitions(folder)
+        if not keys:
+            return None
+
+        data = self.read_partition(folder, keys[0], BAR_DTYPE)
+        array = BarArray(symbol, exchange, interval, data[:1].copy(), DB_TZ)
+        return array[0]
+
+    def get_newest_tick_data(
+        self, symbol: str, exchange: "Exchange"
+    ) -> Optional["TickData"]:
+        folder = self.get_tick_folder(symbol, exchange)
+        keys = self.get_partitions(folder)
+        if not keys:
+            return None
+
+        data = self.read_partition(folder, keys[-1], TICK_DTYPE)
+        name = self.load_tick_name(folder)
+        array = TickArray(symbol, exchange, data[-1:].copy(), DB_TZ, name=name)
+        return array[0]
+
+    def get_bar_data_statistics(self) -> List[Dict]:
+        """"""
+        result = []
+
+        for folder in sorted(self.path.glob("bar/*/*/*")):
+            count = sum(
+                f.stat().st_size // BAR_DTYPE.itemsize
+                for f in folder.glob("*" + FILE_SUFFIX)
+            )
+            if not count:
+                continue
+
+            result.append({
+                "symbol": unquote(folder.parent.name),
+                "exchange": folder.parent.parent.name,
+                "interval": folder.name,
+                "count": count
+            })
+
+        return result
+
+    def delete_bar_data(
+        self,
+        symbol: str,
+        exchange: "Exchange",
+        interval: "Interval"
+    ) -> int:
+        """
+        Delete all bar data with given symbol + exchange + interval.
+        """
+        folder = self.get_bar_folder(symbol, exchange, interval)
+
+        count = sum(
+            f.stat().st_size // BAR_DTYPE.itemsize
+            for f in folder.glob("*" + FILE_SUFFIX)
+        )
+        self.remove_folder(folder)
+
+        return count
+
+    def clean(self, symbol: str):
+        name = quote(symbol, safe="")
+
+        for folder in self.path.glob(f"bar/*/{name}"):
+            self.remove_folder(folder)
+
+        for folder in self.path.glob(f"tick/*/{name}"):
+            self.remove_folder(folder)
@@ -1,15 +1,38 @@
+"""
+Data is saved with time as wall clock of database timezone, which is
+stored as UTC time in InfluxDB.
+"""
+
+import re
 from datetime import datetime
-from typing import Optional, Sequence, List
+from typing import Iterator, List, Optional, Sequence
 
+import numpy as np
 from influxdb import InfluxDBClient
+from influxdb.resultset import ResultSet
 
 from vnpy.trader.constant import Exchange, Interval
 from vnpy.trader.object import BarData, TickData
 from vnpy.trader.utility import generate_vt_symbol
+from vnpy.trader.columnar import (
+    BarArray,
+    TickArray,
+    BAR_DTYPE,
+    BAR_FIELDS,
+    TICK_DTYPE,
+    TICK_FIELDS,
+    to_datetime64
+)
 
 from .database import BaseDatabaseManager, Driver, DB_TZ
 
 
+# Number of points sent in each write request
+BATCH_SIZE = 10000
+
+# Number of points returned in each chunk of query response
+CHUNK_SIZE = 10000
+
 influx_database = ""
 influx_client = None
 
@@ -35,6 +58,106 @@ def init(_: Driver, settings: dict):
     return InfluxManager()
 
 
+def convert_timestamp(dt: datetime) -> int:
+    """
+    Convert datetime into epoch nanoseconds of database wall clock time.
+    """
+    if dt.tzinfo:
+        dt = dt.astimezone(DB_TZ).replace(tzinfo=None)
+    return int(np.datetime64(dt, "ns").astype(np.int64))
+
+
+def escape_tag(value: str) -> str:
+    """"""
+    return (
+        value.replace("\\", "\\\\")
+        .replace(",", "\\,")
+        .replace("=", "\\=")
+        .replace(" ", "\\ ")
+    )
+
+
+def escape_string(value: str) -> str:
+    """"""
+    return '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def get_timestamps(datetimes: Sequence[datetime]) -> List[int]:
+    """
+    Convert datetimes into epoch microseconds of database wall clock time.
+    """
+    values = to_datetime64([dt.astimezone(DB_TZ) for dt in datetimes])
+    return values.astype(np.int64).tolist()
+
+
+def bar_to_line(bar: BarData, timestamp: int) -> str:
+    """"""
+    tags = (
+        f"bar_data,interval={escape_tag(bar.interval.value)}"
+        f",vt_symbol={escape_tag(bar.vt_symbol)}"
+    )
+    fields = ",".join(
+        f"{name}={float(getattr(bar, name))!r}" for name in BAR_FIELDS
+    )
+    return f"{tags} {fields} {timestamp}"
+
+
+def tick_to_line(tick: TickData, timestamp: int) -> str:
+    """"""
+    tags = f"tick_data,vt_symbol={escape_tag(tick.vt_symbol)}"
+    fields = ",".join(
+        f"{name}={float(getattr(tick, name) or 0)!r}" for name in TICK_FIELDS
+    )
+    name = escape_string(tick.name or "")
+    return f"{tags} {fields},name={name} {timestamp}"
+
+
+def parse_result(result: ResultSet, dtype: np.dtype) -> np.ndarray:
+    """
+    Parse raw query result with epoch time into structured array.
+
+    Missing field values are filled with 0.
+    """
+    data = np.empty(0, dtype=dtype)
+
+    for series in result.raw.get("series", []):
+        columns = series["columns"]
+        values = list(zip(*series["values"]))
+
+        part = np.zeros(len(series["values"]), dtype=dtype)
+        part["datetime"] = np.array(
+            values[columns.index("time")], dtype=np.int64
+        ).astype(dtype["datetime"])
+
+        for name in dtype.names[1:]:
+            if name in columns:
+                part[name] = np.array(values[columns.index(name)], dtype="f8")
+
+        data = np.concatenate([data, part])
+
+    # None values are converted into nan
+    for name in dtype.names[1:]:
+        column = data[name]
+        column[np.isnan(column)] = 0
+
+    return data
+
+
+def parse_name(result: ResultSet) -> str:
+    """
+    Get contract name from raw query result of tick data.
+    """
+    for series in result.raw.get("series", []):
+        if "name" not in series["columns"]:
+            continue
+
+        ix = series["columns"].index("name")
+        for values in series["values"]:
+            if values[ix]:
+                return values[ix]
+    return ""
+
+
 class InfluxManager(BaseDatabaseManager):
 
     def load_bar_data(
@@ -45,18 +168,100 @@ class InfluxManager(BaseDatabaseManager):
         start: datetime,
         end: datetime,
     ) -> Sequence[BarData]:
-        if isinstance(start, datetime):
-            start = start.date()
+        data = []
+        for bars in self.iter_bar_data(symbol, exchange, interval, start, end):
+            data.extend(bars)
+        return data
 
-        if isinstance(end, datetime):
-            end = end.date()
+    def load_tick_data(
+        self, symbol: str, exchange: Exchange, start: datetime, end: datetime
+    ) -> Sequence[TickData]:
+        data = []
+        for ticks in self.iter_tick_data(symbol, exchange, start, end):
+            data.extend(ticks)
+        return data
 
+    def iter_bar_data(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        start: datetime,
+        end: datetime,
+        chunk_size: int = CHUNK_SIZE
+    ) -> Iterator[List[BarData]]:
+        """
+        Stream bar data in chunks of query response.
+        """
+        for array in self.iter_bar_array(
+            symbol, exchange, interval, start, end, chunk_size
+        ):
+            yield array.to_bars()
+
+    def iter_tick_data(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        start: datetime,
+        end: datetime,
+        chunk_size: int = CHUNK_SIZE
+    ) -> Iterator[List[TickData]]:
+        """
+        Stream tick data in chunks of query response.
+        """
+        for array in self.iter_tick_array(
+            symbol, exchange, start, end, chunk_size
+        ):
+            yield array.to_ticks()
+
+    def load_bar_array(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        start: datetime,
+        end: datetime,
+    ) -> BarArray:
+        """
+        Load bar data into BarArray from raw query result.
+        """
+        arrays = self.iter_bar_array(symbol, exchange, interval, start, end)
+        data = np.concatenate(
+            [np.empty(0, dtype=BAR_DTYPE)] + [array.data for array in arrays]
+        )
+        return BarArray(symbol, exchange, interval, data, DB_TZ)
+
+    def load_tick_array(
+        self, symbol: str, exchange: Exchange, start: datetime, end: datetime
+    ) -> TickArray:
+        """
+        Load tick data into TickArray from raw query result.
+        """
+        arrays = list(self.iter_tick_array(symbol, exchange, start, end))
+        data = np.concatenate(
+            [np.empty(0, dtype=TICK_DTYPE)] + [array.data for array in arrays]
+        )
+        name = arrays[0].name if arrays else ""
+        return TickArray(symbol, exchange, data, DB_TZ, name=name)
+
+    def iter_bar_array(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        start: datetime,
+        end: datetime,
+        chunk_size: int = CHUNK_SIZE
+    ) -> Iterator[BarArray]:
+        """
+        Stream bar data in chunks of BarArray from chunked query response.
+        """
         query = (
             "select * from bar_data"
             " where vt_symbol=$vt_symbol"
             " and interval=$interval"
-            f" and time >= '{start.isoformat()}'"
-            f" and time <= '{end.isoformat()}';"
+            f" and time >= {convert_timestamp(start)}"
+            f" and time <= {convert_timestamp(end)};"
         )
 
         bind_params = {
@@ -64,68 +269,87 @@ class InfluxManager(BaseDatabaseManager):
             "interval": interval.value
         }
 
-        result = influx_client.query(query, bind_params=bind_params)
-        points = result.get_points()
+        results = influx_client.query(
+            query,
+            bind_params=bind_params,
+            epoch="u",
+            chunked=True,
+            chunk_size=chunk_size
+        )
 
-        data = []
-        for d in points:
-            dt = datetime.strptime(d["time"], "%Y-%m-%dT%H:%M:%SZ")
-
-            bar = BarData(
-                symbol=symbol,
-                exchange=exchange,
-                interval=interval,
-                datetime=DB_TZ.localize(dt),
-                open_price=d["open_price"],
-                high_price=d["high_price"],
-                low_price=d["low_price"],
-                close_price=d["close_price"],
-                volume=d["volume"],
-                open_interest=d["open_interest"],
-                gateway_name="DB"
-            )
-            data.append(bar)
+        for result in results:
+            data = parse_result(result, BAR_DTYPE)
+            if len(data):
+                yield BarArray(symbol, exchange, interval, data, DB_TZ)
 
-        return data
+    def iter_tick_array(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        start: datetime,
+        end: datetime,
+        chunk_size: int = CHUNK_SIZE
+    ) -> Iterator[TickArray]:
+        """
+        Stream tick data in chunks of TickArray from chunked query response.
+        """
+        query = (
+            "select * from tick_data"
+            " where vt_symbol=$vt_symbol"
+            f" and time >= {convert_timestamp(start)}"
+            f" and time <= {convert_timestamp(end)};"
+        )
 
-    def load_tick_data(
-        self, symbol: str, exchange: Exchange, start: datetime, end: datetime
-    ) -> Sequence[TickData]:
-        pass
+        bind_params = {
+            "vt_symbol": generate_vt_symbol(symbol, exchange)
+        }
+
+        results = influx_client.query(
+            query,
+            bind_params=bind_params,
+            epoch="u",
+            chunked=True,
+            chunk_size=chunk_size
+        )
+
+        # Contract name is the same for all ticks
+        name = ""
+        for result in results:
+            data = parse_result(result, TICK_DTYPE)
+            if not len(data):
+                continue
+
+            if not name:
+                name = parse_name(result)
+            yield TickArray(symbol, exchange, data, DB_TZ, name=name)
 
     def save_bar_data(self, data: Sequence[BarData]):
-        json_body = []
-
-        bar = data[0]
-        vt_symbol = bar.vt_symbol
-        interval = bar.interval.value
-
-        for bar in data:
-            dt = bar.datetime.astimezone(DB_TZ)
-            dt = dt.replace(tzinfo=None)
-
-            d = {
-                "measurement": "bar_data",
-                "tags": {
-                    "vt_symbol": vt_symbol,
-                    "interval": interval
-                },
-                "time": dt.isoformat(),
-                "fields": {
-                    "open_price": bar.open_price,
-                    "high_price": bar.high_price,
-                    "low_price": bar.low_price,
-                    "close_price": bar.close_price,
-                    "volume": bar.volume,
-                    "open_interest": bar.open_interest,
-                }
-            }
-            json_body.append(d)
-
-        influx_client.write_points(json_body)
+        timestamps = get_timestamps([bar.datetime for bar in data])
+        lines = [
+            bar_to_line(bar, timestamp)
+            for bar, timestamp in zip(data, timestamps)
+        ]
+
+        influx_client.write_points(
+            lines,
+            time_precision="u",
+            batch_size=BATCH_SIZE,
+            protocol="line"
+        )
 
     def save_tick_data(self, data: Sequence[TickData]):
-        pass
+        timestamps = get_timestamps([tick.datetime for tick in data])
+        lines = [
+            tick_to_line(tick, timestamp)
+            for tick, timestamp in zip(data, timestamps)
+        ]
+
+        influx_client.write_points(
+            lines,
+            time_precision="u",
+            batch_size=BATCH_SIZE,
+            protocol="line"
+        )
 
     def get_newest_bar_data(
         self, symbol: str, exchange: "Exchange", interval: "Interval"
@@ -135,34 +359,7 @@ class InfluxManager(BaseDatabaseManager):
             " where vt_symbol=$vt_symbol"
             " and interval=$interval"
         )
-
-        bind_params = {
-            "vt_symbol": generate_vt_symbol(symbol, exchange),
-            "interval": interval.value
-        }
-
-        result = influx_client.query(query, bind_params=bind_params)
-        points = result.get_points()
-
-        bar = None
-        for d in points:
-            dt = datetime.strptime(d["time"], "%Y-%m-%dT%H:%M:%SZ")
-
-            bar = BarData(
-                symbol=symbol,
-                exchange=exchange,
-                interval=interval,
-                datetime=DB_TZ.localize(dt),
-                open_price=d["open_price"],
-                high_price=d["high_price"],
-                low_price=d["low_price"],
-                close_price=d["close_price"],
-                volume=d["volume"],
-                open_interest=d["open_interest"],
-                gateway_name="DB"
-            )
-
-        return bar
+        return self.query_bar(query, symbol, exchange, interval)
 
     def get_oldest_bar_data(
         self, symbol: str, exchange: "Exchange", interval: "Interval"
@@ -172,39 +369,51 @@ class InfluxManager(BaseDatabaseManager):
             " where vt_symbol=$vt_symbol"
             " and interval=$interval"
         )
+        return self.query_bar(query, symbol, exchange, interval)
 
+    def query_bar(
+        self,
+        query: str,
+        symbol: str,
+        exchange: "Exchange",
+        interval: "Interval"
+    ) -> Optional["BarData"]:
+        """
+        Query single bar data with selector function.
+        """
         bind_params = {
             "vt_symbol": generate_vt_symbol(symbol, exchange),
             "interval": interval.value
         }
 
-        result = influx_client.query(query, bind_params=bind_params)
-        points = result.get_points()
-
-        bar = None
-        for d in points:
-            dt = datetime.strptime(d["time"], "%Y-%m-%dT%H:%M:%SZ")
-
-            bar = BarData(
-                symbol=symbol,
-                exchange=exchange,
-                interval=interval,
-                datetime=DB_TZ.localize(dt),
-                open_price=d["open_price"],
-                high_price=d["high_price"],
-                low_price=d["low_price"],
-                close_price=d["close_price"],
-                volume=d["volume"],
-                open_interest=d["open_interest"],
-                gateway_name="DB"
-            )
+        result = influx_client.query(query, bind_params=bind_params, epoch="u")
+        data = parse_result(result, BAR_DTYPE)
+        if not len(data):
+            return None
 
-        return bar
+        array = BarArray(symbol, exchange, interval, data[-1:], DB_TZ)
+        return array[0]
 
     def get_newest_tick_data(
         self, symbol: str, exchange: "Exchange"
     ) -> Optional["TickData"]:
-        pass
+        query = (
+            "select last(last_price), * from tick_data"
+            " where vt_symbol=$vt_symbol"
+        )
+
+        bind_params = {
+            "vt_symbol": generate_vt_symbol(symbol, exchange)
+        }
+
+        result = influx_client.query(query, bind_params=bind_params, epoch="u")
+        data = parse_result(result, TICK_DTYPE)
+        if not len(data):
+            return None
+
+        name = parse_name(result)
+        array = TickArray(symbol, exchange, data[-1:], DB_TZ, name=name)
+        return array[0]
 
     def get_bar_data_statistics(self) -> List:
         query = "select count(close_price) from bar_data group by *"
@@ -263,4 +472,12 @@ class InfluxManager(BaseDatabaseManager):
         return count
 
     def clean(self, symbol: str):
-        pass
+        # Regular expression is not supported in bind params
+        pattern = re.escape(symbol + ".").replace("/", "\\/")
+
+        for measurement in ["bar_data", "tick_data"]:
+            query = (
+                f"drop series from {measurement}"
+                f" where vt_symbol =~ /^{pattern}/"
+            )
+            influx_client.query(query)
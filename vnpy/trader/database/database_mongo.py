@@ -1,18 +1,40 @@
 from datetime import datetime
-from enum import Enum
-from typing import Optional, Sequence, List
+from typing import Dict, Optional, Sequence, List, Tuple
 from tzlocal import get_localzone
 
-from mongoengine import DateTimeField, Document, FloatField, StringField, connect
+import numpy as np
+from mongoengine import (
+    DateTimeField,
+    Document,
+    FloatField,
+    IntField,
+    StringField,
+    connect
+)
+from pymongo import ASCENDING, UpdateOne
 
 from vnpy.trader.constant import Exchange, Interval
 from vnpy.trader.object import BarData, TickData
+from vnpy.trader.columnar import (
+    BarArray,
+    TickArray,
+    BAR_DTYPE,
+    BAR_FIELDS,
+    TICK_DTYPE,
+    TICK_FIELDS
+)
 
 from .database import BaseDatabaseManager, Driver, DB_TZ
 
 
 LOCAL_TZ = get_localzone()
 
+# Number of operations in each bulk write
+BULK_SIZE = 10000
+
+# Number of documents in each batch returned by cursor
+CURSOR_BATCH_SIZE = 10000
+
 
 def init(_: Driver, settings: dict):
     database = settings["database"]
@@ -36,7 +58,13 @@ def init(_: Driver, settings: dict):
         authentication_source=authentication_source,
     )
 
-    return MongoManager()
+    manager = MongoManager()
+
+    # Build overview for database created before overview collection exists
+    if not DbBarOverview.objects.first() and DbBarData.objects.first():
+        manager.rebuild_bar_overview()
+
+    return manager
 
 
 class DbBarData(Document):
@@ -195,6 +223,29 @@ class DbTickData(Document):
         return tick
 
 
+class DbBarOverview(Document):
+    """
+    Overview of bar data stored in database, which is updated together
+    with saving and deleting bar data.
+    """
+
+    symbol: str = StringField()
+    exchange: str = StringField()
+    interval: str = StringField()
+    count: int = IntField()
+    start: datetime = DateTimeField()
+    end: datetime = DateTimeField()
+
+    meta = {
+        "indexes": [
+            {
+                "fields": ("symbol", "exchange", "interval"),
+                "unique": True,
+            }
+        ]
+    }
+
+
 class MongoManager(BaseDatabaseManager):
 
     def load_bar_data(
@@ -205,89 +256,227 @@ class MongoManager(BaseDatabaseManager):
         start: datetime,
         end: datetime,
     ) -> Sequence[BarData]:
-        s = DbBarData.objects(
-            symbol=symbol,
-            exchange=exchange.value,
-            interval=interval.value,
-            datetime__gte=convert_tz(start),
-            datetime__lte=convert_tz(end),
-        )
-        data = [db_bar.to_bar() for db_bar in s]
-        return data
+        array = self.load_bar_array(symbol, exchange, interval, start, end)
+        return array.to_bars()
 
     def load_tick_data(
         self, symbol: str, exchange: Exchange, start: datetime, end: datetime
     ) -> Sequence[TickData]:
-        s = DbTickData.objects(
-            symbol=symbol,
-            exchange=exchange.value,
-            datetime__gte=convert_tz(start),
-            datetime__lte=convert_tz(end),
+        array = self.load_tick_array(symbol, exchange, start, end)
+        return array.to_ticks()
+
+    def load_bar_array(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        start: datetime,
+        end: datetime,
+    ) -> BarArray:
+        """
+        Load bar data from raw pymongo cursor without creating documents.
+        """
+        query = {
+            "symbol": symbol,
+            "exchange": exchange.value,
+            "interval": interval.value,
+            "datetime": {"$gte": convert_tz(start), "$lte": convert_tz(end)}
+        }
+        projection = dict.fromkeys(["datetime"] + BAR_FIELDS, 1)
+        projection["_id"] = 0
+
+        cursor = (
+            DbBarData._get_collection()
+            .find(query, projection, batch_size=CURSOR_BATCH_SIZE)
+            .sort("datetime", ASCENDING)
         )
-        data = [db_tick.to_tick() for db_tick in s]
-        return data
 
-    @staticmethod
-    def to_update_param(d) -> dict:
-        dt = d.datetime.astimezone(DB_TZ)
-        d.datetime = dt.replace(tzinfo=None)
+        rows = [
+            (d["datetime"], *[d.get(name, None) or 0 for name in BAR_FIELDS])
+            for d in cursor
+        ]
+        data = np.array(rows, dtype=BAR_DTYPE)
 
-        param = {
-            "set__" + k: v.value if isinstance(v, Enum) else v
-            for k, v in d.__dict__.items()
+        return BarArray(symbol, exchange, interval, data, DB_TZ)
+
+    def load_tick_array(
+        self, symbol: str, exchange: Exchange, start: datetime, end: datetime
+    ) -> TickArray:
+        """
+        Load tick data from raw pymongo cursor without creating documents.
+        """
+        query = {
+            "symbol": symbol,
+            "exchange": exchange.value,
+            "datetime": {"$gte": convert_tz(start), "$lte": convert_tz(end)}
         }
-        return param
+        projection = dict.fromkeys(["datetime", "name"] + TICK_FIELDS, 1)
+        projection["_id"] = 0
+
+        cursor = (
+            DbTickData._get_collection()
+            .find(query, projection, batch_size=CURSOR_BATCH_SIZE)
+            .sort("datetime", ASCENDING)
+        )
+
+        name = ""
+        rows = []
+
+        for d in cursor:
+            if not name:
+                name = d.get("name", "")
+
+            rows.append(
+                (d["datetime"], *[d.get(n, None) or 0 for n in TICK_FIELDS])
+            )
+
+        data = np.array(rows, dtype=TICK_DTYPE)
+
+        return TickArray(symbol, exchange, data, DB_TZ, name=name)
 
     def save_bar_data(self, datas: Sequence[BarData]):
-        for d in datas:
-            updates = self.to_update_param(d)
-            updates.pop("set__gateway_name")
-            updates.pop("set__vt_symbol")
-            (
-                DbBarData.objects(
-                    symbol=d.symbol, interval=d.interval.value, datetime=d.datetime
-                ).update_one(upsert=True, **updates)
+        # Unordered bulk write has no order guarantee, so only the last
+        # one of duplicated data is kept
+        requests = {}
+
+        for bar in datas:
+            key = {
+                "symbol": bar.symbol,
+                "exchange": bar.exchange.value,
+                "interval": bar.interval.value,
+                "datetime": convert_tz(bar.datetime)
+            }
+
+            values = {name: getattr(bar, name) for name in BAR_FIELDS}
+            values.update(key)
+
+            requests[tuple(key.values())] = UpdateOne(
+                key, {"$set": values}, upsert=True
             )
 
+        bulk_write(DbBarData, list(requests.values()))
+        self.update_bar_overview(list(requests.keys()))
+
+    def update_bar_overview(self, keys: List[tuple]) -> None:
+        """
+        Update overview with keys of bar data just saved.
+        """
+        groups: Dict[Tuple[str, str, str], List[datetime]] = {}
+        for symbol, exchange, interval, dt in keys:
+            groups.setdefault((symbol, exchange, interval), []).append(dt)
+
+        for (symbol, exchange, interval), datetimes in groups.items():
+            overview = DbBarOverview.objects(
+                symbol=symbol,
+                exchange=exchange,
+                interval=interval
+            ).first()
+
+            start = min(datetimes)
+            end = max(datetimes)
+
+            # Count can be increased directly if data is appended,
+            # otherwise query again since existing data may be replaced.
+            if overview and start > overview.end:
+                overview.count += len(datetimes)
+                overview.end = end
+            else:
+                if not overview:
+                    overview = DbBarOverview(
+                        symbol=symbol,
+                        exchange=exchange,
+                        interval=interval
+                    )
+
+                d = next(aggregate_bar_overview({
+                    "symbol": symbol,
+                    "exchange": exchange,
+                    "interval": interval
+                }))
+
+                overview.count = d["count"]
+                overview.start = d["start"]
+                overview.end = d["end"]
+
+            overview.save()
+
+    def rebuild_bar_overview(self) -> None:
+        """
+        Rebuild overview with all bar data in database.
+        """
+        DbBarOverview.objects.delete()
+
+        overviews = []
+        for d in aggregate_bar_overview():
+            overview = DbBarOverview(**d["_id"])
+            overview.count = d["count"]
+            overview.start = d["start"]
+            overview.end = d["end"]
+            overviews.append(overview)
+
+        for i in range(0, len(overviews), BULK_SIZE):
+            DbBarOverview.objects.insert(overviews[i: i + BULK_SIZE])
+
     def save_tick_data(self, datas: Sequence[TickData]):
-        for d in datas:
-            updates = self.to_update_param(d)
-            updates.pop("set__gateway_name")
-            updates.pop("set__vt_symbol")
-            (
-                DbTickData.objects(
-                    symbol=d.symbol, exchange=d.exchange.value, datetime=d.datetime
-                ).update_one(upsert=True, **updates)
+        requests = {}
+
+        for tick in datas:
+            key = {
+                "symbol": tick.symbol,
+                "exchange": tick.exchange.value,
+                "datetime": convert_tz(tick.datetime)
+            }
+
+            values = {name: getattr(tick, name) for name in TICK_FIELDS}
+            values["name"] = tick.name
+            values.update(key)
+
+            requests[tuple(key.values())] = UpdateOne(
+                key, {"$set": values}, upsert=True
             )
 
+        bulk_write(DbTickData, list(requests.values()))
+
     def get_newest_bar_data(
         self, symbol: str, exchange: "Exchange", interval: "Interval"
     ) -> Optional["BarData"]:
-        s = (
-            DbBarData.objects(
-                symbol=symbol,
-                exchange=exchange.value,
-                interval=interval.value
-            )
-            .order_by("-datetime")
-            .first()
-        )
-        if s:
-            return s.to_bar()
-        return None
+        overview = self.get_bar_overview(symbol, exchange, interval)
+        if not overview:
+            return None
+        return self.get_bar(symbol, exchange, interval, overview.end)
 
     def get_oldest_bar_data(
         self, symbol: str, exchange: "Exchange", interval: "Interval"
     ) -> Optional["BarData"]:
-        s = (
-            DbBarData.objects(
-                symbol=symbol,
-                exchange=exchange.value,
-                interval=interval.value
-            )
-            .order_by("+datetime")
-            .first()
-        )
+        overview = self.get_bar_overview(symbol, exchange, interval)
+        if not overview:
+            return None
+        return self.get_bar(symbol, exchange, interval, overview.start)
+
+    def get_bar_overview(
+        self, symbol: str, exchange: "Exchange", interval: "Interval"
+    ) -> Optional[DbBarOverview]:
+        """"""
+        return DbBarOverview.objects(
+            symbol=symbol,
+            exchange=exchange.value,
+            interval=interval.value
+        ).first()
+
+    def get_bar(
+        self,
+        symbol: str,
+        exchange: "Exchange",
+        interval: "Interval",
+        dt: datetime
+    ) -> Optional["BarData"]:
+        """"""
+        s = DbBarData.objects(
+            symbol=symbol,
+            exchange=exchange.value,
+            interval=interval.value,
+            datetime=dt
+        ).first()
         if s:
             return s.to_bar()
         return None
@@ -306,25 +495,17 @@ class MongoManager(BaseDatabaseManager):
 
     def get_bar_data_statistics(self) -> List:
         """"""
-        s = (
-            DbBarData.objects.aggregate({
-                "$group": {
-                    "_id": {
-                        "symbol": "$symbol",
-                        "exchange": "$exchange",
-                        "interval": "$interval",
-                    },
-                    "count": {"$sum": 1}
-                }
-            })
-        )
-
         result = []
 
-        for d in s:
-            data = d["_id"]
-            data["count"] = d["count"]
-            result.append(data)
+        for overview in DbBarOverview.objects:
+            result.append({
+                "symbol": overview.symbol,
+                "exchange": overview.exchange,
+                "interval": overview.interval,
+                "count": overview.count,
+                "start": DB_TZ.localize(overview.start),
+                "end": DB_TZ.localize(overview.end)
+            })
 
         return result
 
@@ -343,11 +524,52 @@ class MongoManager(BaseDatabaseManager):
             interval=interval.value
         ).delete()
 
+        DbBarOverview.objects(
+            symbol=symbol,
+            exchange=exchange.value,
+            interval=interval.value
+        ).delete()
+
         return count
 
     def clean(self, symbol: str):
         DbTickData.objects(symbol=symbol).delete()
         DbBarData.objects(symbol=symbol).delete()
+        DbBarOverview.objects(symbol=symbol).delete()
+
+
+def aggregate_bar_overview(match: dict = None):
+    """
+    Aggregate count, start and end of bar data grouped by
+    symbol/exchange/interval.
+    """
+    pipeline = [{
+        "$group": {
+            "_id": {
+                "symbol": "$symbol",
+                "exchange": "$exchange",
+                "interval": "$interval",
+            },
+            "count": {"$sum": 1},
+            "start": {"$min": "$datetime"},
+            "end": {"$max": "$datetime"}
+        }
+    }]
+
+    if match:
+        pipeline.insert(0, {"$match": match})
+
+    return DbBarData.objects.aggregate(*pipeline)
+
+
+def bulk_write(document: type, requests: List[UpdateOne]):
+    """
+    Execute update requests in unordered bulk writes.
+    """
+    collection = document._get_collection()
+
+    for i in range(0, len(requests), BULK_SIZE):
+        collection.bulk_write(requests[i: i + BULK_SIZE], ordered=False)
 
 
 def convert_tz(dt: datetime):
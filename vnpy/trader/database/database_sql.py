@@ -1,13 +1,16 @@
 """"""
 from datetime import datetime
-from typing import List, Dict, Optional, Sequence, Type
+from io import StringIO
+from typing import Any, List, Dict, Iterator, Optional, Sequence, Tuple, Type
 
+import numpy as np
 from peewee import (
     AutoField,
     CharField,
     Database,
     DateTimeField,
     FloatField,
+    IntegerField,
     Model,
     MySQLDatabase,
     PostgresqlDatabase,
@@ -19,10 +22,33 @@ from peewee import (
 from vnpy.trader.constant import Exchange, Interval
 from vnpy.trader.object import BarData, TickData
 from vnpy.trader.utility import get_file_path
+from vnpy.trader.columnar import (
+    BarArray,
+    TickArray,
+    BAR_DTYPE,
+    BAR_FIELDS,
+    TICK_DTYPE,
+    TICK_FIELDS
+)
 
 from .database import BaseDatabaseManager, Driver, DB_TZ
 
 
+BAR_COLUMNS: List[str] = ["symbol", "exchange", "datetime", "interval"] + BAR_FIELDS
+TICK_COLUMNS: List[str] = ["symbol", "exchange", "datetime", "name"] + TICK_FIELDS
+
+# Number of rows in each executemany call
+BATCH_SIZE = 10000
+
+# Tuned for bulk import, WAL keeps loading available during writing
+SQLITE_PRAGMAS = {
+    "journal_mode": "wal",
+    "synchronous": "normal",
+    "cache_size": -64000,
+    "temp_store": "memory"
+}
+
+
 def init(driver: Driver, settings: dict):
     init_funcs = {
         Driver.SQLITE: init_sqlite,
@@ -32,14 +58,20 @@ def init(driver: Driver, settings: dict):
     assert driver in init_funcs
 
     db = init_funcs[driver](settings)
-    bar, tick = init_models(db, driver)
-    return SqlManager(bar, tick)
+    bar, tick, overview = init_models(db, driver)
+    manager = SqlManager(bar, tick, overview)
+
+    # Build overview for database created before overview table exists
+    if not overview.select().exists() and bar.select().exists():
+        manager.rebuild_bar_overview()
+
+    return manager
 
 
 def init_sqlite(settings: dict):
     database = settings["database"]
     path = str(get_file_path(database))
-    db = SqliteDatabase(path)
+    db = SqliteDatabase(path, pragmas=SQLITE_PRAGMAS)
     return db
 
 
@@ -63,6 +95,183 @@ class ModelBase(Model):
         return self.__data__
 
 
+def bar_to_row(bar: BarData) -> tuple:
+    """
+    Convert BarData into row of values in order of BAR_COLUMNS.
+    """
+    # Change datetime to database timezone, then
+    # remove tzinfo since not supported by SQLite.
+    dt = bar.datetime.astimezone(DB_TZ).replace(tzinfo=None)
+
+    return (
+        bar.symbol,
+        bar.exchange.value,
+        dt,
+        bar.interval.value,
+        bar.volume,
+        bar.open_interest,
+        bar.open_price,
+        bar.high_price,
+        bar.low_price,
+        bar.close_price
+    )
+
+
+def tick_to_row(tick: TickData) -> tuple:
+    """
+    Convert TickData into row of values in order of TICK_COLUMNS.
+    """
+    dt = tick.datetime.astimezone(DB_TZ).replace(tzinfo=None)
+
+    # Depth fields are left null if only level 1 is available
+    if tick.bid_price_2:
+        depth = (
+            tick.bid_price_2, tick.bid_price_3, tick.bid_price_4, tick.bid_price_5,
+            tick.ask_price_2, tick.ask_price_3, tick.ask_price_4, tick.ask_price_5,
+            tick.bid_volume_2, tick.bid_volume_3, tick.bid_volume_4, tick.bid_volume_5,
+            tick.ask_volume_2, tick.ask_volume_3, tick.ask_volume_4, tick.ask_volume_5,
+        )
+    else:
+        depth = (None,) * 16
+
+    return (
+        tick.symbol,
+        tick.exchange.value,
+        dt,
+        tick.name,
+        tick.volume,
+        tick.open_interest,
+        tick.last_price,
+        tick.last_volume,
+        tick.limit_up,
+        tick.limit_down,
+        tick.open_price,
+        tick.high_price,
+        tick.low_price,
+        tick.pre_close,
+        tick.bid_price_1,
+        depth[0], depth[1], depth[2], depth[3],
+        tick.ask_price_1,
+        depth[4], depth[5], depth[6], depth[7],
+        tick.bid_volume_1,
+        depth[8], depth[9], depth[10], depth[11],
+        tick.ask_volume_1,
+        depth[12], depth[13], depth[14], depth[15],
+    )
+
+
+def format_copy_value(value: Any) -> str:
+    """
+    Format value for PostgreSQL COPY text format.
+    """
+    if value is None:
+        return "\\N"
+
+    if isinstance(value, str):
+        return (
+            value.replace("\\", "\\\\")
+            .replace("\t", "\\t")
+            .replace("\n", "\\n")
+            .replace("\r", "\\r")
+        )
+
+    return str(value)
+
+
+def save_rows(
+    db: Database,
+    driver: Driver,
+    model: Type[Model],
+    columns: List[str],
+    unique_columns: Tuple[str, ...],
+    rows: Sequence[tuple]
+) -> None:
+    """
+    Save rows of values into table, update if exists.
+
+    PostgreSQL rows are copied into a staging table and then merged,
+    other databases use executemany with REPLACE in large batches.
+    """
+    if not rows:
+        return
+
+    # Column names like interval are reserved words in MySQL
+    left, right = db.quote
+    table = f"{left}{model._meta.table_name}{right}"
+    quoted_columns = [f"{left}{c}{right}" for c in columns]
+    quoted_uniques = [f"{left}{c}{right}" for c in unique_columns]
+    column_list = ", ".join(quoted_columns)
+
+    with db.atomic():
+        cursor = db.cursor()
+
+        if driver is Driver.POSTGRESQL:
+            staging = f"{left}{model._meta.table_name}_staging{right}"
+
+            cursor.execute(
+                f"CREATE TEMP TABLE {staging} ON COMMIT DROP AS "
+                f"SELECT {column_list} FROM {table} WITH NO DATA"
+            )
+
+            buf = StringIO()
+            for row in rows:
+                buf.write("\t".join([format_copy_value(v) for v in row]))
+                buf.write("\n")
+            buf.seek(0)
+
+            cursor.copy_expert(f"COPY {staging} ({column_list}) FROM STDIN", buf)
+
+            # Keep only the last row of duplicates, same as saving one by one
+            unique_list = ", ".join(quoted_uniques)
+            update_list = ", ".join(
+                f"{c} = EXCLUDED.{c}"
+                for c in quoted_columns if c not in quoted_uniques
+            )
+
+            cursor.execute(
+                f"INSERT INTO {table} ({column_list}) "
+                f"SELECT DISTINCT ON ({unique_list}) {column_list} FROM {staging} "
+                f"ORDER BY {unique_list}, ctid DESC "
+                f"ON CONFLICT ({unique_list}) DO UPDATE SET {update_list}"
+            )
+        else:
+            params = ", ".join([db.param] * len(columns))
+            sql = f"REPLACE INTO {table} ({column_list}) VALUES ({params})"
+
+            for c in chunked(rows, BATCH_SIZE):
+                cursor.executemany(sql, c)
+
+
+def iter_pages(
+    model: Type[Model],
+    query: Any,
+    chunk_size: int
+) -> Iterator[List[tuple]]:
+    """
+    Fetch rows of query ordered by datetime page by page with LIMIT.
+
+    Client side cursors of psycopg2 and pymysql buffer the whole result
+    set, so each page is a new query starting after the last datetime of
+    previous page, which is unique with the symbol filters of query.
+    """
+    last_dt = None
+
+    while True:
+        s = query
+        if last_dt is not None:
+            s = s.where(model.datetime > last_dt)
+
+        rows = list(s.limit(chunk_size))
+        if not rows:
+            return
+
+        yield rows
+
+        if len(rows) < chunk_size:
+            return
+        last_dt = rows[-1][0]
+
+
 def init_models(db: Database, driver: Driver):
     class DbBarData(ModelBase):
         """
@@ -137,23 +346,25 @@ def init_models(db: Database, driver: Driver):
             """
             save a list of objects, update if exists.
             """
-            dicts = [i.to_dict() for i in objs]
-            with db.atomic():
-                if driver is Driver.POSTGRESQL:
-                    for bar in dicts:
-                        DbBarData.insert(bar).on_conflict(
-                            update=bar,
-                            conflict_target=(
-                                DbBarData.symbol,
-                                DbBarData.exchange,
-                                DbBarData.interval,
-                                DbBarData.datetime,
-                            ),
-                        ).execute()
-                else:
-                    for c in chunked(dicts, 50):
-                        DbBarData.insert_many(
-                            c).on_conflict_replace().execute()
+            rows = [
+                tuple(obj.to_dict().get(c, None) for c in BAR_COLUMNS)
+                for obj in objs
+            ]
+            DbBarData.save_rows(rows)
+
+        @staticmethod
+        def save_rows(rows: Sequence[tuple]):
+            """
+            save rows of values in order of BAR_COLUMNS, update if exists.
+            """
+            save_rows(
+                db,
+                driver,
+                DbBarData,
+                BAR_COLUMNS,
+                ("symbol", "exchange", "interval", "datetime"),
+                rows
+            )
 
     class DbTickData(ModelBase):
         """
@@ -315,32 +526,60 @@ def init_models(db: Database, driver: Driver):
 
         @staticmethod
         def save_all(objs: List["DbTickData"]):
-            dicts = [i.to_dict() for i in objs]
-            with db.atomic():
-                if driver is Driver.POSTGRESQL:
-                    for tick in dicts:
-                        DbTickData.insert(tick).on_conflict(
-                            update=tick,
-                            conflict_target=(
-                                DbTickData.symbol,
-                                DbTickData.exchange,
-                                DbTickData.datetime,
-                            ),
-                        ).execute()
-                else:
-                    for c in chunked(dicts, 50):
-                        DbTickData.insert_many(c).on_conflict_replace().execute()
+            rows = [
+                tuple(obj.to_dict().get(c, None) for c in TICK_COLUMNS)
+                for obj in objs
+            ]
+            DbTickData.save_rows(rows)
+
+        @staticmethod
+        def save_rows(rows: Sequence[tuple]):
+            """
+            save rows of values in order of TICK_COLUMNS, update if exists.
+            """
+            save_rows(
+                db,
+                driver,
+                DbTickData,
+                TICK_COLUMNS,
+                ("symbol", "exchange", "datetime"),
+                rows
+            )
+
+    class DbBarOverview(ModelBase):
+        """
+        Overview of bar data stored in database, which is updated
+        together with saving and deleting bar data.
+        """
+
+        id = AutoField()
+        symbol: str = CharField()
+        exchange: str = CharField()
+        interval: str = CharField()
+        count: int = IntegerField()
+        start: datetime = DateTimeField()
+        end: datetime = DateTimeField()
+
+        class Meta:
+            database = db
+            indexes = ((("symbol", "exchange", "interval"), True),)
 
     db.connect()
-    db.create_tables([DbBarData, DbTickData])
-    return DbBarData, DbTickData
+    db.create_tables([DbBarData, DbTickData, DbBarOverview])
+    return DbBarData, DbTickData, DbBarOverview
 
 
 class SqlManager(BaseDatabaseManager):
 
-    def __init__(self, class_bar: Type[Model], class_tick: Type[Model]):
+    def __init__(
+        self,
+        class_bar: Type[Model],
+        class_tick: Type[Model],
+        class_overview: Type[Model]
+    ):
         self.class_bar = class_bar
         self.class_tick = class_tick
+        self.class_overview = class_overview
 
     def load_bar_data(
         self,
@@ -350,8 +589,102 @@ class SqlManager(BaseDatabaseManager):
         start: datetime,
         end: datetime,
     ) -> Sequence[BarData]:
+        data = []
+        for bars in self.iter_bar_data(symbol, exchange, interval, start, end):
+            data.extend(bars)
+        return data
+
+    def load_tick_data(
+        self, symbol: str, exchange: Exchange, start: datetime, end: datetime
+    ) -> Sequence[TickData]:
+        data = []
+        for ticks in self.iter_tick_data(symbol, exchange, start, end):
+            data.extend(ticks)
+        return data
+
+    def iter_bar_data(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        start: datetime,
+        end: datetime,
+        chunk_size: int = 100000
+    ) -> Iterator[List[BarData]]:
+        """
+        Stream bar data in chunks from raw rows of cursor.
+        """
+        for array in self.iter_bar_array(
+            symbol, exchange, interval, start, end, chunk_size
+        ):
+            yield array.to_bars()
+
+    def iter_tick_data(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        start: datetime,
+        end: datetime,
+        chunk_size: int = 100000
+    ) -> Iterator[List[TickData]]:
+        """
+        Stream tick data in chunks from raw rows of cursor.
+        """
+        for array in self.iter_tick_array(
+            symbol, exchange, start, end, chunk_size
+        ):
+            yield array.to_ticks()
+
+    def load_bar_array(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        start: datetime,
+        end: datetime,
+    ) -> BarArray:
+        """
+        Load bar data into BarArray from raw rows without creating
+        model and data objects.
+        """
+        arrays = self.iter_bar_array(symbol, exchange, interval, start, end)
+        data = np.concatenate(
+            [np.empty(0, dtype=BAR_DTYPE)] + [array.data for array in arrays]
+        )
+        return BarArray(symbol, exchange, interval, data, DB_TZ)
+
+    def load_tick_array(
+        self, symbol: str, exchange: Exchange, start: datetime, end: datetime
+    ) -> TickArray:
+        """
+        Load tick data into TickArray from raw rows without creating
+        model and data objects.
+        """
+        arrays = list(self.iter_tick_array(symbol, exchange, start, end))
+        data = np.concatenate(
+            [np.empty(0, dtype=TICK_DTYPE)] + [array.data for array in arrays]
+        )
+        name = arrays[0].name if arrays else ""
+        return TickArray(symbol, exchange, data, DB_TZ, name=name)
+
+    def iter_bar_array(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        start: datetime,
+        end: datetime,
+        chunk_size: int = 100000
+    ) -> Iterator[BarArray]:
+        """
+        Stream bar data in chunks of BarArray, one query for each chunk.
+        """
+        columns = [self.class_bar.datetime] + [
+            getattr(self.class_bar, name) for name in BAR_FIELDS
+        ]
+
         s = (
-            self.class_bar.select()
+            self.class_bar.select(*columns)
                 .where(
                 (self.class_bar.symbol == symbol)
                 & (self.class_bar.exchange == exchange.value)
@@ -360,16 +693,42 @@ class SqlManager(BaseDatabaseManager):
                 & (self.class_bar.datetime <= end)
             )
             .order_by(self.class_bar.datetime)
+            .tuples()
         )
 
-        data = [db_bar.to_bar() for db_bar in s]
-        return data
+        for rows in iter_pages(self.class_bar, s, chunk_size):
+            data = np.array(rows, dtype=BAR_DTYPE)
+            yield BarArray(symbol, exchange, interval, data, DB_TZ)
+
+    def iter_tick_array(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        start: datetime,
+        end: datetime,
+        chunk_size: int = 100000
+    ) -> Iterator[TickArray]:
+        """
+        Stream tick data in chunks of TickArray, one query for each chunk.
+        """
+        # Contract name is the same for all ticks
+        first = (
+            self.class_tick.select(self.class_tick.name)
+                .where(
+                (self.class_tick.symbol == symbol)
+                & (self.class_tick.exchange == exchange.value)
+            )
+            .first()
+        )
+        name = first.name if first else ""
+
+        # Nullable depth columns are converted to 0 as in to_tick
+        columns = [self.class_tick.datetime] + [
+            fn.COALESCE(getattr(self.class_tick, name), 0) for name in TICK_FIELDS
+        ]
 
-    def load_tick_data(
-        self, symbol: str, exchange: Exchange, start: datetime, end: datetime
-    ) -> Sequence[TickData]:
         s = (
-            self.class_tick.select()
+            self.class_tick.select(*columns)
                 .where(
                 (self.class_tick.symbol == symbol)
                 & (self.class_tick.exchange == exchange.value)
@@ -377,48 +736,140 @@ class SqlManager(BaseDatabaseManager):
                 & (self.class_tick.datetime <= end)
             )
             .order_by(self.class_tick.datetime)
+            .tuples()
         )
 
-        data = [db_tick.to_tick() for db_tick in s]
-        return data
+        for rows in iter_pages(self.class_tick, s, chunk_size):
+            data = np.array(rows, dtype=TICK_DTYPE)
+            yield TickArray(symbol, exchange, data, DB_TZ, name=name)
 
     def save_bar_data(self, datas: Sequence[BarData]):
-        ds = [self.class_bar.from_bar(i) for i in datas]
-        self.class_bar.save_all(ds)
+        rows = [bar_to_row(bar) for bar in datas]
+
+        with self.class_bar._meta.database.atomic():
+            self.class_bar.save_rows(rows)
+            self.update_bar_overview(rows)
+
+    def update_bar_overview(self, rows: Sequence[tuple]) -> None:
+        """
+        Update overview with rows of bar data just saved.
+        """
+        groups: Dict[Tuple[str, str, str], set] = {}
+        for row in rows:
+            symbol, exchange, dt, interval = row[:4]
+            groups.setdefault((symbol, exchange, interval), set()).add(dt)
+
+        for (symbol, exchange, interval), datetimes in groups.items():
+            overview = self.class_overview.get_or_none(
+                (self.class_overview.symbol == symbol)
+                & (self.class_overview.exchange == exchange)
+                & (self.class_overview.interval == interval)
+            )
+
+            start = min(datetimes)
+            end = max(datetimes)
+
+            # Count can be increased directly if data is appended,
+            # otherwise query again since existing rows may be replaced.
+            if overview and start > overview.end:
+                overview.count += len(datetimes)
+                overview.end = end
+            else:
+                if not overview:
+                    overview = self.class_overview(
+                        symbol=symbol,
+                        exchange=exchange,
+                        interval=interval
+                    )
+
+                s = (
+                    self.class_bar.select(
+                        fn.COUNT(self.class_bar.id).alias("count"),
+                        fn.MIN(self.class_bar.datetime).alias("start"),
+                        fn.MAX(self.class_bar.datetime).alias("end")
+                    ).where(
+                        (self.class_bar.symbol == symbol)
+                        & (self.class_bar.exchange == exchange)
+                        & (self.class_bar.interval == interval)
+                    )
+                    .get()
+                )
+
+                overview.count = s.count
+                overview.start = s.start
+                overview.end = s.end
+
+            overview.save()
+
+    def rebuild_bar_overview(self) -> None:
+        """
+        Rebuild overview with all bar data in database.
+        """
+        s = (
+            self.class_bar.select(
+                self.class_bar.symbol,
+                self.class_bar.exchange,
+                self.class_bar.interval,
+                fn.COUNT(self.class_bar.id).alias("count"),
+                fn.MIN(self.class_bar.datetime).alias("start"),
+                fn.MAX(self.class_bar.datetime).alias("end")
+            ).group_by(
+                self.class_bar.symbol,
+                self.class_bar.exchange,
+                self.class_bar.interval
+            )
+            .dicts()
+        )
+
+        with self.class_overview._meta.database.atomic():
+            self.class_overview.delete().execute()
+
+            for c in chunked(s, BATCH_SIZE):
+                self.class_overview.insert_many(c).execute()
 
     def save_tick_data(self, datas: Sequence[TickData]):
-        ds = [self.class_tick.from_tick(i) for i in datas]
-        self.class_tick.save_all(ds)
+        rows = [tick_to_row(tick) for tick in datas]
+        self.class_tick.save_rows(rows)
 
     def get_newest_bar_data(
         self, symbol: str, exchange: "Exchange", interval: "Interval"
     ) -> Optional["BarData"]:
-        s = (
-            self.class_bar.select()
-                .where(
-                (self.class_bar.symbol == symbol)
-                & (self.class_bar.exchange == exchange.value)
-                & (self.class_bar.interval == interval.value)
-            )
-            .order_by(self.class_bar.datetime.desc())
-            .first()
-        )
-        if s:
-            return s.to_bar()
-        return None
+        overview = self.get_bar_overview(symbol, exchange, interval)
+        if not overview:
+            return None
+        return self.get_bar(symbol, exchange, interval, overview.end)
 
     def get_oldest_bar_data(
         self, symbol: str, exchange: "Exchange", interval: "Interval"
     ) -> Optional["BarData"]:
-        s = (
-            self.class_bar.select()
-                .where(
-                (self.class_bar.symbol == symbol)
-                & (self.class_bar.exchange == exchange.value)
-                & (self.class_bar.interval == interval.value)
-            )
-            .order_by(self.class_bar.datetime.asc())
-            .first()
+        overview = self.get_bar_overview(symbol, exchange, interval)
+        if not overview:
+            return None
+        return self.get_bar(symbol, exchange, interval, overview.start)
+
+    def get_bar_overview(
+        self, symbol: str, exchange: "Exchange", interval: "Interval"
+    ) -> Optional[Model]:
+        """"""
+        return self.class_overview.get_or_none(
+            (self.class_overview.symbol == symbol)
+            & (self.class_overview.exchange == exchange.value)
+            & (self.class_overview.interval == interval.value)
+        )
+
+    def get_bar(
+        self,
+        symbol: str,
+        exchange: "Exchange",
+        interval: "Interval",
+        dt: datetime
+    ) -> Optional["BarData"]:
+        """"""
+        s = self.class_bar.get_or_none(
+            (self.class_bar.symbol == symbol)
+            & (self.class_bar.exchange == exchange.value)
+            & (self.class_bar.interval == interval.value)
+            & (self.class_bar.datetime == dt)
         )
         if s:
             return s.to_bar()
@@ -442,18 +893,7 @@ class SqlManager(BaseDatabaseManager):
 
     def get_bar_data_statistics(self) -> List[Dict]:
         """"""
-        s = (
-            self.class_bar.select(
-                self.class_bar.symbol,
-                self.class_bar.exchange,
-                self.class_bar.interval,
-                fn.COUNT(self.class_bar.id).alias("count")
-            ).group_by(
-                self.class_bar.symbol,
-                self.class_bar.exchange,
-                self.class_bar.interval
-            )
-        )
+        s = self.class_overview.select()
 
         result = []
 
@@ -462,7 +902,9 @@ class SqlManager(BaseDatabaseManager):
                 "symbol": data.symbol,
                 "exchange": data.exchange,
                 "interval": data.interval,
-                "count": data.count
+                "count": data.count,
+                "start": DB_TZ.localize(data.start),
+                "end": DB_TZ.localize(data.end)
             })
 
         return result
@@ -482,8 +924,18 @@ class SqlManager(BaseDatabaseManager):
             & (self.class_bar.interval == interval.value)
         )
         count = query.execute()
+
+        self.class_overview.delete().where(
+            (self.class_overview.symbol == symbol)
+            & (self.class_overview.exchange == exchange.value)
+            & (self.class_overview.interval == interval.value)
+        ).execute()
+
         return count
 
     def clean(self, symbol: str):
         self.class_bar.delete().where(self.class_bar.symbol == symbol).execute()
+        self.class_overview.delete().where(
+            self.class_overview.symbol == symbol
+        ).execute()
         self.class_tick.delete().where(self.class_tick.symbol == symbol).execute()
@@ -10,7 +10,7 @@ from datetime import datetime
 from email.message import EmailMessage
 from queue import Empty, Queue
 from threading import Thread
-from typing import Any, Sequence, Type, Dict, List, Optional
+from typing import Any, Callable, Sequence, Type, Dict, List, Optional
 
 from vnpy.event import Event, EventEngine
 from .app import BaseApp
@@ -217,6 +217,21 @@ class MainEngine:
         else:
             return None
 
+    def download_history(
+        self,
+        req: HistoryRequest,
+        gateway_name: str,
+        callback: Callable[[List[BarData]], Any]
+    ) -> int:
+        """
+        Download history data from a specific gateway part by part.
+        """
+        gateway = self.get_gateway(gateway_name)
+        if gateway:
+            return gateway.download_history(req, callback)
+        else:
+            return 0
+
     def close(self) -> None:
         """
         Make sure every gateway and app is closed properly before
@@ -90,45 +90,58 @@ class BaseGateway(ABC):
         event = Event(type, data)
         self.event_engine.put(event)
 
+    def on_specific_event(self, type: str, data: Any = None) -> None:
+        """
+        Specific event push, which is skipped if no handler is
+        listening to the type.
+        """
+        if self.event_engine.has_handler(type):
+            self.on_event(type, data)
+
     def on_tick(self, tick: TickData) -> None:
         """
         Tick event push.
-        Tick event of a specific vt_symbol is also pushed.
+        Tick event of a specific vt_symbol is also pushed
+        if there is any handler listening to it.
         """
         self.on_event(EVENT_TICK, tick)
-        self.on_event(EVENT_TICK + tick.vt_symbol, tick)
+        self.on_specific_event(EVENT_TICK + tick.vt_symbol, tick)
 
     def on_trade(self, trade: TradeData) -> None:
         """
         Trade event push.
-        Trade event of a specific vt_symbol is also pushed.
+        Trade event of a specific vt_symbol is also pushed
+        if there is any handler listening to it.
         """
         self.on_event(EVENT_TRADE, trade)
-        self.on_event(EVENT_TRADE + trade.vt_symbol, trade)
+        self.on_specific_event(EVENT_TRADE + trade.vt_symbol, trade)
 
     def on_order(self, order: OrderData) -> None:
         """
         Order event push.
-        Order event of a specific vt_orderid is also pushed.
+        Order event of a specific vt_orderid is also pushed
+        if there is any handler listening to it.
         """
         self.on_event(EVENT_ORDER, order)
-        self.on_event(EVENT_ORDER + order.vt_orderid, order)
+        self.on_specific_event(EVENT_ORDER + order.vt_orderid, order)
 
     def on_position(self, position: PositionData) -> None:
         """
         Position event push.
-        Position event of a specific vt_symbol is also pushed.
+        Position event of a specific vt_symbol is also pushed
+        if there is any handler listening to it.
         """
         self.on_event(EVENT_POSITION, position)
-        self.on_event(EVENT_POSITION + position.vt_symbol, position)
+        self.on_specific_event(EVENT_POSITION + position.vt_symbol, position)
 
     def on_account(self, account: AccountData) -> None:
         """
         Account event push.
-        Account event of a specific vt_accountid is also pushed.
+        Account event of a specific vt_accountid is also pushed
+        if there is any handler listening to it.
         """
         self.on_event(EVENT_ACCOUNT, account)
-        self.on_event(EVENT_ACCOUNT + account.vt_accountid, account)
+        self.on_specific_event(EVENT_ACCOUNT + account.vt_accountid, account)
 
     def on_log(self, log: LogData) -> None:
         """
@@ -255,6 +268,23 @@ class BaseGateway(ABC):
         """
         pass
 
+    def download_history(
+        self,
+        req: HistoryRequest,
+        callback: Callable[[List[BarData]], Any]
+    ) -> int:
+        """
+        Download bar history data and pass to callback part by part.
+        Gateways querying history page by page can override this function
+        to avoid keeping all data in memory.
+        """
+        data = self.query_history(req)
+        if not data:
+            return 0
+
+        callback(data)
+        return len(data)
+
     def get_default_setting(self) -> Dict[str, Any]:
         """
         Return default setting dict.
@@ -0,0 +1,765 @@
+"""
+Run strategies in child processes to use multiple CPU cores.
+
+Strategies of the same process group are hosted by one child process.
+Ticks are passed to children through TickRingBuffer in shared memory,
+and other callbacks, order requests and strategy data updates are
+passed through pipe.
+
+In parent process, each hosted strategy is represented by a
+StrategyProxy object, which can be used by strategy engine in the same
+way as a normal strategy instance.
+"""
+
+import importlib
+import os
+import sys
+import traceback
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from copy import copy
+from multiprocessing import get_context
+from multiprocessing.connection import Connection
+from queue import Queue
+from threading import Lock, Thread, Event as ThreadEvent
+from typing import Any, Callable, Dict, List, Set, Type
+
+from vnpy.event import Event
+
+from .object import TickData
+from .ringbuffer import (
+    TickRingBuffer,
+    pack_bars,
+    unpack_bars,
+    pack_ticks,
+    unpack_ticks
+)
+
+
+CODEC_PACKERS: Dict[str, Callable] = {
+    "bar": pack_bars,
+    "tick": pack_ticks
+}
+
+CODEC_UNPACKERS: Dict[str, Callable] = {
+    "bar": unpack_bars,
+    "tick": unpack_ticks
+}
+
+# Callbacks waiting until finished in child process
+SYNC_FUNCS: Set[str] = {"on_init", "on_start", "on_stop"}
+
+# Requests from child process are processed in event engine thread
+EVENT_STRATEGY_HOST = "eStrategyHost"
+
+# Requests loading history data are processed in worker thread instead,
+# so that event engine is not blocked during strategy initialization
+THREAD_FUNCS: Set[str] = {"query_bar", "query_tick", "load_bar"}
+
+
+class StrategyRef:
+    """
+    Reference of strategy passed between processes.
+    """
+
+    def __init__(self, strategy_name: str):
+        """"""
+        self.strategy_name: str = strategy_name
+
+
+class StrategyProxy:
+    """
+    Stand-in of a strategy running in child process.
+
+    Setting parameter or variable is forwarded to child process, and
+    calling any other method is forwarded as strategy callback.
+    """
+
+    def __init__(
+        self,
+        host: "StrategyHost",
+        strategy_name: str,
+        vt_symbols: List[str],
+        state: dict
+    ):
+        """"""
+        object.__setattr__(self, "host", host)
+        object.__setattr__(self, "strategy_name", strategy_name)
+        object.__setattr__(self, "process_group", host.name)
+        object.__setattr__(self, "hosted_symbols", vt_symbols)
+        object.__setattr__(self, "pending_state", None)
+        object.__setattr__(self, "state_lock", Lock())
+
+        data = state["data"]
+        object.__setattr__(self, "parameters", list(data["parameters"].keys()))
+        object.__setattr__(self, "variables", list(data["variables"].keys()))
+
+        for key in ["vt_symbol", "vt_symbols"]:
+            if key in data:
+                object.__setattr__(self, key, data[key])
+
+        self.update_state(state, True)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        """"""
+        object.__setattr__(self, name, value)
+
+        if name in self.parameters or name in self.variables:
+            self.host.send(("set", self.strategy_name, name, value))
+
+    def __getattr__(self, name: str) -> Callable:
+        """
+        Only called for attributes not found, return function for
+        forwarding strategy callback.
+        """
+        if name.startswith("_"):
+            raise AttributeError(name)
+
+        def func(*args) -> None:
+            self.host.call_strategy(self.strategy_name, name, args)
+
+        return func
+
+    def update_state(self, state: dict, init: bool = False) -> None:
+        """
+        Update local copy of strategy data pushed from child process.
+
+        Variables owned by parent engine are only copied when proxy is
+        created, since pushes in flight may carry values already changed
+        by parent.
+        """
+        object.__setattr__(self, "data", state["data"])
+
+        if init:
+            owned = set()
+        else:
+            owned = set(self.host.manager.host_engine_class.parent_variables)
+
+        for d in [state["data"]["parameters"], state["data"]["variables"], state["attrs"]]:
+            for name, value in d.items():
+                if name not in owned:
+                    object.__setattr__(self, name, value)
+
+    def put_state(self, state: dict) -> None:
+        """
+        Keep state pushed from child process, which is applied later.
+        """
+        with self.state_lock:
+            object.__setattr__(self, "pending_state", state)
+
+    def apply_state(self) -> None:
+        """
+        Apply latest state pushed from child process if any.
+        """
+        with self.state_lock:
+            state = self.pending_state
+            if not state:
+                return
+
+            object.__setattr__(self, "pending_state", None)
+            self.update_state(state)
+
+    def update_setting(self, setting: dict) -> None:
+        """
+        Update strategy parameter wtih value in setting dict.
+        """
+        for name in self.parameters:
+            if name in setting:
+                object.__setattr__(self, name, setting[name])
+
+        self.host.call_strategy(self.strategy_name, "update_setting", (setting,))
+
+    def on_tick(self, tick: TickData) -> None:
+        """
+        Ticks are passed to child process through ring buffer.
+        """
+        pass
+
+    def get_parameters(self) -> dict:
+        """"""
+        return {name: getattr(self, name) for name in self.parameters}
+
+    def get_variables(self) -> dict:
+        """"""
+        return {name: getattr(self, name) for name in self.variables}
+
+    def get_data(self) -> dict:
+        """"""
+        data = copy(self.data)
+        data["parameters"] = self.get_parameters()
+        data["variables"] = self.get_variables()
+        return data
+
+
+class StrategyHost:
+    """
+    Parent side of a child process hosting strategies.
+    """
+
+    def __init__(
+        self,
+        manager: "StrategyHostManager",
+        name: str,
+        buffer: TickRingBuffer
+    ):
+        """"""
+        self.manager: StrategyHostManager = manager
+        self.engine: Any = manager.engine
+        self.name: str = name
+
+        self.proxies: Dict[str, StrategyProxy] = {}
+
+        self.call_count: int = 0
+        self.call_events: Dict[int, ThreadEvent] = {}
+        self.call_results: Dict[int, tuple] = {}
+
+        context = get_context("spawn")
+        self.conn, self.child_conn = context.Pipe()
+
+        self.process = context.Process(
+            target=run_strategy_host,
+            args=(
+                manager.host_engine_class,
+                self.child_conn,
+                buffer.name,
+                os.getcwd()
+            ),
+            daemon=True
+        )
+
+        self.executor: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=1)
+
+        self.send_queue: Queue = Queue()
+        self.send_thread: Thread = Thread(target=self.run_send, daemon=True)
+        self.recv_thread: Thread = Thread(target=self.run_recv, daemon=True)
+
+    def start(self) -> None:
+        """"""
+        self.process.start()
+
+        # Close child end in parent, so that exit of child can be detected
+        self.child_conn.close()
+
+        self.send_thread.start()
+        self.recv_thread.start()
+
+    def close(self) -> None:
+        """"""
+        self.send(("close",))
+        self.send(None)
+
+        self.process.join(5)
+        if self.process.is_alive():
+            self.process.terminate()
+
+        self.send_thread.join()
+        self.recv_thread.join()
+        self.executor.shutdown(wait=False)
+
+    def send(self, msg: tuple) -> None:
+        """
+        Send message to child process without blocking caller thread.
+        """
+        self.send_queue.put(msg)
+
+    def run_send(self) -> None:
+        """"""
+        while True:
+            msg = self.send_queue.get()
+            if msg is None:
+                return
+
+            try:
+                self.conn.send(msg)
+            except (OSError, ValueError):
+                return
+
+    def run_recv(self) -> None:
+        """"""
+        while True:
+            try:
+                msg = self.conn.recv()
+            except (EOFError, OSError):
+                break
+
+            try:
+                self.process_message(msg)
+            except Exception:
+                msg = f"策略进程{self.name}消息处理异常：\n{traceback.format_exc()}"
+                self.engine.write_log(msg)
+
+        # Release callers still waiting for child process
+        for call_id, event in list(self.call_events.items()):
+            self.call_results[call_id] = (None, f"策略进程{self.name}已退出")
+            event.set()
+
+    def process_message(self, msg: tuple) -> None:
+        """"""
+        type = msg[0]
+
+        # Engine functions are called in event engine thread, in the same
+        # thread as order and trade events of the requests sent.
+        if type == "request":
+            func_name = msg[2]
+
+            if func_name in THREAD_FUNCS:
+                self.executor.submit(self.process_request, *msg[1:])
+            else:
+                self.put_event(self.process_request, msg[1:])
+        elif type == "data":
+            strategy_name, state, func_name = msg[1:]
+
+            proxy = self.proxies.get(strategy_name, None)
+            if not proxy:
+                return
+
+            proxy.put_state(state)
+            self.put_event(self.process_data, (proxy, func_name))
+        elif type == "reply":
+            call_id, result, error = msg[1:]
+
+            event = self.call_events.get(call_id, None)
+            if event:
+                self.call_results[call_id] = (result, error)
+                event.set()
+
+    def put_event(self, func: Callable, args: tuple) -> None:
+        """
+        Call func with args in event engine thread, or directly if event
+        engine is already stopped (e.g. on_stop called when closing).
+        """
+        event_engine = self.engine.event_engine
+
+        if event_engine._active:
+            event = Event(EVENT_STRATEGY_HOST, (self, func, args))
+            event_engine.put(event)
+        else:
+            func(*args)
+
+    def process_data(self, proxy: StrategyProxy, func_name: str) -> None:
+        """
+        Apply strategy data pushed, and then call func_name of strategy
+        engine with the proxy.
+        """
+        proxy.apply_state()
+
+        if func_name:
+            getattr(self.engine, func_name)(proxy)
+
+    def process_request(
+        self,
+        request_id: int,
+        func_name: str,
+        args: tuple,
+        codec: str
+    ) -> None:
+        """
+        Call function of strategy engine requested by child process.
+        """
+        args = [
+            self.proxies[arg.strategy_name] if isinstance(arg, StrategyRef) else arg
+            for arg in args
+        ]
+
+        try:
+            result = getattr(self.engine, func_name)(*args)
+            if codec:
+                result = CODEC_PACKERS[codec](result)
+            error = ""
+        except Exception:
+            result = None
+            error = traceback.format_exc()
+
+        if request_id:
+            self.send(("reply", request_id, result, error))
+        elif error:
+            self.engine.write_log(f"策略进程{self.name}请求{func_name}失败：\n{error}")
+
+    def call(self, msg: tuple, wait: bool) -> Any:
+        """
+        Send a call to child process, and wait for result if required.
+        """
+        if not wait:
+            self.send(msg[:1] + (0,) + msg[1:])
+            return None
+
+        self.call_count += 1
+        call_id = self.call_count
+
+        event = ThreadEvent()
+        self.call_events[call_id] = event
+
+        self.send(msg[:1] + (call_id,) + msg[1:])
+        event.wait()
+
+        self.call_events.pop(call_id)
+        result, error = self.call_results.pop(call_id)
+
+        # Data pushed before reply should be seen by caller
+        for proxy in list(self.proxies.values()):
+            proxy.apply_state()
+
+        if error:
+            raise RuntimeError(error)
+        return result
+
+    def call_strategy(self, strategy_name: str, func_name: str, args: tuple) -> None:
+        """
+        Call strategy function in child process.
+        """
+        wait = func_name in SYNC_FUNCS
+        self.call(("call", strategy_name, func_name, args), wait)
+
+    def add_strategy(
+        self,
+        strategy_class: type,
+        strategy_name: str,
+        vt_symbols: List[str],
+        args: tuple
+    ) -> StrategyProxy:
+        """
+        Create strategy in child process and return its proxy.
+        """
+        msg = (
+            "add",
+            strategy_name,
+            strategy_class.__module__,
+            strategy_class.__name__,
+            vt_symbols,
+            args
+        )
+        state = self.call(msg, True)
+
+        # Create proxy class with the same name as strategy class
+        proxy_class = type(
+            strategy_class.__name__,
+            (StrategyProxy,),
+            {"author": strategy_class.author}
+        )
+        proxy = proxy_class(self, strategy_name, vt_symbols, state)
+        self.proxies[strategy_name] = proxy
+
+        return proxy
+
+    def remove_strategy(self, strategy_name: str) -> None:
+        """"""
+        self.proxies.pop(strategy_name)
+        self.call(("remove", strategy_name), True)
+
+
+class StrategyHostManager:
+    """
+    Manages child processes hosting strategies for a strategy engine.
+    """
+
+    def __init__(self, engine: Any, host_engine_class: Type["HostEngine"]):
+        """"""
+        self.engine: Any = engine
+        self.host_engine_class: Type[HostEngine] = host_engine_class
+
+        self.hosts: Dict[str, StrategyHost] = {}
+        self.buffer: TickRingBuffer = None
+        self.symbol_count: Dict[str, int] = defaultdict(int)
+
+        engine.event_engine.register(EVENT_STRATEGY_HOST, self.process_host_event)
+
+    def process_host_event(self, event: Event) -> None:
+        """"""
+        host, func, args = event.data
+
+        try:
+            func(*args)
+        except Exception:
+            msg = f"策略进程{host.name}消息处理异常：\n{traceback.format_exc()}"
+            self.engine.write_log(msg)
+
+    def add_strategy(
+        self,
+        process_group: str,
+        strategy_class: type,
+        strategy_name: str,
+        vt_symbols: List[str],
+        *args
+    ) -> StrategyProxy:
+        """
+        Add a new strategy into child process of process group.
+
+        args are passed to strategy class after strategy name.
+        """
+        if not self.buffer:
+            self.buffer = TickRingBuffer()
+
+        host = self.hosts.get(process_group, None)
+        if not host:
+            host = StrategyHost(self, process_group, self.buffer)
+            host.start()
+            self.hosts[process_group] = host
+
+        proxy = host.add_strategy(strategy_class, strategy_name, vt_symbols, args)
+
+        for vt_symbol in vt_symbols:
+            self.symbol_count[vt_symbol] += 1
+
+        return proxy
+
+    def remove_strategy(self, proxy: StrategyProxy) -> None:
+        """"""
+        proxy.host.remove_strategy(proxy.strategy_name)
+
+        for vt_symbol in proxy.hosted_symbols:
+            self.symbol_count[vt_symbol] -= 1
+            if not self.symbol_count[vt_symbol]:
+                self.symbol_count.pop(vt_symbol)
+
+    def put_tick(self, tick: TickData) -> None:
+        """
+        Write tick into ring buffer if any hosted strategy needs it.
+        """
+        if tick.vt_symbol in self.symbol_count:
+            self.buffer.put(tick)
+
+    def close(self) -> None:
+        """"""
+        for host in self.hosts.values():
+            host.close()
+
+        if self.buffer:
+            self.buffer.close()
+
+
+class HostEngine:
+    """
+    Child side of strategy host, which is used as strategy engine by
+    strategies running in child process.
+
+    Methods of parent strategy engine can be called by request, with
+    strategy arguments converted automatically.
+    """
+
+    # Strategy attributes pushed to proxy besides parameters and variables
+    extra_attrs: List[str] = []
+
+    # Variables changed by parent engine, which are not copied from pushes
+    parent_variables: List[str] = []
+
+    def __init__(self, conn: Connection, buffer: TickRingBuffer):
+        """"""
+        self.conn: Connection = conn
+        self.buffer: TickRingBuffer = buffer
+
+        self.active: bool = True
+        self.messages: deque = deque()
+        self.request_count: int = 0
+        self.lost_count: int = 0
+
+        self.strategies: Dict[str, Any] = {}
+        self.strategy_symbols: Dict[str, List[str]] = {}
+        self.symbol_strategy_map: Dict[str, list] = defaultdict(list)
+
+    def run(self) -> None:
+        """
+        Process messages from parent and ticks from ring buffer.
+        """
+        while self.active:
+            while self.messages:
+                self.process_message(self.messages.popleft())
+
+            while self.active and self.conn.poll():
+                self.process_message(self.conn.recv())
+
+            ticks = self.buffer.read()
+            for tick in ticks:
+                self.process_tick(tick)
+
+            if self.buffer.lost_count != self.lost_count:
+                self.lost_count = self.buffer.lost_count
+                self.write_log(f"行情处理过慢，已丢失{self.lost_count}个Tick")
+
+            # Wait a while if nothing to do
+            if not ticks:
+                self.conn.poll(0.001)
+
+        self.buffer.close()
+
+    def process_message(self, msg: tuple) -> None:
+        """"""
+        type = msg[0]
+
+        if type == "call":
+            call_id, strategy_name, func_name, args = msg[1:]
+
+            strategy = self.strategies[strategy_name]
+            self.call_strategy_func(strategy, getattr(strategy, func_name), *args)
+            self.push_strategy_data(strategy)
+
+            if call_id:
+                self.send(("reply", call_id, None, ""))
+        elif type == "set":
+            strategy_name, name, value = msg[1:]
+
+            strategy = self.strategies[strategy_name]
+            setattr(strategy, name, value)
+        elif type == "add":
+            self.process_add(*msg[1:])
+        elif type == "remove":
+            call_id, strategy_name = msg[1:]
+
+            strategy = self.strategies.pop(strategy_name)
+            for vt_symbol in self.strategy_symbols.pop(strategy_name):
+                self.symbol_strategy_map[vt_symbol].remove(strategy)
+            self.buffer.set_symbols(self.symbol_strategy_map.keys())
+
+            self.send(("reply", call_id, None, ""))
+        elif type == "close":
+            self.active = False
+
+    def process_add(
+        self,
+        call_id: int,
+        strategy_name: str,
+        module_name: str,
+        class_name: str,
+        vt_symbols: List[str],
+        args: tuple
+    ) -> None:
+        """"""
+        try:
+            module = importlib.import_module(module_name)
+            strategy_class = getattr(module, class_name)
+            strategy = strategy_class(self, strategy_name, *args)
+        except Exception:
+            self.send(("reply", call_id, None, traceback.format_exc()))
+            return
+
+        self.strategies[strategy_name] = strategy
+        self.strategy_symbols[strategy_name] = vt_symbols
+
+        for vt_symbol in vt_symbols:
+            self.symbol_strategy_map[vt_symbol].append(strategy)
+        self.buffer.set_symbols(self.symbol_strategy_map.keys())
+
+        self.send(("reply", call_id, self.get_strategy_state(strategy), ""))
+
+    def process_tick(self, tick: TickData) -> None:
+        """"""
+        for strategy in self.symbol_strategy_map[tick.vt_symbol]:
+            if strategy.inited:
+                self.call_strategy_func(strategy, strategy.on_tick, tick)
+
+    def send(self, msg: tuple) -> None:
+        """"""
+        self.conn.send(msg)
+
+    def convert_args(self, args: tuple) -> tuple:
+        """
+        Replace strategy objects with references.
+        """
+        converted = []
+
+        for arg in args:
+            strategy_name = getattr(arg, "strategy_name", None)
+            if strategy_name and self.strategies.get(strategy_name, None) is arg:
+                arg = StrategyRef(strategy_name)
+            converted.append(arg)
+
+        return tuple(converted)
+
+    def request(self, func_name: str, *args, codec: str = "") -> Any:
+        """
+        Call function of parent strategy engine and wait for result.
+        """
+        self.request_count += 1
+        request_id = self.request_count
+
+        self.send(("request", request_id, func_name, self.convert_args(args), codec))
+
+        # Keep other messages to be processed later
+        while True:
+            msg = self.conn.recv()
+            if msg[0] == "reply" and msg[1] == request_id:
+                break
+            self.messages.append(msg)
+
+        _, _, result, error = msg
+
+        if error:
+            raise RuntimeError(error)
+
+        if codec:
+            result = CODEC_UNPACKERS[codec](result)
+        return result
+
+    def send_request(self, func_name: str, *args) -> None:
+        """
+        Call function of parent strategy engine without waiting.
+        """
+        self.send(("request", 0, func_name, self.convert_args(args), ""))
+
+    def get_strategy_state(self, strategy: Any) -> dict:
+        """"""
+        return {
+            "data": strategy.get_data(),
+            "attrs": {name: getattr(strategy, name) for name in self.extra_attrs}
+        }
+
+    def push_strategy_data(self, strategy: Any, func_name: str = "") -> None:
+        """
+        Push strategy data to proxy, and then call func_name of parent
+        strategy engine with the proxy.
+        """
+        state = self.get_strategy_state(strategy)
+        self.send(("data", strategy.strategy_name, state, func_name))
+
+    def call_strategy_func(
+        self, strategy: Any, func: Callable, params: Any = None
+    ) -> None:
+        """
+        Call function of a strategy and catch any exception raised.
+        """
+        try:
+            if params:
+                func(params)
+            else:
+                func()
+        except Exception:
+            strategy.trading = False
+            strategy.inited = False
+
+            msg = f"触发异常已停止\n{traceback.format_exc()}"
+            self.write_log(msg, strategy)
+            self.push_strategy_data(strategy)
+
+    def write_log(self, msg: str, strategy: Any = None) -> None:
+        """"""
+        self.send_request("write_log", msg, strategy)
+
+    def send_email(self, msg: str, strategy: Any = None) -> None:
+        """"""
+        self.send_request("send_email", msg, strategy)
+
+    def put_strategy_event(self, strategy: Any) -> None:
+        """"""
+        self.push_strategy_data(strategy, "put_strategy_event")
+
+    def sync_strategy_data(self, strategy: Any) -> None:
+        """"""
+        self.push_strategy_data(strategy, "sync_strategy_data")
+
+
+def run_strategy_host(
+    engine_class: Type[HostEngine],
+    conn: Connection,
+    buffer_name: str,
+    cwd: str
+) -> None:
+    """
+    Entry function of child process.
+    """
+    # Make strategies folder under working directory importable
+    os.chdir(cwd)
+    if cwd not in sys.path:
+        sys.path.append(cwd)
+
+    buffer = TickRingBuffer(buffer_name)
+    engine = engine_class(conn, buffer)
+    engine.run()
@@ -0,0 +1,335 @@
+"""
+Streaming technical indicators updated in O(1) time for each new value.
+
+Values are the same as TA-Lib functions calculated over the full history
+of input data. Note that ArrayManager calculates over a fixed size window,
+so indicators with recursive smoothing (EMA, ATR, RSI, MACD) may differ
+slightly from ArrayManager until the effect of older data fades out.
+"""
+
+from collections import deque
+from math import nan, sqrt
+from typing import Deque, Tuple
+
+
+class SmaIndicator:
+    """
+    Simple moving average.
+    """
+
+    def __init__(self, n: int):
+        """"""
+        self.n: int = n
+        self.values: Deque[float] = deque()
+        self.total: float = 0
+
+        self.value: float = nan
+        self.inited: bool = False
+
+    def update(self, value: float) -> float:
+        """"""
+        self.values.append(value)
+        self.total += value
+
+        if len(self.values) > self.n:
+            self.total -= self.values.popleft()
+
+        if len(self.values) == self.n:
+            self.value = self.total / self.n
+            self.inited = True
+
+        return self.value
+
+
+class EmaIndicator:
+    """
+    Exponential moving average, seeded with SMA of the first n values.
+    """
+
+    def __init__(self, n: int):
+        """"""
+        self.n: int = n
+        self.k: float = 2 / (n + 1)
+        self.sma: SmaIndicator = SmaIndicator(n)
+
+        self.value: float = nan
+        self.inited: bool = False
+
+    def update(self, value: float) -> float:
+        """"""
+        if self.inited:
+            self.value += (value - self.value) * self.k
+        else:
+            self.value = self.sma.update(value)
+            self.inited = self.sma.inited
+
+        return self.value
+
+
+class WilderIndicator:
+    """
+    Wilder smoothing, seeded with average of the first n values.
+    """
+
+    def __init__(self, n: int):
+        """"""
+        self.n: int = n
+        self.count: int = 0
+
+        self.value: float = 0
+        self.inited: bool = False
+
+    def update(self, value: float) -> float:
+        """"""
+        if self.inited:
+            self.value = (self.value * (self.n - 1) + value) / self.n
+        else:
+            self.count += 1
+            self.value += value
+
+            if self.count == self.n:
+                self.value /= self.n
+                self.inited = True
+
+        return self.value
+
+
+class AtrIndicator:
+    """
+    Average true range.
+    """
+
+    def __init__(self, n: int):
+        """"""
+        self.wilder: WilderIndicator = WilderIndicator(n)
+        self.pre_close: float = nan
+
+        self.value: float = nan
+        self.inited: bool = False
+
+    def update(self, high: float, low: float, close: float) -> float:
+        """"""
+        # True range is available since the second value
+        if self.pre_close == self.pre_close:
+            tr = max(high, self.pre_close) - min(low, self.pre_close)
+            atr = self.wilder.update(tr)
+
+            if self.wilder.inited:
+                self.value = atr
+                self.inited = True
+
+        self.pre_close = close
+        return self.value
+
+
+class RsiIndicator:
+    """
+    Relative strength index.
+    """
+
+    def __init__(self, n: int):
+        """"""
+        self.gain: WilderIndicator = WilderIndicator(n)
+        self.loss: WilderIndicator = WilderIndicator(n)
+        self.pre_value: float = nan
+
+        self.value: float = nan
+        self.inited: bool = False
+
+    def update(self, value: float) -> float:
+        """"""
+        if self.pre_value == self.pre_value:
+            change = value - self.pre_value
+            gain = self.gain.update(max(change, 0))
+            loss = self.loss.update(max(-change, 0))
+
+            if self.gain.inited:
+                total = gain + loss
+                self.value = 100 * gain / total if total else 0
+                self.inited = True
+
+        self.pre_value = value
+        return self.value
+
+
+class BollIndicator:
+    """
+    Bollinger channel.
+
+    Mean and sum of squared deviations are updated with Welford's method,
+    and recalculated from window values every n updates so that rounding
+    error does not accumulate over long history.
+    """
+
+    def __init__(self, n: int, dev: float):
+        """"""
+        self.n: int = n
+        self.dev: float = dev
+
+        self.values: Deque[float] = deque()
+        self.count: int = 0
+        self.mean: float = 0
+        self.m2: float = 0
+
+        self.up: float = nan
+        self.down: float = nan
+        self.inited: bool = False
+
+    def update(self, value: float) -> Tuple[float, float]:
+        """"""
+        self.values.append(value)
+        self.count += 1
+        mean = self.mean
+
+        if len(self.values) > self.n:
+            old = self.values.popleft()
+
+            if self.count % self.n:
+                self.mean += (value - old) / self.n
+                self.m2 += (value - old) * (value - self.mean + old - mean)
+            else:
+                self.mean = sum(self.values) / self.n
+                self.m2 = sum((v - self.mean) ** 2 for v in self.values)
+        else:
+            self.mean += (value - mean) / len(self.values)
+            self.m2 += (value - mean) * (value - self.mean)
+
+        if len(self.values) == self.n:
+            var = self.m2 / self.n
+            std = sqrt(var) if var > 0 else 0
+
+            self.up = self.mean + std * self.dev
+            self.down = self.mean - std * self.dev
+            self.inited = True
+
+        return self.up, self.down
+
+
+class KeltnerIndicator:
+    """
+    Keltner channel.
+    """
+
+    def __init__(self, n: int, dev: float):
+        """"""
+        self.dev: float = dev
+        self.sma: SmaIndicator = SmaIndicator(n)
+        self.atr: AtrIndicator = AtrIndicator(n)
+
+        self.up: float = nan
+        self.down: float = nan
+        self.inited: bool = False
+
+    def update(self, high: float, low: float, close: float) -> Tuple[float, float]:
+        """"""
+        mid = self.sma.update(close)
+        atr = self.atr.update(high, low, close)
+
+        if self.sma.inited and self.atr.inited:
+            self.up = mid + atr * self.dev
+            self.down = mid - atr * self.dev
+            self.inited = True
+
+        return self.up, self.down
+
+
+class DonchianIndicator:
+    """
+    Donchian channel.
+
+    Monotonic queues of (index, value) keep candidates of highest high
+    and lowest low, so each value is pushed and popped at most once.
+    """
+
+    def __init__(self, n: int):
+        """"""
+        self.n: int = n
+        self.count: int = 0
+
+        self.highs: Deque[Tuple[int, float]] = deque()
+        self.lows: Deque[Tuple[int, float]] = deque()
+
+        self.up: float = nan
+        self.down: float = nan
+        self.inited: bool = False
+
+    def update(self, high: float, low: float) -> Tuple[float, float]:
+        """"""
+        ix = self.count
+        self.count += 1
+
+        while self.highs and self.highs[-1][1] <= high:
+            self.highs.pop()
+        self.highs.append((ix, high))
+
+        while self.lows and self.lows[-1][1] >= low:
+            self.lows.pop()
+        self.lows.append((ix, low))
+
+        # Remove values out of window
+        if self.highs[0][0] <= ix - self.n:
+            self.highs.popleft()
+        if self.lows[0][0] <= ix - self.n:
+            self.lows.popleft()
+
+        if self.count >= self.n:
+            self.up = self.highs[0][1]
+            self.down = self.lows[0][1]
+            self.inited = True
+
+        return self.up, self.down
+
+
+class MacdIndicator:
+    """
+    MACD.
+
+    Same as TA-Lib, the fast EMA is seeded with values ending at the
+    first value of the slow EMA.
+    """
+
+    def __init__(self, fast_period: int, slow_period: int, signal_period: int):
+        """"""
+        # TA-Lib swaps periods if fast is greater than slow
+        if slow_period < fast_period:
+            fast_period, slow_period = slow_period, fast_period
+
+        self.fast_period: int = fast_period
+        self.slow_period: int = slow_period
+        self.count: int = 0
+
+        self.fast_values: Deque[float] = deque(maxlen=fast_period - 1)
+        self.fast: EmaIndicator = EmaIndicator(fast_period)
+        self.slow: EmaIndicator = EmaIndicator(slow_period)
+        self.signal_ema: EmaIndicator = EmaIndicator(signal_period)
+
+        self.macd: float = nan
+        self.signal: float = nan
+        self.hist: float = nan
+        self.inited: bool = False
+
+    def update(self, value: float) -> Tuple[float, float, float]:
+        """"""
+        self.count += 1
+
+        slow = self.slow.update(value)
+
+        if self.count < self.slow_period:
+            self.fast_values.append(value)
+            return self.macd, self.signal, self.hist
+
+        if self.count == self.slow_period:
+            for v in self.fast_values:
+                self.fast.update(v)
+        fast = self.fast.update(value)
+
+        macd = fast - slow
+        signal = self.signal_ema.update(macd)
+
+        if self.signal_ema.inited:
+            self.macd = macd
+            self.signal = signal
+            self.hist = macd - signal
+            self.inited = True
+
+        return self.macd, self.signal, self.hist
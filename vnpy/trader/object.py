@@ -2,14 +2,33 @@
 Basic data structure used for general trading function in VN Trader.
 """
 
-from dataclasses import dataclass
+import sys
+from abc import ABCMeta
+from dataclasses import dataclass, field, fields, make_dataclass, MISSING
 from datetime import datetime
 from logging import INFO
+from typing import Dict, Tuple
 
 from .constant import Direction, Exchange, Interval, Offset, Status, Product, OptionType, OrderType
 
 ACTIVE_STATUSES = set([Status.SUBMITTING, Status.NOTTRADED, Status.PARTTRADED])
 
+VT_SYMBOLS: Dict[Tuple[str, Exchange], str] = {}
+
+
+def get_vt_symbol(symbol: str, exchange: Exchange) -> str:
+    """
+    Get interned vt_symbol string, so that market data objects of the
+    same contract share one string object.
+    """
+    vt_symbol = VT_SYMBOLS.get((symbol, exchange), None)
+
+    if not vt_symbol:
+        vt_symbol = sys.intern(f"{symbol}.{exchange.value}")
+        VT_SYMBOLS[(symbol, exchange)] = vt_symbol
+
+    return vt_symbol
+
 
 @dataclass
 class BaseData:
@@ -22,7 +41,7 @@ class BaseData:
 
 
 @dataclass
-class TickData(BaseData):
+class TickData(BaseData, metaclass=ABCMeta):
     """
     Tick data contains information about:
         * last trade in market
@@ -73,11 +92,11 @@ class TickData(BaseData):
 
     def __post_init__(self):
         """"""
-        self.vt_symbol = f"{self.symbol}.{self.exchange.value}"
+        self.vt_symbol = get_vt_symbol(self.symbol, self.exchange)
 
 
 @dataclass
-class BarData(BaseData):
+class BarData(BaseData, metaclass=ABCMeta):
     """
     Candlestick bar data of a certain trading period.
     """
@@ -96,7 +115,7 @@ class BarData(BaseData):
 
     def __post_init__(self):
         """"""
-        self.vt_symbol = f"{self.symbol}.{self.exchange.value}"
+        self.vt_symbol = get_vt_symbol(self.symbol, self.exchange)
 
 
 @dataclass
@@ -335,3 +354,51 @@ class HistoryRequest:
     def __post_init__(self):
         """"""
         self.vt_symbol = f"{self.symbol}.{self.exchange.value}"
+
+
+def create_slots_class(cls: ABCMeta, name: str, extra_slots: Tuple[str] = ()) -> type:
+    """
+    Create a dataclass with the same fields and __post_init__ as cls,
+    but using __slots__ instead of per-instance __dict__ for saving
+    memory and attribute access time.
+
+    The new class is registered as virtual subclass of cls, so that
+    isinstance checks against cls still hold.
+
+    Attributes assigned in __post_init__ should be listed in extra_slots.
+    """
+    field_list = []
+
+    for f in fields(cls):
+        if f.default is MISSING:
+            field_list.append((f.name, f.type))
+        else:
+            field_list.append((f.name, f.type, field(default=f.default)))
+
+    data_class = make_dataclass(
+        name,
+        field_list,
+        namespace={"__post_init__": cls.__post_init__}
+    )
+
+    # Recreate class with __slots__, field defaults should be removed
+    # from class attributes since they are already stored in __init__.
+    field_names = [f.name for f in fields(data_class)]
+
+    class_dict = dict(data_class.__dict__)
+    class_dict["__slots__"] = tuple(field_names) + tuple(extra_slots)
+    class_dict["__module__"] = cls.__module__
+    class_dict["__qualname__"] = name
+    class_dict["__doc__"] = f"Slotted version of {cls.__name__}, which is API compatible with it."
+
+    for field_name in field_names + ["__dict__", "__weakref__"]:
+        class_dict.pop(field_name, None)
+
+    slots_class = type(data_class)(data_class.__name__, data_class.__bases__, class_dict)
+    cls.register(slots_class)
+
+    return slots_class
+
+
+SlotTickData = create_slots_class(TickData, "SlotTickData", ("vt_symbol",))
+SlotBarData = create_slots_class(BarData, "SlotBarData", ("vt_symbol",))
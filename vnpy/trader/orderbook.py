@@ -0,0 +1,225 @@
+"""
+Local order book maintained with depth diff updates from exchanges.
+"""
+
+from bisect import bisect_left, insort
+from copy import copy
+from datetime import datetime
+from threading import Lock
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+from .object import TickData
+
+
+LEVEL_TYPE = Sequence[Sequence[Any]]        # [[price, volume], ...]
+DEPTH = 5                                   # Levels provided by TickData
+
+BID_PRICE_NAMES = [f"bid_price_{i}" for i in range(1, DEPTH + 1)]
+BID_VOLUME_NAMES = [f"bid_volume_{i}" for i in range(1, DEPTH + 1)]
+ASK_PRICE_NAMES = [f"ask_price_{i}" for i in range(1, DEPTH + 1)]
+ASK_VOLUME_NAMES = [f"ask_volume_{i}" for i in range(1, DEPTH + 1)]
+
+
+class OrderBook:
+    """
+    Order book of one symbol.
+
+    Price levels of each side are kept in a sorted price list plus a dict
+    of price to volume. Each diff carries its sequence and the sequence of
+    the previous diff. A diff is applied only if it continues from the
+    current sequence, otherwise the book is marked as not synced, diffs
+    are cached and query_snapshot is called to resync from snapshot.
+
+    on_tick is called with a copy of tick only when top 5 levels changed.
+    Other fields of tick should be updated with update_tick.
+    query_snapshot is called with lock held, so it should only send the
+    query and call update_snapshot later from another thread.
+    """
+
+    def __init__(
+        self,
+        tick: TickData,
+        on_tick: Callable[[TickData], Any],
+        query_snapshot: Callable[[], Any]
+    ):
+        """"""
+        self.tick: TickData = tick
+        self.on_tick: Callable[[TickData], Any] = on_tick
+        self.query_snapshot: Callable[[], Any] = query_snapshot
+
+        self.bid_prices: List[float] = []       # Ascending, best bid at end
+        self.ask_prices: List[float] = []       # Ascending, best ask at start
+        self.bid_volumes: Dict[float, float] = {}
+        self.ask_volumes: Dict[float, float] = {}
+
+        self.sequence: int = 0
+        self.synced: bool = False
+        self.querying: bool = False
+        self.buf: List[Tuple[LEVEL_TYPE, LEVEL_TYPE, int, int, datetime]] = []
+
+        self.top: tuple = ()
+        self.lock: Lock = Lock()
+
+        self.gap_count: int = 0
+
+    def reset(self) -> None:
+        """
+        Clear cached diffs, and query snapshot again when next diff arrives.
+        Should be called after reconnected or snapshot query failed.
+        """
+        with self.lock:
+            self.synced = False
+            self.querying = False
+            self.buf.clear()
+
+    def update_snapshot(
+        self,
+        bids: LEVEL_TYPE,
+        asks: LEVEL_TYPE,
+        sequence: int,
+        dt: datetime = None
+    ) -> None:
+        """
+        Rebuild order book from snapshot, then apply cached diffs.
+        """
+        with self.lock:
+            # Snapshot queried before last resync may arrive late
+            if self.synced and sequence < self.sequence:
+                return
+
+            self.bid_prices.clear()
+            self.ask_prices.clear()
+            self.bid_volumes.clear()
+            self.ask_volumes.clear()
+
+            update_levels(self.bid_prices, self.bid_volumes, bids)
+            update_levels(self.ask_prices, self.ask_volumes, asks)
+
+            self.sequence = sequence
+            self.synced = True
+            self.querying = False
+
+            if dt:
+                self.tick.datetime = dt
+
+            buf = self.buf
+            self.buf = []
+
+            for i, diff in enumerate(buf):
+                if not self._apply_diff(*diff):
+                    self.buf.extend(buf[i + 1:])
+                    break
+
+            if self.synced:
+                self._check_top()
+
+    def update_diff(
+        self,
+        bids: LEVEL_TYPE,
+        asks: LEVEL_TYPE,
+        sequence: int,
+        prev_sequence: int,
+        dt: datetime
+    ) -> None:
+        """
+        Apply diff of price levels, levels with zero volume are removed.
+        """
+        with self.lock:
+            if not self.synced:
+                self.buf.append((bids, asks, sequence, prev_sequence, dt))
+
+                if not self.querying:
+                    self.querying = True
+                    self.query_snapshot()
+                return
+
+            if self._apply_diff(bids, asks, sequence, prev_sequence, dt):
+                self._check_top()
+
+    def update_tick(self, **kwargs: Any) -> TickData:
+        """
+        Update tick fields not maintained by order book, and return a copy
+        of tick. Lock is held since tick is also updated by diffs and
+        snapshots from other threads.
+        """
+        with self.lock:
+            tick = self.tick
+            for name, value in kwargs.items():
+                setattr(tick, name, value)
+            return copy(tick)
+
+    def _apply_diff(
+        self,
+        bids: LEVEL_TYPE,
+        asks: LEVEL_TYPE,
+        sequence: int,
+        prev_sequence: int,
+        dt: datetime
+    ) -> bool:
+        """
+        Return False if the diff is not continuous with current sequence.
+        """
+        # Diff already included in order book
+        if sequence <= self.sequence:
+            return True
+
+        # Some diffs are missed, resync from snapshot
+        if prev_sequence > self.sequence:
+            self.gap_count += 1
+            self.synced = False
+            self.querying = True
+            self.buf = [(bids, asks, sequence, prev_sequence, dt)]
+            self.query_snapshot()
+            return False
+
+        update_levels(self.bid_prices, self.bid_volumes, bids)
+        update_levels(self.ask_prices, self.ask_volumes, asks)
+
+        self.sequence = sequence
+        self.tick.datetime = dt
+        return True
+
+    def _check_top(self) -> None:
+        """
+        Update tick and push it if top levels changed.
+        """
+        bid_prices = self.bid_prices[:-DEPTH - 1:-1]
+        ask_prices = self.ask_prices[:DEPTH]
+        bid_volumes = [self.bid_volumes[price] for price in bid_prices]
+        ask_volumes = [self.ask_volumes[price] for price in ask_prices]
+
+        top = (bid_prices, bid_volumes, ask_prices, ask_volumes)
+        if top == self.top:
+            return
+        self.top = top
+
+        tick = self.tick
+        for names, values in zip(
+            (BID_PRICE_NAMES, BID_VOLUME_NAMES, ASK_PRICE_NAMES, ASK_VOLUME_NAMES),
+            top
+        ):
+            for i, name in enumerate(names):
+                setattr(tick, name, values[i] if i < len(values) else 0)
+
+        self.on_tick(copy(tick))
+
+
+def update_levels(
+    prices: List[float],
+    volumes: Dict[float, float],
+    levels: LEVEL_TYPE
+) -> None:
+    """
+    Update sorted prices and volumes of one side with levels.
+    """
+    for price, volume in levels:
+        price = float(price)
+        volume = float(volume)
+
+        if volume:
+            if price not in volumes:
+                insort(prices, price)
+            volumes[price] = volume
+        elif price in volumes:
+            del volumes[price]
+            prices.pop(bisect_left(prices, price))
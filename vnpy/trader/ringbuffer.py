@@ -0,0 +1,322 @@
+"""
+Shared memory ring buffer and fixed layout records for passing
+market data between processes without pickling.
+"""
+
+from datetime import datetime, timedelta, timezone
+from struct import Struct
+from typing import Dict, List, Iterable, Optional, Set, Tuple
+
+from pytz import timezone as pytz_timezone
+
+from .constant import Exchange, Interval
+from .object import TickData, BarData
+from .columnar import BAR_FIELDS, TICK_FIELDS
+
+
+EPOCH = datetime(1970, 1, 1)
+NAIVE_OFFSET = 10 ** 8          # utc offset value for naive datetime
+
+# symbol, exchange, gateway_name, micros, utc offset, zone, (name/interval), fields
+TICK_STRUCT = Struct("<32s16s16sqi32s32s" + "d" * len(TICK_FIELDS))
+BAR_STRUCT = Struct("<32s16s16sqi32s8s" + "d" * len(BAR_FIELDS))
+HEADER_STRUCT = Struct("<QQ")   # write count, capacity
+
+tzinfo_cache: Dict[Tuple[str, int], object] = {}
+
+
+def encode_datetime(dt: datetime) -> Tuple[int, int, bytes]:
+    """
+    Convert datetime into wall clock microseconds, utc offset and zone name.
+    """
+    naive = dt.replace(tzinfo=None)
+    delta = naive - EPOCH
+    micros = (delta.days * 86400 + delta.seconds) * 1000000 + delta.microseconds
+
+    if not dt.tzinfo:
+        return micros, NAIVE_OFFSET, b""
+
+    offset = int(dt.utcoffset().total_seconds())
+    zone = getattr(dt.tzinfo, "zone", "")
+    return micros, offset, zone.encode()
+
+
+def decode_datetime(micros: int, offset: int, zone: bytes) -> datetime:
+    """
+    Convert wall clock microseconds, utc offset and zone name into datetime.
+    """
+    naive = EPOCH + timedelta(microseconds=micros)
+
+    if offset == NAIVE_OFFSET:
+        return naive
+
+    key = (zone, offset)
+    tzinfo = tzinfo_cache.get(key, None)
+
+    if not tzinfo:
+        zone_name = zone.rstrip(b"\x00").decode()
+        if zone_name:
+            tzinfo = pytz_timezone(zone_name).localize(naive).tzinfo
+        else:
+            tzinfo = timezone(timedelta(seconds=offset))
+        tzinfo_cache[key] = tzinfo
+
+    return naive.replace(tzinfo=tzinfo)
+
+
+def decode_str(value: bytes) -> str:
+    """"""
+    return value.rstrip(b"\x00").decode(errors="ignore")
+
+
+def pack_tick_into(buffer, offset: int, tick: TickData) -> None:
+    """
+    Write tick data into buffer with fixed layout.
+    """
+    micros, utc_offset, zone = encode_datetime(tick.datetime)
+
+    TICK_STRUCT.pack_into(
+        buffer,
+        offset,
+        tick.symbol.encode(),
+        tick.exchange.value.encode(),
+        tick.gateway_name.encode(),
+        micros,
+        utc_offset,
+        zone,
+        tick.name.encode()[:32],
+        *[getattr(tick, name) for name in TICK_FIELDS]
+    )
+
+
+def unpack_tick_from(buffer, offset: int) -> TickData:
+    """
+    Read tick data from buffer with fixed layout.
+    """
+    values = TICK_STRUCT.unpack_from(buffer, offset)
+
+    tick = TickData(
+        symbol=decode_str(values[0]),
+        exchange=Exchange(decode_str(values[1])),
+        gateway_name=decode_str(values[2]),
+        datetime=decode_datetime(values[3], values[4], values[5]),
+        name=decode_str(values[6])
+    )
+
+    for name, value in zip(TICK_FIELDS, values[7:]):
+        setattr(tick, name, value)
+
+    return tick
+
+
+def pack_bar_into(buffer, offset: int, bar: BarData) -> None:
+    """
+    Write bar data into buffer with fixed layout.
+    """
+    micros, utc_offset, zone = encode_datetime(bar.datetime)
+
+    if bar.interval:
+        interval = bar.interval.value.encode()
+    else:
+        interval = b""
+
+    BAR_STRUCT.pack_into(
+        buffer,
+        offset,
+        bar.symbol.encode(),
+        bar.exchange.value.encode(),
+        bar.gateway_name.encode(),
+        micros,
+        utc_offset,
+        zone,
+        interval,
+        *[getattr(bar, name) for name in BAR_FIELDS]
+    )
+
+
+def unpack_bar_from(buffer, offset: int) -> BarData:
+    """
+    Read bar data from buffer with fixed layout.
+    """
+    values = BAR_STRUCT.unpack_from(buffer, offset)
+
+    interval = decode_str(values[6])
+    if interval:
+        interval = Interval(interval)
+    else:
+        interval = None
+
+    bar = BarData(
+        symbol=decode_str(values[0]),
+        exchange=Exchange(decode_str(values[1])),
+        gateway_name=decode_str(values[2]),
+        datetime=decode_datetime(values[3], values[4], values[5]),
+        interval=interval
+    )
+
+    for name, value in zip(BAR_FIELDS, values[7:]):
+        setattr(bar, name, value)
+
+    return bar
+
+
+def pack_ticks(ticks: Iterable[TickData]) -> bytes:
+    """
+    Pack list of tick data into bytes.
+    """
+    ticks = list(ticks)
+    buffer = bytearray(TICK_STRUCT.size * len(ticks))
+
+    for ix, tick in enumerate(ticks):
+        pack_tick_into(buffer, ix * TICK_STRUCT.size, tick)
+
+    return bytes(buffer)
+
+
+def unpack_ticks(data: bytes) -> List[TickData]:
+    """
+    Unpack bytes into list of tick data.
+    """
+    return [
+        unpack_tick_from(data, offset)
+        for offset in range(0, len(data), TICK_STRUCT.size)
+    ]
+
+
+def pack_bars(bars: Iterable[BarData]) -> bytes:
+    """
+    Pack list of bar data into bytes.
+    """
+    bars = list(bars)
+    buffer = bytearray(BAR_STRUCT.size * len(bars))
+
+    for ix, bar in enumerate(bars):
+        pack_bar_into(buffer, ix * BAR_STRUCT.size, bar)
+
+    return bytes(buffer)
+
+
+def unpack_bars(data: bytes) -> List[BarData]:
+    """
+    Unpack bytes into list of bar data.
+    """
+    return [
+        unpack_bar_from(data, offset)
+        for offset in range(0, len(data), BAR_STRUCT.size)
+    ]
+
+
+class TickRingBuffer:
+    """
+    Single writer, multiple reader ring buffer of tick data records
+    stored in shared memory.
+
+    Each reader keeps its own read position, so a buffer object
+    should be created in every process which reads from it. A reader
+    falling behind more than capacity records loses the oldest ones.
+    """
+
+    def __init__(self, name: str = "", capacity: int = 50000):
+        """
+        Create a new shared memory block if name is not specified,
+        otherwise attach to an existing one.
+        """
+        # shared_memory is only available since Python 3.8
+        from multiprocessing.shared_memory import SharedMemory
+
+        if name:
+            self.shm = SharedMemory(name=name)
+            _, self.capacity = HEADER_STRUCT.unpack_from(self.shm.buf, 0)
+            self.owner: bool = False
+        else:
+            size = HEADER_STRUCT.size + TICK_STRUCT.size * capacity
+            self.shm = SharedMemory(create=True, size=size)
+            self.capacity = capacity
+            self.owner = True
+
+            HEADER_STRUCT.pack_into(self.shm.buf, 0, 0, capacity)
+
+        self.name: str = self.shm.name
+        self.buf: memoryview = self.shm.buf
+
+        self.read_count: int = self.get_write_count()
+        self.lost_count: int = 0
+        self.symbols: Optional[Set[Tuple[bytes, bytes]]] = None
+
+    def get_write_count(self) -> int:
+        """
+        Get total number of records written.
+        """
+        return HEADER_STRUCT.unpack_from(self.buf, 0)[0]
+
+    def get_offset(self, count: int) -> int:
+        """"""
+        return HEADER_STRUCT.size + (count % self.capacity) * TICK_STRUCT.size
+
+    def put(self, tick: TickData) -> None:
+        """
+        Write a tick record, only one process should write.
+        """
+        count = self.get_write_count()
+        pack_tick_into(self.buf, self.get_offset(count), tick)
+
+        # Publish the record after it is fully written
+        HEADER_STRUCT.pack_into(self.buf, 0, count + 1, self.capacity)
+
+    def set_symbols(self, vt_symbols: Iterable[str]) -> None:
+        """
+        Only read records of vt_symbols specified.
+        """
+        self.symbols = set()
+
+        for vt_symbol in vt_symbols:
+            symbol, exchange_str = vt_symbol.rsplit(".", 1)
+            self.symbols.add((symbol.encode(), exchange_str.encode()))
+
+    def read(self) -> List[TickData]:
+        """
+        Read all new tick records since last read.
+        """
+        write_count = self.get_write_count()
+
+        start = self.read_count
+        if write_count - start > self.capacity:
+            self.lost_count += write_count - self.capacity - start
+            start = write_count - self.capacity
+
+        records = []
+        for count in range(start, write_count):
+            offset = self.get_offset(count)
+
+            if self.symbols is not None:
+                symbol, exchange = TICK_STRUCT.unpack_from(self.buf, offset)[:2]
+                key = (symbol.rstrip(b"\x00"), exchange.rstrip(b"\x00"))
+                if key not in self.symbols:
+                    continue
+
+            records.append((count, unpack_tick_from(self.buf, offset)))
+
+        self.read_count = write_count
+
+        # Drop records which might be overwritten by writer during reading,
+        # including the oldest one in slot being written now
+        valid_count = self.get_write_count() - self.capacity + 1
+        ticks = []
+
+        for count, tick in records:
+            if count >= valid_count:
+                ticks.append(tick)
+            else:
+                self.lost_count += 1
+
+        return ticks
+
+    def close(self) -> None:
+        """
+        Close shared memory, and release it if created by this object.
+        """
+        self.buf = None
+        self.shm.close()
+
+        if self.owner:
+            self.shm.unlink()
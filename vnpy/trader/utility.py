@@ -5,10 +5,14 @@ General utility functions.
 import json
 import logging
 import sys
+from datetime import datetime, tzinfo
+from functools import wraps
+from inspect import signature
 from pathlib import Path
-from typing import Callable, Dict, Tuple, Union, Optional
+from typing import Any, Callable, Dict, List, Sequence, Tuple, Union, Optional
 from decimal import Decimal
 from math import floor, ceil
+from operator import attrgetter
 
 import numpy as np
 import talib
@@ -163,6 +167,94 @@ def get_digits(value: float) -> int:
         return 0
 
 
+class TimestampConverter:
+    """
+    Convert date string and time of CTP-like market data into datetime.
+
+    Midnight of each date is localized once and cached, then time of day
+    is set by integer fields, which is much faster than strptime and
+    localize for every tick. Timezone should have no utc offset change
+    within a day, such as Asia/Shanghai.
+    """
+
+    def __init__(self, tz: tzinfo):
+        """"""
+        self.tz: tzinfo = tz
+        self.midnights: Dict[str, datetime] = {}
+
+    def convert(self, date: str, time: str, millisec: int) -> datetime:
+        """
+        Convert date in %Y%m%d, time in %H:%M:%S and millisecond into
+        datetime, with precision of 100 milliseconds.
+        """
+        midnight = self.midnights.get(date, None)
+
+        if not midnight:
+            dt = datetime.strptime(date, "%Y%m%d")
+            localize = getattr(self.tz, "localize", None)
+            if localize:
+                midnight = localize(dt)
+            else:
+                midnight = dt.replace(tzinfo=self.tz)
+            self.midnights[date] = midnight
+
+        return midnight.replace(
+            hour=int(time[0:2]),
+            minute=int(time[3:5]),
+            second=int(time[6:8]),
+            microsecond=int(millisec / 100) * 100000
+        )
+
+
+def get_bar_columns(bars: Sequence[BarData]) -> Dict[str, np.ndarray]:
+    """
+    Get wall clock minute/hour, high/low price and volume of bars as arrays.
+    """
+    from .columnar import BarArray
+
+    if isinstance(bars, BarArray):
+        data = bars.data
+        values = data["datetime"]
+        hours = values.astype("datetime64[h]")
+
+        return {
+            "minute": (values.astype("datetime64[m]") - hours).astype(int),
+            "hour": (hours - values.astype("datetime64[D]")).astype(int),
+            "high_price": data["high_price"],
+            "low_price": data["low_price"],
+            "volume": data["volume"]
+        }
+
+    count = len(bars)
+    datetimes = list(map(attrgetter("datetime"), bars))
+
+    columns = {
+        "minute": np.fromiter(map(attrgetter("minute"), datetimes), int, count),
+        "hour": np.fromiter(map(attrgetter("hour"), datetimes), int, count)
+    }
+    for name in ["high_price", "low_price", "volume"]:
+        columns[name] = np.fromiter(map(attrgetter(name), bars), float, count)
+
+    return columns
+
+
+def resample_bars(
+    bars: Sequence[BarData],
+    window: int,
+    interval: Interval = Interval.MINUTE
+) -> List[BarData]:
+    """
+    Aggregate 1 minute bars into x minute/x hour bars.
+
+    The result is the same as BarGenerator, and the last unfinished
+    window bar is not included.
+    """
+    result = []
+    generator = BarGenerator(None, window, result.append, interval)
+    generator.update_bars(bars)
+    return result
+
+
 class BarGenerator:
     """
     For:
@@ -318,6 +410,120 @@ class BarGenerator:
         # Cache last bar object
         self.last_bar = bar
 
+    def update_bars(self, bars: Sequence[BarData]) -> None:
+        """
+        Update a batch of 1 minute bars into generator.
+
+        Same as calling update_bar for each bar, but completed window bars
+        are aggregated in one vectorized pass. Bars can also be BarArray.
+        """
+        from .columnar import BarArray
+
+        count = len(bars)
+        ix = 0
+
+        # Finish current window bar first
+        while self.window_bar and ix < count:
+            self.update_bar(bars[ix])
+            ix += 1
+
+        if ix == count:
+            return
+
+        bars = bars[ix:]
+        count = len(bars)
+        columns = get_bar_columns(bars)
+        minutes = columns["minute"]
+        hours = columns["hour"]
+
+        if self.interval == Interval.MINUTE:
+            finished = (minutes + 1) % self.window == 0
+        else:
+            last_hours = np.empty(count, dtype=hours.dtype)
+            last_hours[1:] = hours[:-1]
+
+            has_last = np.ones(count, dtype=bool)
+            if self.last_bar:
+                last_hours[0] = self.last_bar.datetime.hour
+            else:
+                last_hours[0] = hours[0]
+                has_last[0] = False
+
+            finished = has_last & ((hours != last_hours) | (minutes == 59))
+
+            if self.window != 1:
+                interval_counts = self.interval_count + np.cumsum(finished)
+                finished &= (interval_counts % self.window == 0)
+
+        ends = np.flatnonzero(finished)
+        size = int(ends[-1]) + 1 if len(ends) else 0
+
+        if size:
+            starts = np.append(0, ends[:-1] + 1)
+
+            high_prices = np.maximum.reduceat(columns["high_price"][:size], starts)
+            low_prices = np.minimum.reduceat(columns["low_price"][:size], starts)
+
+            # Volume of each bar is truncated into int before summed
+            volumes = np.trunc(columns["volume"][:size]).astype(np.int64)
+            volumes = np.add.reduceat(volumes, starts)
+
+            if isinstance(bars, BarArray):
+                data = bars.data
+                datetimes = bars.new_array(data[starts]).get_datetimes()
+                open_prices = data["open_price"][starts].tolist()
+                close_prices = data["close_price"][ends].tolist()
+                open_interests = data["open_interest"][ends].tolist()
+                contracts = [(bars.symbol, bars.exchange, bars.gateway_name)] * len(starts)
+            else:
+                first_bars = [bars[i] for i in starts.tolist()]
+                last_bars = [bars[i] for i in ends.tolist()]
+
+                datetimes = [bar.datetime for bar in first_bars]
+                open_prices = [bar.open_price for bar in first_bars]
+                close_prices = [bar.close_price for bar in last_bars]
+                open_interests = [bar.open_interest for bar in last_bars]
+                contracts = [
+                    (bar.symbol, bar.exchange, bar.gateway_name)
+                    for bar in first_bars
+                ]
+
+            for (
+                dt, (symbol, exchange, gateway_name), open_price, high_price,
+                low_price, close_price, volume, open_interest
+            ) in zip(
+                datetimes, contracts, open_prices, high_prices.tolist(),
+                low_prices.tolist(), close_prices, volumes.tolist(), open_interests
+            ):
+                if self.interval == Interval.MINUTE:
+                    dt = dt.replace(second=0, microsecond=0)
+                else:
+                    dt = dt.replace(minute=0, second=0, microsecond=0)
+
+                window_bar = BarData(
+                    symbol=symbol,
+                    exchange=exchange,
+                    datetime=dt,
+                    gateway_name=gateway_name,
+                    open_price=open_price,
+                    high_price=high_price,
+                    low_price=low_price,
+                    close_price=close_price,
+                    volume=volume,
+                    open_interest=open_interest
+                )
+                self.on_window_bar(window_bar)
+
+            # Interval count is reset when x-hour bar is finished
+            if self.interval == Interval.HOUR and self.window != 1:
+                self.interval_count = 0
+
+            self.last_bar = bars[size - 1]
+
+        # Left bars of unfinished window bar
+        for i in range(size, count):
+            self.update_bar(bars[i])
+
     def generate(self) -> Optional[BarData]:
         """
         Generate the bar data and call callback immediately.
@@ -332,6 +538,54 @@ class BarGenerator:
         return bar
 
 
+def set_readonly(result: Any) -> Any:
+    """
+    Make array result read only, so that cached result can be shared.
+    """
+    if isinstance(result, np.ndarray):
+        result.flags.writeable = False
+    elif isinstance(result, tuple):
+        for value in result:
+            set_readonly(value)
+    return result
+
+
+def indicator_cache(func: Callable) -> Callable:
+    """
+    Cache result of ArrayManager indicator function until next bar update.
+
+    Result is keyed by function name and arguments with defaults filled,
+    so that am.atr(n) and am.atr(n, array=False) share the same result.
+    Array results are returned as read only.
+    """
+    name = func.__name__
+    parameters = list(signature(func).parameters.values())[1:]
+    defaults = [(p.name, p.default) for p in parameters]
+
+    @wraps(func)
+    def wrapper(self: "ArrayManager", *args, **kwargs):
+        key = (name, args)
+
+        if len(args) < len(defaults):
+            key = (name, args + tuple([
+                kwargs.get(k, v) for k, v in defaults[len(args):]
+            ]))
+
+        try:
+            result = self.cache[key]
+            self.hit_count += 1
+            return result
+        except KeyError:
+            pass
+
+        result = set_readonly(func(self, *args, **kwargs))
+        self.cache[key] = result
+        self.miss_count += 1
+        return result
+
+    return wrapper
+
+
 class ArrayManager(object):
     """
     For:
@@ -345,12 +599,33 @@ class ArrayManager(object):
         self.size: int = size
         self.inited: bool = False
 
-        self.open_array: np.ndarray = np.zeros(size)
-        self.high_array: np.ndarray = np.zeros(size)
-        self.low_array: np.ndarray = np.zeros(size)
-        self.close_array: np.ndarray = np.zeros(size)
-        self.volume_array: np.ndarray = np.zeros(size)
-        self.open_interest_array: np.ndarray = np.zeros(size)
+        # Time series are stored in rows of an oversized buffer, and the
+        # latest size values are kept at the end of window. New data is
+        # appended after the window, until the buffer is full and the
+        # window is moved back to the beginning.
+        self.capacity: int = size * 4
+        self.buffer: np.ndarray = np.zeros((6, self.capacity))
+        self.end: int = size
+
+        self.update_window()
+
+        # Indicator results of current bar, and statistics of cache usage
+        self.cache: Dict[tuple, Any] = {}
+        self.hit_count: int = 0
+        self.miss_count: int = 0
+
+    def update_window(self) -> None:
+        """
+        Update contiguous views of time series in current window.
+        """
+        window = self.buffer[:, self.end - self.size:self.end]
+
+        self.open_array: np.ndarray = window[0]
+        self.high_array: np.ndarray = window[1]
+        self.low_array: np.ndarray = window[2]
+        self.close_array: np.ndarray = window[3]
+        self.volume_array: np.ndarray = window[4]
+        self.open_interest_array: np.ndarray = window[5]
 
     def update_bar(self, bar: BarData) -> None:
         """
@@ -360,19 +635,25 @@ class ArrayManager(object):
         if not self.inited and self.count >= self.size:
             self.inited = True
 
-        self.open_array[:-1] = self.open_array[1:]
-        self.high_array[:-1] = self.high_array[1:]
-        self.low_array[:-1] = self.low_array[1:]
-        self.close_array[:-1] = self.close_array[1:]
-        self.volume_array[:-1] = self.volume_array[1:]
-        self.open_interest_array[:-1] = self.open_interest_array[1:]
+        if self.end == self.capacity:
+            keep = self.size - 1
+            self.buffer[:, :keep] = self.buffer[:, self.end - keep:self.end]
+            self.end = keep
+
+        self.buffer[:, self.end] = (
+            bar.open_price,
+            bar.high_price,
+            bar.low_price,
+            bar.close_price,
+            bar.volume,
+            bar.open_interest
+        )
+        self.end += 1
+
+        self.update_window()
 
-        self.open_array[-1] = bar.open_price
-        self.high_array[-1] = bar.high_price
-        self.low_array[-1] = bar.low_price
-        self.close_array[-1] = bar.close_price
-        self.volume_array[-1] = bar.volume
-        self.open_interest_array[-1] = bar.open_interest
+        if self.cache:
+            self.cache.clear()
 
     @property
     def open(self) -> np.ndarray:
@@ -416,6 +697,7 @@ class ArrayManager(object):
         """
         return self.open_interest_array
 
+    @indicator_cache
     def sma(self, n: int, array: bool = False) -> Union[float, np.ndarray]:
         """
         Simple moving average.
@@ -425,6 +707,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @indicator_cache
     def ema(self, n: int, array: bool = False) -> Union[float, np.ndarray]:
         """
         Exponential moving average.
@@ -434,6 +717,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @indicator_cache
     def kama(self, n: int, array: bool = False) -> Union[float, np.ndarray]:
         """
         KAMA.
@@ -443,6 +727,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @indicator_cache
     def wma(self, n: int, array: bool = False) -> Union[float, np.ndarray]:
         """
         WMA.
@@ -452,6 +737,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @indicator_cache
     def apo(
         self,
         fast_period: int,
@@ -467,6 +753,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @indicator_cache
     def cmo(self, n: int, array: bool = False) -> Union[float, np.ndarray]:
         """
         CMO.
@@ -476,6 +763,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @indicator_cache
     def mom(self, n: int, array: bool = False) -> Union[float, np.ndarray]:
         """
         MOM.
@@ -485,6 +773,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @indicator_cache
     def ppo(
         self,
         fast_period: int,
@@ -500,6 +789,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @indicator_cache
     def roc(self, n: int, array: bool = False) -> Union[float, np.ndarray]:
         """
         ROC.
@@ -509,6 +799,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @indicator_cache
     def rocr(self, n: int, array: bool = False) -> Union[float, np.ndarray]:
         """
         ROCR.
@@ -518,6 +809,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @indicator_cache
     def rocp(self, n: int, array: bool = False) -> Union[float, np.ndarray]:
         """
         ROCP.
@@ -527,6 +819,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @indicator_cache
     def rocr_100(self, n: int, array: bool = False) -> Union[float, np.ndarray]:
         """
         ROCR100.
@@ -536,6 +829,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @indicator_cache
     def trix(self, n: int, array: bool = False) -> Union[float, np.ndarray]:
         """
         TRIX.
@@ -545,6 +839,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @indicator_cache
     def std(self, n: int, nbdev: int = 1, array: bool = False) -> Union[float, np.ndarray]:
         """
         Standard deviation.
@@ -554,6 +849,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @indicator_cache
     def obv(self, array: bool = False) -> Union[float, np.ndarray]:
         """
         OBV.
@@ -563,6 +859,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @indicator_cache
     def cci(self, n: int, array: bool = False) -> Union[float, np.ndarray]:
         """
         Commodity Channel Index (CCI).
@@ -572,6 +869,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @indicator_cache
     def atr(self, n: int, array: bool = False) -> Union[float, np.ndarray]:
         """
         Average True Range (ATR).
@@ -581,6 +879,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @indicator_cache
     def natr(self, n: int, array: bool = False) -> Union[float, np.ndarray]:
         """
         NATR.
@@ -590,6 +889,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @indicator_cache
     def rsi(self, n: int, array: bool = False) -> Union[float, np.ndarray]:
         """
         Relative Strenght Index (RSI).
@@ -599,6 +899,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @indicator_cache
     def macd(
         self,
         fast_period: int,
@@ -619,6 +920,7 @@ class ArrayManager(object):
             return macd, signal, hist
         return macd[-1], signal[-1], hist[-1]
 
+    @indicator_cache
     def adx(self, n: int, array: bool = False) -> Union[float, np.ndarray]:
         """
         ADX.
@@ -628,6 +930,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @indicator_cache
     def adxr(self, n: int, array: bool = False) -> Union[float, np.ndarray]:
         """
         ADXR.
@@ -637,6 +940,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @indicator_cache
     def dx(self, n: int, array: bool = False) -> Union[float, np.ndarray]:
         """
         DX.
@@ -646,6 +950,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @indicator_cache
     def minus_di(self, n: int, array: bool = False) -> Union[float, np.ndarray]:
         """
         MINUS_DI.
@@ -655,6 +960,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @indicator_cache
     def plus_di(self, n: int, array: bool = False) -> Union[float, np.ndarray]:
         """
         PLUS_DI.
@@ -664,6 +970,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @indicator_cache
     def willr(self, n: int, array: bool = False) -> Union[float, np.ndarray]:
         """
         WILLR.
@@ -673,6 +980,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @indicator_cache
     def ultosc(
         self,
         time_period1: int = 7,
@@ -688,6 +996,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @indicator_cache
     def trange(self, array: bool = False) -> Union[float, np.ndarray]:
         """
         TRANGE.
@@ -697,6 +1006,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @indicator_cache
     def boll(
         self,
         n: int,
@@ -717,6 +1027,7 @@ class ArrayManager(object):
 
         return up, down
 
+    @indicator_cache
     def keltner(
         self,
         n: int,
@@ -737,6 +1048,7 @@ class ArrayManager(object):
 
         return up, down
 
+    @indicator_cache
     def donchian(
         self, n: int, array: bool = False
     ) -> Union[
@@ -753,6 +1065,7 @@ class ArrayManager(object):
             return up, down
         return up[-1], down[-1]
 
+    @indicator_cache
     def aroon(
         self,
         n: int,
@@ -770,6 +1083,7 @@ class ArrayManager(object):
             return aroon_up, aroon_down
         return aroon_up[-1], aroon_down[-1]
 
+    @indicator_cache
     def aroonosc(self, n: int, array: bool = False) -> Union[float, np.ndarray]:
         """
         Aroon Oscillator.
@@ -780,6 +1094,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @indicator_cache
     def minus_dm(self, n: int, array: bool = False) -> Union[float, np.ndarray]:
         """
         MINUS_DM.
@@ -790,6 +1105,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @indicator_cache
     def plus_dm(self, n: int, array: bool = False) -> Union[float, np.ndarray]:
         """
         PLUS_DM.
@@ -800,6 +1116,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @indicator_cache
     def mfi(self, n: int, array: bool = False) -> Union[float, np.ndarray]:
         """
         Money Flow Index.
@@ -809,6 +1126,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @indicator_cache
     def ad(self, array: bool = False) -> Union[float, np.ndarray]:
         """
         AD.
@@ -818,6 +1136,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @indicator_cache
     def adosc(
         self,
         fast_period: int,
@@ -832,6 +1151,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @indicator_cache
     def bop(self, array: bool = False) -> Union[float, np.ndarray]:
         """
         BOP.